@@ -1,6 +1,7 @@
 """Admin API endpoints for keyword management and source configuration."""
 
 import logging
+from datetime import date
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -19,6 +20,8 @@ from app.models.models import (
     SourceIngestionHistory,
 )
 from app.services.keyword_approval import keyword_approval_service
+from app.services.pgvector_search import INDEX_METHODS, list_vector_indexes
+from app.services.rate_limit import INTERACTIVE, request_priority
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,20 @@ class SourcePayload(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class VectorIndexRebuildPayload(BaseModel):
+    method: Optional[str] = None
+    lists: Optional[int] = None
+    m: Optional[int] = None
+    ef_construction: Optional[int] = None
+
+
+class SentimentBackfillPayload(BaseModel):
+    start_date: date
+    end_date: date
+    keyword_ids: Optional[List[int]] = None
+    chunk_days: Optional[int] = None
+
+
 def _serialize_source(source: NewsSource) -> Dict[str, Any]:
     return {
         "id": source.id,
@@ -204,9 +221,11 @@ async def process_suggestion_manually(
     """Manually trigger AI processing of a keyword suggestion."""
 
     try:
-        result = await keyword_approval_service.process_suggestion(
-            suggestion_id=suggestion_id, db=db
-        )
+        # Admin requests preempt bulk ingestion in the Gemini rate limiter
+        with request_priority(INTERACTIVE):
+            result = await keyword_approval_service.process_suggestion(
+                suggestion_id=suggestion_id, db=db
+            )
 
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
@@ -311,10 +330,11 @@ async def approve_suggestion_manually(
         if not suggestion:
             raise HTTPException(status_code=404, detail="Suggestion not found")
 
-        translations = await keyword_approval_service.translate_keyword(
-            suggestion.keyword_en,
-            ["th", "de", "fr", "es", "it", "pl", "sv", "nl"],
-        )
+        with request_priority(INTERACTIVE):
+            translations = await keyword_approval_service.translate_keyword(
+                suggestion.keyword_en,
+                ["th", "de", "fr", "es", "it", "pl", "sv", "nl"],
+            )
 
         keyword_th = suggestion.keyword_th or translations.get("th")
         keyword_de = suggestion.keyword_de or translations.get("de")
@@ -507,6 +527,109 @@ async def get_suggestion_stats(
         ) from exc
 
 
+@router.get("/vector-indexes")
+async def get_vector_indexes(
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin),
+):
+    """List the pgvector embedding indexes (empty on non-PostgreSQL databases)."""
+
+    try:
+        return {"indexes": list_vector_indexes(db)}
+    except Exception as exc:
+        logger.error("Error listing vector indexes: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Error listing vector indexes: {exc}"
+        ) from exc
+
+
+@router.post("/vector-indexes/rebuild")
+async def rebuild_vector_indexes(
+    payload: VectorIndexRebuildPayload,
+    admin: dict = Depends(get_current_admin),
+):
+    """Queue an HNSW/IVFFlat rebuild of the embedding indexes."""
+
+    if payload.method and payload.method.lower() not in INDEX_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported index method. Use one of: {', '.join(INDEX_METHODS)}",
+        )
+
+    try:
+        from app.tasks.vector_maintenance import rebuild_embedding_indexes
+
+        task = rebuild_embedding_indexes.delay(
+            method=payload.method,
+            lists=payload.lists,
+            m=payload.m,
+            ef_construction=payload.ef_construction,
+        )
+        logger.info("Queued vector index rebuild task %s", task.id)
+        return {"status": "queued", "task_id": task.id}
+    except Exception as exc:
+        logger.error("Failed to queue vector index rebuild: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Error queuing index rebuild: {exc}"
+        ) from exc
+
+
+@router.post("/sentiment-trends/backfill")
+async def backfill_sentiment_trends(
+    payload: SentimentBackfillPayload,
+    admin: dict = Depends(get_current_admin),
+):
+    """Queue a chunked re-aggregation of sentiment trends over a date range."""
+
+    if payload.end_date < payload.start_date:
+        raise HTTPException(
+            status_code=400, detail="end_date must not be before start_date"
+        )
+    if payload.chunk_days is not None and payload.chunk_days < 1:
+        raise HTTPException(status_code=400, detail="chunk_days must be positive")
+
+    try:
+        from app.tasks.sentiment_aggregation import (
+            backfill_sentiment_trends as backfill_task,
+        )
+
+        task = backfill_task.delay(
+            start_date=payload.start_date.isoformat(),
+            end_date=payload.end_date.isoformat(),
+            keyword_ids=payload.keyword_ids,
+            chunk_days=payload.chunk_days,
+        )
+        logger.info("Queued sentiment trend backfill task %s", task.id)
+        return {"status": "queued", "task_id": task.id}
+    except Exception as exc:
+        logger.error("Failed to queue sentiment trend backfill: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Error queuing sentiment backfill: {exc}"
+        ) from exc
+
+
+@router.get("/sentiment-trends/backfill/{group_id}")
+async def get_sentiment_backfill_progress(
+    group_id: str,
+    admin: dict = Depends(get_current_admin),
+):
+    """Chunk progress of a sentiment trend backfill (group ID from the task result)."""
+
+    try:
+        from app.tasks.sentiment_aggregation import backfill_progress
+
+        progress = backfill_progress(group_id)
+    except Exception as exc:
+        logger.error("Error reading sentiment backfill progress: %s", exc)
+        raise HTTPException(
+            status_code=500, detail=f"Error reading backfill progress: {exc}"
+        ) from exc
+
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Backfill not found")
+    return progress
+
+
 @router.get("/search")
 async def admin_comprehensive_search(
     q: str = Query(..., min_length=1, description="Search query"),
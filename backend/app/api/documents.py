@@ -8,10 +8,12 @@ import io
 from datetime import datetime
 
 from app.database import get_db
-from app.models.models import Article, Keyword, KeywordArticle
+from app.models.models import Article
 from app.services.sentiment import SentimentAnalyzer
 from app.services.keyword_extractor import KeywordExtractor
 from app.services.embeddings import get_embedding_generator
+from app.services.keyword_resolver import keyword_texts, link_keywords, resolve_keywords
+from app.services.sentiment_trends import record_article_links
 
 logger = logging.getLogger(__name__)
 
@@ -153,41 +155,26 @@ async def upload_document(
         db.add(article)
         db.flush()  # Get article ID
 
-        # Process and associate keywords
-        extracted_keywords = []
-        for kw_data in keyword_result.get("keywords", []):
-            keyword_text = (
-                kw_data.get("text", kw_data) if isinstance(kw_data, dict) else kw_data
-            )
-
-            # Check if keyword exists
-            keyword = (
-                db.query(Keyword).filter(Keyword.keyword_en == keyword_text).first()
-            )
-
-            if not keyword:
-                # Create new keyword
-                keyword = Keyword(
-                    keyword_en=keyword_text,
-                    keyword_th=keyword_text,  # TODO: Add translation
-                    category="general",
-                )
-                db.add(keyword)
-                db.flush()
-
-            # Associate with article
-            keyword_article = KeywordArticle(
-                keyword_id=keyword.id, article_id=article.id
-            )
-            db.add(keyword_article)
-
-            extracted_keywords.append(
-                {
-                    "id": keyword.id,
-                    "keyword": keyword.keyword_en,
-                    "category": keyword.category,
-                }
-            )
+        # Resolve and associate all keywords in batched statements
+        keywords_by_text, _ = resolve_keywords(
+            db,
+            keyword_texts(keyword_result.get("keywords", [])),
+            # TODO: Add translation
+            defaults=lambda text: {"keyword_th": text, "category": "general"},
+        )
+        inserted = link_keywords(
+            db, [(keyword.id, article.id) for keyword in keywords_by_text.values()]
+        )
+        # Keep trends and rollups current, as ingestion does
+        record_article_links(db, [(article, keyword_id) for keyword_id, _ in inserted])
+        extracted_keywords = [
+            {
+                "id": keyword.id,
+                "keyword": keyword.keyword_en,
+                "category": keyword.category,
+            }
+            for keyword in keywords_by_text.values()
+        ]
 
         db.commit()
 
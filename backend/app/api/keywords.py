@@ -8,6 +8,7 @@ import logging
 
 from app.database import get_db
 from app.models.models import Keyword, Article, KeywordRelation, KeywordArticle
+from app.services.pagination import count_total, keyset_page, pagination_payload
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,8 @@ async def search_keywords(
     language: Optional[str] = Query("en", description="Language code (en/th)"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor"),
+    total_mode: str = Query("exact", description="Total count mode: exact, estimated or none"),
     db: Session = Depends(get_db),
 ):
     """
@@ -28,8 +31,10 @@ async def search_keywords(
     Args:
         q: Optional search query to filter keywords
         language: Language code for filtering (en/th)
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, ignored when a cursor is given)
         page_size: Number of items per page (max 100)
+        cursor: Opaque cursor returned as ``pagination.next_cursor``
+        total_mode: ``exact``, ``estimated`` or ``none``
         db: Database session
 
     Returns:
@@ -54,15 +59,17 @@ async def search_keywords(
             )
 
         # Get total count
-        total = query.count()
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        keywords = (
-            query.order_by(desc(Keyword.created_at))
-            .offset(offset)
-            .limit(page_size)
-            .all()
+        total, total_is_estimate = count_total(db, query, total_mode)
+
+        # Apply pagination (keyset on created_at, id)
+        keywords, next_cursor = keyset_page(
+            query,
+            Keyword.created_at,
+            Keyword.id,
+            sort_key="created_desc",
+            page_size=page_size,
+            cursor=cursor,
+            offset=0 if cursor else (page - 1) * page_size,
         )
 
         # Format results
@@ -90,14 +97,17 @@ async def search_keywords(
 
         return {
             "results": results,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": (total + page_size - 1) // page_size,
-            },
+            "pagination": pagination_payload(
+                page=None if cursor else page,
+                page_size=page_size,
+                total=total,
+                total_is_estimate=total_is_estimate,
+                next_cursor=next_cursor,
+            ),
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching keywords: {e}")
         raise HTTPException(
@@ -178,6 +188,10 @@ async def get_keyword_articles(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     sort_by: str = Query("date", description="Sort by: date, sentiment"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from pagination.next_cursor (date sort only)"
+    ),
+    total_mode: str = Query("exact", description="Total count mode: exact, estimated or none"),
     db: Session = Depends(get_db),
 ):
     """
@@ -185,9 +199,11 @@ async def get_keyword_articles(
 
     Args:
         keyword_id: Keyword ID
-        page: Page number
+        page: Page number (ignored when a cursor is given)
         page_size: Items per page
         sort_by: Sorting criterion (date or sentiment)
+        cursor: Opaque cursor returned as ``pagination.next_cursor``
+        total_mode: ``exact``, ``estimated`` or ``none``
         db: Database session
 
     Returns:
@@ -206,18 +222,31 @@ async def get_keyword_articles(
             .filter(KeywordArticle.keyword_id == keyword_id)
         )
 
-        # Apply sorting
-        if sort_by == "sentiment":
-            query = query.order_by(desc(Article.sentiment_overall))
-        else:  # default to date
-            query = query.order_by(desc(Article.published_date))
-
         # Get total count
-        total = query.count()
+        total, total_is_estimate = count_total(db, query, total_mode)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        articles = query.offset(offset).limit(page_size).all()
+        # Apply sorting and pagination
+        next_cursor = None
+        if sort_by == "sentiment":
+            if cursor:
+                raise ValueError("cursor is only supported for sort_by=date")
+            offset = (page - 1) * page_size
+            articles = (
+                query.order_by(desc(Article.sentiment_overall))
+                .offset(offset)
+                .limit(page_size)
+                .all()
+            )
+        else:  # default to date, keyset on (published_date, id)
+            articles, next_cursor = keyset_page(
+                query,
+                Article.published_date,
+                Article.id,
+                sort_key="date_desc",
+                page_size=page_size,
+                cursor=cursor,
+                offset=0 if cursor else (page - 1) * page_size,
+            )
 
         # Format results
         results = []
@@ -248,16 +277,19 @@ async def get_keyword_articles(
             "keyword_id": keyword_id,
             "keyword_en": keyword.keyword_en,
             "results": results,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": (total + page_size - 1) // page_size,
-            },
+            "pagination": pagination_payload(
+                page=None if cursor else page,
+                page_size=page_size,
+                total=total,
+                total_is_estimate=total_is_estimate,
+                next_cursor=next_cursor,
+            ),
         }
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting articles for keyword {keyword_id}: {e}")
         raise HTTPException(
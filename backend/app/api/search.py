@@ -2,17 +2,28 @@
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import case, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
+from app.config import get_settings
 from app.database import get_db
 from app.models.models import Article, Keyword, KeywordArticle
 from app.services.embeddings import get_embedding_generator
+from app.services.full_text import FullTextMatch, build_full_text_match
+from app.services.pagination import (
+    count_total,
+    keyset_order,
+    keyset_page,
+    pagination_payload,
+)
+from app.services.pgvector_search import nearest_neighbours, uses_pgvector
+from app.services.vector_index import get_article_index
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter()
 
@@ -37,6 +48,12 @@ async def search_articles(
     ),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from pagination.next_cursor (date sorts only)"
+    ),
+    total_mode: str = Query(
+        "exact", description="Total count mode: exact, estimated or none"
+    ),
     db: Session = Depends(get_db),
 ):
     """Search stored articles with rich filtering support."""
@@ -52,7 +69,13 @@ async def search_articles(
                 KeywordArticle.keyword_id == keyword_id
             )
 
-        if q:
+        text_match = build_full_text_match(db, q, language) if q else None
+        if text_match is not None and text_match.is_empty:
+            text_match = None
+
+        if text_match is not None:
+            query_builder = text_match.apply(query_builder)
+        elif q:
             pattern = f"%{q}%"
             query_builder = query_builder.filter(
                 or_(
@@ -90,33 +113,57 @@ async def search_articles(
                 Article.sentiment_overall <= sentiment_max
             )
 
-        total = query_builder.count()
-
-        order_clause = _resolve_article_sort(sort_by, q)
-        query_builder = query_builder.order_by(*order_clause)
+        total, total_is_estimate = count_total(db, query_builder, total_mode)
+
+        keyset_sort = _article_keyset_sort(sort_by, q)
+        next_cursor = None
+        if keyset_sort is not None:
+            # Page numbers still work; the returned cursor avoids deep offsets.
+            articles, next_cursor = keyset_page(
+                query_builder,
+                Article.published_date,
+                Article.id,
+                sort_key=keyset_sort,
+                page_size=page_size,
+                cursor=cursor,
+                descending=keyset_sort == "date_desc",
+                offset=0 if cursor else (page - 1) * page_size,
+            )
+        elif cursor:
+            raise ValueError("cursor is only supported for date sort orders")
+        else:
+            order_clause = _resolve_article_sort(sort_by, q, text_match)
+            offset = (page - 1) * page_size
+            articles = (
+                query_builder.order_by(*order_clause).offset(offset).limit(page_size).all()
+            )
 
-        offset = (page - 1) * page_size
-        articles = query_builder.offset(offset).limit(page_size).all()
+        highlights = (
+            text_match.snippets(db, [article.id for article in articles])
+            if text_match is not None
+            else {}
+        )
 
+        page_keywords = _article_keywords(db, [article.id for article in articles])
         results = [
             _serialize_article_payload(
                 article=article,
-                keywords=_article_keywords(db, article.id),
+                keywords=page_keywords[article.id],
                 similarity=None,
+                highlight=highlights.get(article.id),
             )
             for article in articles
         ]
 
-        total_pages = (total + page_size - 1) // page_size if total else 0
-
         return {
             "results": results,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": total_pages,
-            },
+            "pagination": pagination_payload(
+                page=None if cursor else page,
+                page_size=page_size,
+                total=total,
+                total_is_estimate=total_is_estimate,
+                next_cursor=next_cursor,
+            ),
             "filters": {
                 "q": q,
                 "keyword_id": keyword_id,
@@ -166,79 +213,61 @@ async def semantic_search(
         embedding_service = get_embedding_generator()
         query_embedding = embedding_service.generate_embedding(q)
 
-        query_builder = db.query(Article).filter(Article.embedding is not None)
+        start_dt = _parse_iso_date(start_date, "start_date") if start_date else None
+        end_dt = _parse_iso_date(end_date, "end_date") if end_date else None
 
-        if keyword_id:
-            query_builder = query_builder.join(
-                KeywordArticle, KeywordArticle.article_id == Article.id
-            )
-            query_builder = query_builder.filter(
-                KeywordArticle.keyword_id == keyword_id
-            )
+        filter_query = _build_article_id_filter(
+            db, keyword_id, source, language, start_dt, end_dt
+        )
+        max_candidates = settings.vector_search_max_candidates
 
-        if source:
-            query_builder = query_builder.filter(
-                func.lower(Article.source) == source.lower()
+        if uses_pgvector(db):
+            base_query = filter_query if filter_query is not None else db.query(Article.id)
+            hits = nearest_neighbours(
+                db, base_query, Article, query_embedding, limit=max_candidates
             )
-
-        if language:
-            query_builder = query_builder.filter(
-                func.lower(Article.language) == language.lower()
+            hits = [pair for pair in hits if pair[1] >= min_similarity]
+        else:
+            hits = _in_process_semantic_hits(
+                db, query_embedding, filter_query, max_candidates, min_similarity
             )
 
-        if start_date:
-            start_dt = _parse_iso_date(start_date, "start_date")
-            query_builder = query_builder.filter(Article.published_date >= start_dt)
-
-        if end_date:
-            end_dt = _parse_iso_date(end_date, "end_date")
-            query_builder = query_builder.filter(Article.published_date <= end_dt)
-
-        articles = query_builder.all()
-
-        if not articles:
-            return {
-                "query": q,
-                "results": [],
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total": 0,
-                    "total_pages": 0,
-                },
-                "filters": _build_semantic_filter_payload(
-                    keyword_id,
-                    source,
-                    language,
-                    start_date,
-                    end_date,
-                    sort_by,
-                    min_similarity,
-                ),
+        if sort_by != "relevance" and hits:
+            sort_rows = {
+                row.id: row
+                for row in db.query(
+                    Article.id, Article.published_date, Article.sentiment_overall
+                )
+                .filter(Article.id.in_([article_id for article_id, _ in hits]))
+                .all()
             }
-
-        scored: List[Tuple[Article, float]] = []
-        for article in articles:
-            similarity = embedding_service.compute_similarity(
-                query_embedding, article.embedding
-            )
-            if similarity >= min_similarity:
-                scored.append((article, similarity))
-
-        scored = _sort_semantic_results(scored, sort_by)
-
-        total = len(scored)
+            scored = [
+                (sort_rows[article_id], score)
+                for article_id, score in hits
+                if article_id in sort_rows
+            ]
+            scored = _sort_semantic_results(scored, sort_by)
+            hits = [(row.id, score) for row, score in scored]
+
+        total = len(hits)
         total_pages = (total + page_size - 1) // page_size if total else 0
         offset = (page - 1) * page_size
-        page_items = scored[offset : offset + page_size]
+        page_hits = hits[offset : offset + page_size]
 
+        # Only the requested page is hydrated from the database.
+        page_articles = _load_articles_by_id(
+            db, [article_id for article_id, _ in page_hits]
+        )
+
+        page_keywords = _article_keywords(db, page_articles.keys())
         results = [
             _serialize_article_payload(
-                article=item[0],
-                keywords=_article_keywords(db, item[0].id),
-                similarity=item[1],
+                article=page_articles[article_id],
+                keywords=page_keywords[article_id],
+                similarity=score,
             )
-            for item in page_items
+            for article_id, score in page_hits
+            if article_id in page_articles
         ]
 
         return {
@@ -290,33 +319,37 @@ async def find_similar_articles(
         if not source_article.embedding:
             raise HTTPException(status_code=400, detail="Article has no embedding")
 
-        embedding_service = get_embedding_generator()
-
-        articles = (
-            db.query(Article)
-            .filter(Article.id != article_id, Article.embedding is not None)
-            .all()
-        )
-
-        scored: List[Tuple[Article, float]] = []
-        for article in articles:
-            similarity = embedding_service.compute_similarity(
+        if uses_pgvector(db):
+            neighbours = nearest_neighbours(
+                db,
+                db.query(Article.id),
+                Article,
                 source_article.embedding,
-                article.embedding,
+                limit=limit,
+                exclude_id=article_id,
             )
-            if similarity >= min_similarity:
-                scored.append((article, similarity))
+        else:
+            index = get_article_index()
+            index.sync(db)
+            neighbours = index.search(source_article.embedding, k=limit + 1, db=db)
 
-        scored.sort(key=lambda pair: pair[1], reverse=True)
-        scored = scored[:limit]
+        hits = [
+            (item_id, score)
+            for item_id, score in neighbours
+            if item_id != article_id and score >= min_similarity
+        ][:limit]
 
+        similar_articles = _load_articles_by_id(db, [item_id for item_id, _ in hits])
+
+        page_keywords = _article_keywords(db, similar_articles.keys())
         results = [
             _serialize_article_payload(
-                article=item[0],
-                keywords=_article_keywords(db, item[0].id),
-                similarity=item[1],
+                article=similar_articles[item_id],
+                keywords=page_keywords[item_id],
+                similarity=score,
             )
-            for item in scored
+            for item_id, score in hits
+            if item_id in similar_articles
         ]
 
         return {
@@ -474,13 +507,19 @@ def _parse_iso_date(value: str, field: str) -> datetime:
         raise ValueError(f"Invalid {field}: expected ISO 8601 format") from exc
 
 
-def _resolve_article_sort(sort_by: str, query_text: Optional[str]) -> Tuple:
+def _resolve_article_sort(
+    sort_by: str,
+    query_text: Optional[str],
+    text_match: Optional[FullTextMatch] = None,
+) -> Tuple:
     if sort_by == "date_asc":
-        return (Article.published_date.asc(), Article.id.asc())
+        return keyset_order(Article.published_date, Article.id, descending=False)
     if sort_by == "sentiment_desc":
         return (Article.sentiment_overall.desc(), Article.published_date.desc())
     if sort_by == "sentiment_asc":
         return (Article.sentiment_overall.asc(), Article.published_date.desc())
+    if sort_by == "relevance" and text_match is not None:
+        return (text_match.score.desc(), Article.published_date.desc())
     if sort_by == "relevance" and query_text:
         pattern = f"%{query_text}%"
         relevance_case = case(
@@ -489,7 +528,114 @@ def _resolve_article_sort(sort_by: str, query_text: Optional[str]) -> Tuple:
             else_=1,
         )
         return (relevance_case.desc(), Article.published_date.desc())
-    return (Article.published_date.desc(), Article.id.desc())
+    return keyset_order(Article.published_date, Article.id, descending=True)
+
+
+def _article_keyset_sort(sort_by: str, query_text: Optional[str]) -> Optional[str]:
+    """Cursor sort key for date orderings, None for orderings that need OFFSET."""
+
+    if sort_by in ("sentiment_desc", "sentiment_asc"):
+        return None
+    if sort_by == "relevance" and query_text:
+        return None
+    return "date_asc" if sort_by == "date_asc" else "date_desc"
+
+
+def _build_article_id_filter(
+    db: Session,
+    keyword_id: Optional[int],
+    source: Optional[str],
+    language: Optional[str],
+    start_dt: Optional[datetime],
+    end_dt: Optional[datetime],
+):
+    """Build an ID-only article query for the semantic search filters."""
+
+    if not any([keyword_id, source, language, start_dt, end_dt]):
+        return None
+
+    query_builder = db.query(Article.id)
+
+    if keyword_id:
+        query_builder = query_builder.join(
+            KeywordArticle, KeywordArticle.article_id == Article.id
+        ).filter(KeywordArticle.keyword_id == keyword_id)
+
+    if source:
+        query_builder = query_builder.filter(func.lower(Article.source) == source.lower())
+
+    if language:
+        query_builder = query_builder.filter(
+            func.lower(Article.language) == language.lower()
+        )
+
+    if start_dt:
+        query_builder = query_builder.filter(Article.published_date >= start_dt)
+
+    if end_dt:
+        query_builder = query_builder.filter(Article.published_date <= end_dt)
+
+    return query_builder
+
+
+def _in_process_semantic_hits(
+    db: Session,
+    query_embedding,
+    filter_query,
+    max_candidates: int,
+    min_similarity: float,
+) -> List[Tuple[int, float]]:
+    """Semantic search hits from the in-process vector index (non-PostgreSQL)."""
+
+    index = get_article_index()
+    index.sync(db)
+
+    candidate_ids = None
+    post_filter = False
+    fetch_k = max_candidates
+    if filter_query is not None:
+        # Pre-filter when the filtered set is small enough to score
+        # exactly; otherwise over-fetch from the index and post-filter.
+        limit = settings.vector_prefilter_max_ids
+        filtered_ids = [row[0] for row in filter_query.limit(limit + 1).all()]
+        if len(filtered_ids) <= limit:
+            candidate_ids = filtered_ids
+        else:
+            post_filter = True
+            fetch_k = max_candidates * 4
+
+    hits = index.search(
+        query_embedding, k=fetch_k, candidate_ids=candidate_ids, db=db
+    )
+    hits = [
+        (article_id, score)
+        for article_id, score in hits
+        if score >= min_similarity
+    ]
+
+    if post_filter and hits:
+        allowed = {
+            row[0]
+            for row in filter_query.filter(
+                Article.id.in_([article_id for article_id, _ in hits])
+            ).all()
+        }
+        hits = [pair for pair in hits if pair[0] in allowed]
+
+    return hits[:max_candidates]
+
+
+def _load_articles_by_id(db: Session, article_ids: List[int]) -> Dict[int, Article]:
+    if not article_ids:
+        return {}
+    # Embeddings are never serialized; skip their payload on hydration.
+    articles = (
+        db.query(Article)
+        .options(defer(Article.embedding), defer(Article.embedding_compact))
+        .filter(Article.id.in_(article_ids))
+        .all()
+    )
+    return {article.id: article for article in articles}
 
 
 def _sort_semantic_results(
@@ -532,24 +678,58 @@ def _build_semantic_filter_payload(
     }
 
 
-def _article_keywords(db: Session, article_id: int) -> List[str]:
-    keywords = (
-        db.query(Keyword)
-        .join(KeywordArticle, Keyword.id == KeywordArticle.keyword_id)
-        .filter(KeywordArticle.article_id == article_id)
-        .order_by(Keyword.keyword_en.asc())
-        .limit(5)
+def _article_keywords(
+    db: Session, article_ids: Iterable[int], per_article: int = 5
+) -> Dict[int, List[str]]:
+    """
+    Top keywords (alphabetical) for a page of articles in one windowed query.
+
+    Args:
+        db: Database session
+        article_ids: Articles on the current page
+        per_article: Keywords kept per article
+
+    Returns:
+        Mapping of article ID to keyword list (empty for articles without keywords)
+    """
+    article_ids = list(dict.fromkeys(article_ids))
+    keywords: Dict[int, List[str]] = {article_id: [] for article_id in article_ids}
+    if not article_ids:
+        return keywords
+
+    ranked = (
+        db.query(
+            KeywordArticle.article_id.label("article_id"),
+            Keyword.keyword_en.label("keyword_en"),
+            func.row_number()
+            .over(
+                partition_by=KeywordArticle.article_id,
+                order_by=(Keyword.keyword_en.asc(), Keyword.id.asc()),
+            )
+            .label("position"),
+        )
+        .join(Keyword, Keyword.id == KeywordArticle.keyword_id)
+        .filter(KeywordArticle.article_id.in_(article_ids))
+        .subquery()
+    )
+    rows = (
+        db.query(ranked.c.article_id, ranked.c.keyword_en)
+        .filter(ranked.c.position <= per_article)
+        .order_by(ranked.c.article_id, ranked.c.position)
         .all()
     )
-    return [kw.keyword_en for kw in keywords]
+    for article_id, keyword_en in rows:
+        keywords[article_id].append(keyword_en)
+    return keywords
 
 
 def _serialize_article_payload(
     article: Article,
     keywords: List[str],
     similarity: Optional[float],
+    highlight: Optional[str] = None,
 ) -> Dict[str, Optional[str]]:
-    return {
+    payload = {
         "id": article.id,
         "title": article.title,
         "summary": article.summary,
@@ -566,3 +746,6 @@ def _serialize_article_payload(
         "language": article.language,
         "keywords": keywords,
     }
+    if highlight is not None:
+        payload["highlight"] = highlight
+    return payload
@@ -12,6 +12,8 @@ from app.models.models import (
     SentimentTrend,
     KeywordArticle,
 )
+from app.services.sentiment import get_sentiment_analyzer
+from app.services.sentiment_rollups import load_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -36,69 +38,19 @@ async def get_keyword_sentiment(keyword_id: int, db: Session = Depends(get_db)):
         if not keyword:
             raise HTTPException(status_code=404, detail="Keyword not found")
 
-        # Get all articles for this keyword
-        articles = (
-            db.query(Article)
-            .join(KeywordArticle, Article.id == KeywordArticle.article_id)
-            .filter(
-                KeywordArticle.keyword_id == keyword_id,
-                Article.sentiment_overall.isnot(None),
-            )
-            .all()
-        )
+        rollup = load_rollups(db, [keyword_id])[keyword_id]
 
-        if not articles:
+        if not rollup.article_count:
             return {
                 "keyword_id": keyword_id,
                 "keyword_en": keyword.keyword_en,
                 "total_articles": 0,
                 "average_sentiment": None,
-                "sentiment_distribution": {
-                    "strongly_positive": 0,
-                    "positive": 0,
-                    "neutral": 0,
-                    "negative": 0,
-                    "strongly_negative": 0,
-                },
+                "sentiment_distribution": rollup.distribution(),
             }
 
-        # Calculate statistics
-        sentiments = [
-            a.sentiment_overall for a in articles if a.sentiment_overall is not None
-        ]
-        avg_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0
-
-        # Count by classification
-        distribution = {
-            "strongly_positive": sum(
-                1 for a in articles if a.sentiment_classification == "STRONGLY_POSITIVE"
-            ),
-            "positive": sum(
-                1 for a in articles if a.sentiment_classification == "POSITIVE"
-            ),
-            "neutral": sum(
-                1 for a in articles if a.sentiment_classification == "NEUTRAL"
-            ),
-            "negative": sum(
-                1 for a in articles if a.sentiment_classification == "NEGATIVE"
-            ),
-            "strongly_negative": sum(
-                1 for a in articles if a.sentiment_classification == "STRONGLY_NEGATIVE"
-            ),
-        }
-
         # Find most positive and negative sources
-        source_sentiments = {}
-        for article in articles:
-            if article.source and article.sentiment_overall is not None:
-                if article.source not in source_sentiments:
-                    source_sentiments[article.source] = []
-                source_sentiments[article.source].append(article.sentiment_overall)
-
-        source_averages = {
-            source: sum(scores) / len(scores)
-            for source, scores in source_sentiments.items()
-        }
+        source_averages = rollup.source_averages()
 
         most_positive = (
             max(source_averages.items(), key=lambda x: x[1])
@@ -114,9 +66,9 @@ async def get_keyword_sentiment(keyword_id: int, db: Session = Depends(get_db)):
         return {
             "keyword_id": keyword_id,
             "keyword_en": keyword.keyword_en,
-            "total_articles": len(articles),
-            "average_sentiment": round(avg_sentiment, 3),
-            "sentiment_distribution": distribution,
+            "total_articles": rollup.article_count,
+            "average_sentiment": round(rollup.average_sentiment, 3),
+            "sentiment_distribution": rollup.distribution(),
             "by_source": {
                 "most_positive": (
                     {
@@ -299,67 +251,24 @@ async def compare_keyword_sentiment(
             )
 
         # Get sentiment for each keyword
+        rollups = load_rollups(db, [keyword.id for keyword in keywords])
         comparison = []
         for keyword in keywords:
-            # Get articles
-            articles = (
-                db.query(Article)
-                .join(KeywordArticle, Article.id == KeywordArticle.article_id)
-                .filter(
-                    KeywordArticle.keyword_id == keyword.id,
-                    Article.sentiment_overall.isnot(None),
-                )
-                .all()
+            rollup = rollups[keyword.id]
+            average = rollup.average_sentiment
+            comparison.append(
+                {
+                    "keyword_id": keyword.id,
+                    "keyword_en": keyword.keyword_en,
+                    "keyword_th": keyword.keyword_th,
+                    "average_sentiment": round(average, 3) if average is not None else None,
+                    "total_articles": rollup.article_count,
+                    "positive_count": rollup.score_positive_count,
+                    "negative_count": rollup.score_negative_count,
+                    "neutral_count": rollup.score_neutral_count,
+                }
             )
 
-            # Calculate statistics
-            if articles:
-                sentiments = [
-                    a.sentiment_overall
-                    for a in articles
-                    if a.sentiment_overall is not None
-                ]
-                avg_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0
-
-                comparison.append(
-                    {
-                        "keyword_id": keyword.id,
-                        "keyword_en": keyword.keyword_en,
-                        "keyword_th": keyword.keyword_th,
-                        "average_sentiment": round(avg_sentiment, 3),
-                        "total_articles": len(articles),
-                        "positive_count": sum(
-                            1
-                            for a in articles
-                            if a.sentiment_overall and a.sentiment_overall > 0.2
-                        ),
-                        "negative_count": sum(
-                            1
-                            for a in articles
-                            if a.sentiment_overall and a.sentiment_overall < -0.2
-                        ),
-                        "neutral_count": sum(
-                            1
-                            for a in articles
-                            if a.sentiment_overall
-                            and -0.2 <= a.sentiment_overall <= 0.2
-                        ),
-                    }
-                )
-            else:
-                comparison.append(
-                    {
-                        "keyword_id": keyword.id,
-                        "keyword_en": keyword.keyword_en,
-                        "keyword_th": keyword.keyword_th,
-                        "average_sentiment": None,
-                        "total_articles": 0,
-                        "positive_count": 0,
-                        "negative_count": 0,
-                        "neutral_count": 0,
-                    }
-                )
-
         # Sort by average sentiment descending
         comparison.sort(
             key=lambda x: (
@@ -391,12 +300,18 @@ async def compare_keyword_sentiment(
 
 
 @router.get("/articles/{article_id}/sentiment")
-async def get_article_sentiment_details(article_id: int, db: Session = Depends(get_db)):
+async def get_article_sentiment_details(
+    article_id: int,
+    sentences: bool = Query(False, description="Include a per-sentence VADER breakdown"),
+    db: Session = Depends(get_db),
+):
     """
     Get detailed sentiment analysis for a specific article.
 
     Args:
         article_id: Article ID
+        sentences: Include per-sentence scores (memoized, so cheap for
+            articles that share paragraphs)
         db: Database session
 
     Returns:
@@ -416,7 +331,7 @@ async def get_article_sentiment_details(article_id: int, db: Session = Depends(g
             .all()
         )
 
-        return {
+        result = {
             "article_id": article.id,
             "title": article.title,
             "source": article.source,
@@ -440,6 +355,11 @@ async def get_article_sentiment_details(article_id: int, db: Session = Depends(g
                 for kw in keywords
             ],
         }
+        if sentences:
+            result["sentences"] = get_sentiment_analyzer().analyze_sentences(
+                article.full_text or article.summary or ""
+            )
+        return result
 
     except HTTPException:
         raise
@@ -50,15 +50,45 @@ class Settings(BaseSettings):
     scraping_interval_hours: int = 1
     max_articles_per_source: int = 50
     enable_source_expansion: bool = False
+    url_dedup_cache_size: int = 50000  # recently seen article URLs per worker
+    scraping_enrichment_workers: int = 4  # articles enriched concurrently
+    # spaCy nlp.pipe for a scraped batch (n_process > 1 forks, so keep 1 in Celery)
+    spacy_n_process: int = 1
+    spacy_batch_size: int = 64
 
     # Sentiment Analysis
     sentiment_confidence_threshold: float = 0.5
     enable_vader_baseline: bool = True
     enable_gemini_sentiment: bool = False
+    # combined: one Gemini request per article for keywords, classification
+    # and sentiment; separate: one request each
+    gemini_analysis_mode: str = "combined"
+    # Articles up to batch_max_chars long (e.g. research summaries) get
+    # their Gemini sentiment batch_size to a request (in either mode)
+    gemini_sentiment_batch_size: int = 8
+    gemini_sentiment_batch_max_chars: int = 2000
+    # document: VADER over the whole text; sentence: per-sentence scores
+    # (memoized by sentence hash) averaged by sentence length
+    sentiment_vader_mode: str = "document"
+    sentiment_sentence_cache_size: int = 20000
+    # Bulk VADER scoring (SentimentAnalyzer.analyze_batch, article re-scoring)
+    sentiment_batch_workers: int = 4
+    sentiment_batch_chunk_size: int = 500
+    sentiment_rescore_batch_size: int = 5000
 
     # Rate Limiting
     rate_limit_per_minute: int = 60
     gemini_rate_limit_per_minute: int = 30
+    gemini_max_concurrency: int = 4  # in-flight requests per process
+    gemini_request_timeout_seconds: float = 60.0
+    gemini_interactive_reserve: int = 5  # calls/minute bulk work leaves to admin requests
+    rate_limit_backend: str = "auto"  # auto (Redis when reachable), redis or local
+
+    # Gemini response cache (in-process LRU + redis, disk or memory only)
+    gemini_cache_backend: str = "redis"
+    gemini_cache_dir: str = ""  # disk backend; empty = system temp dir
+    gemini_cache_size: int = 2000
+    gemini_cache_deterministic_ttl_seconds: int = 30 * 24 * 3600  # temperature <= 0.2
 
     # Keyword search throttling
     keyword_scheduler_enabled: bool = False
@@ -68,6 +98,48 @@ class Settings(BaseSettings):
     keyword_scheduler_min_priority: int = 0
     keyword_scheduler_retry_minutes: int = 30
 
+    # Sentiment trend backfills (date chunks aggregated in parallel)
+    sentiment_backfill_chunk_days: int = 31
+    sentiment_backfill_workers: int = 4
+
+    # Pagination (total_mode=estimated counts exactly up to this many rows)
+    pagination_count_threshold: int = 10000
+
+    # Vector search (in-process nearest-neighbour index)
+    vector_index_backend: str = "ivf"  # ivf, hnsw or flat
+    vector_index_nlist: int = 256
+    vector_index_nprobe: int = 16
+    vector_index_hnsw_m: int = 16
+    vector_index_hnsw_ef_construction: int = 200
+    vector_index_hnsw_ef_search: int = 64
+    vector_index_refresh_seconds: int = 60
+    vector_index_prune_seconds: int = 900  # drop deleted rows from the index
+    vector_search_max_candidates: int = 1000
+    vector_prefilter_max_ids: int = 20000
+    vector_snapshot_dir: str = ""  # empty disables memory-mapped snapshots
+    vector_snapshot_keep: int = 2
+
+    # Embeddings
+    embedding_batch_size: int = 64
+
+    # Compact embeddings: none, int8 or float16 (stored in embedding_compact)
+    embedding_compact_mode: str = "none"
+    vector_rescore_factor: int = 4
+
+    # Embedding cache (in-process LRU + Redis)
+    embedding_cache_enabled: bool = True
+    embedding_cache_size: int = 20000
+    embedding_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    # pgvector (PostgreSQL only)
+    semantic_search_backend: str = "auto"  # auto, pgvector or memory
+    pgvector_index_method: str = "hnsw"  # hnsw or ivfflat
+    pgvector_ivfflat_lists: Optional[int] = None  # None = derive from row count
+    pgvector_ivfflat_probes: int = 10
+    pgvector_hnsw_m: int = 16
+    pgvector_hnsw_ef_construction: int = 64
+    pgvector_hnsw_ef_search: int = 40
+
     # Optional external services
     sentry_dsn: Optional[str] = None
 
@@ -0,0 +1,94 @@
+"""
+Compact embedding codecs (int8 scalar quantization and float16).
+
+Embeddings are L2-normalized before encoding since only their direction
+matters for cosine similarity. Blob layouts:
+
+- ``int8``: float32 scale (4 bytes) followed by ``dim`` int8 codes
+- ``float16``: ``dim`` half-precision values
+
+The layout is identified by blob length, so rows written under one mode stay
+readable after ``EMBEDDING_COMPACT_MODE`` changes.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+
+settings = get_settings()
+
+COMPACT_MODES = ("int8", "float16")
+
+
+def compact_mode() -> Optional[str]:
+    """Configured compact mode, or None when compact storage is disabled."""
+
+    mode = (settings.embedding_compact_mode or "none").lower()
+    return mode if mode in COMPACT_MODES else None
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization.
+
+    Args:
+        vectors: ``(n, dim)`` float array
+
+    Returns:
+        Tuple of ``(codes int8 (n, dim), scales float32 (n,))``
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[..., None]
+
+
+def encode_embedding(
+    embedding: Optional[Sequence[float]], mode: Optional[str] = None, dim: int = 384
+) -> Optional[bytes]:
+    """
+    Encode an embedding as a compact blob.
+
+    Returns None when compact storage is disabled or the vector is missing,
+    malformed or zero.
+    """
+    mode = mode or compact_mode()
+    if mode is None or embedding is None:
+        return None
+
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vector)
+    if vector.shape[0] != dim or not np.isfinite(norm) or norm == 0:
+        return None
+    vector = vector / norm
+
+    if mode == "float16":
+        return vector.astype(np.float16).tobytes()
+
+    codes, scales = quantize_int8(vector)
+    return scales.tobytes() + codes.tobytes()
+
+
+def decode_embedding(blob: Optional[bytes], dim: int = 384) -> Optional[np.ndarray]:
+    """Decode a compact blob back to a float32 unit vector."""
+
+    if not blob:
+        return None
+
+    blob = bytes(blob)
+    if len(blob) == dim * 2:
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    if len(blob) == dim + 4:
+        scale = np.frombuffer(blob[:4], dtype=np.float32)
+        codes = np.frombuffer(blob[4:], dtype=np.int8)
+        return dequantize_int8(codes.reshape(1, -1), scale)[0]
+    return None
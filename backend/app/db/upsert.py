@@ -0,0 +1,67 @@
+"""Dialect-aware ``INSERT ... ON CONFLICT`` helpers for PostgreSQL and SQLite."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session, table: Table):
+    """``insert()`` construct supporting ``on_conflict_*`` for the session's dialect."""
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert  # Lazy import
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert  # Lazy import
+    else:
+        raise NotImplementedError(f"ON CONFLICT is not supported on {dialect}")
+    return insert(table)
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Iterable[str]] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Insert rows, overwriting ``update_columns`` of rows that already exist.
+
+    Args:
+        db: Database session (the caller commits)
+        table: Target table
+        rows: Row dicts; all rows must have the same keys
+        conflict_columns: Columns of the unique constraint to resolve on
+        update_columns: Columns to overwrite on conflict (defaults to all
+            non-conflict columns present in the rows)
+        batch_size: Rows per statement
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    if update_columns is None:
+        update_columns = [key for key in rows[0] if key not in conflict_columns]
+    update_columns = list(update_columns)
+
+    for start in range(0, len(rows), batch_size):
+        batch: List[Dict[str, Any]] = list(rows[start : start + batch_size])
+        statement = insert_for(db, table).values(batch)
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: statement.excluded[column] for column in update_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=list(conflict_columns)
+            )
+        db.execute(statement)
+    return len(rows)
@@ -0,0 +1,78 @@
+"""
+URL canonicalization shared by the models and the ingestion dedup checks.
+
+Scraped URLs are matched on their canonical form (lower-case host, no
+fragment, default port, trailing slash or tracking parameters), so the same
+story shared with different ``utm_*`` tags maps to one article.
+"""
+
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ocid",
+    "cmpid",
+    "ns_mchannel",
+    "ns_source",
+    "ns_campaign",
+    "ns_linkname",
+    "ns_fee",
+    "ref",
+    "ref_src",
+    "rss",
+    "feature",
+    "xtor",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "itm_")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of an article URL used for duplicate detection.
+
+    Args:
+        url: URL as scraped
+
+    Returns:
+        Canonical URL, or the stripped input if it is not an absolute
+        http(s) URL (None for empty input)
+    """
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    # http and https versions of a page are the same article
+    return urlunsplit(("https", host, path, urlencode(query), ""))
@@ -20,6 +20,7 @@ from app.monitoring.metrics import (
     exceptions_total,
 )
 from app.middleware import RateLimitMiddleware, SecurityHeadersMiddleware
+from app.services.full_text import ensure_full_text_index
 
 # Configure structured logging
 settings_obj = get_settings()
@@ -85,6 +86,24 @@ async def startup_event():
         logger.error(f"Error initializing database: {e}")
         raise
 
+    # Full-text search index (FTS5 on SQLite; PostgreSQL uses migration 019)
+    try:
+        with engine.begin() as conn:
+            if not ensure_full_text_index(conn):
+                logger.warning("Full-text index missing; article search uses ILIKE")
+    except Exception as e:
+        logger.warning(f"Could not initialize full-text index: {e}")
+
+    # Map embedding snapshots so search workers start without a full table scan
+    if settings.vector_snapshot_dir:
+        from app.services.vector_index import get_article_index, get_keyword_index
+
+        for index in (get_article_index(), get_keyword_index()):
+            try:
+                index.load_snapshot()
+            except Exception as e:
+                logger.warning(f"Could not load embedding snapshot: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
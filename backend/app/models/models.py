@@ -13,12 +13,16 @@ from sqlalchemy import (
     CheckConstraint,
     UniqueConstraint,
     Index,
+    LargeBinary,
+    event,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.db.quantization import encode_embedding
 from app.db.types import ArrayType, JSONBType, VectorType
+from app.db.urls import canonicalize_url
 
 
 class Keyword(Base):
@@ -46,6 +50,7 @@ class Keyword(Base):
     next_search_after = Column(DateTime, nullable=True)
     search_priority = Column(Integer, default=0)
     embedding = Column(VectorType(384))
+    embedding_compact = Column(LargeBinary)  # int8/float16 copy of embedding
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -56,6 +61,12 @@ class Keyword(Base):
     sentiment_trends = relationship(
         "SentimentTrend", back_populates="keyword", cascade="all, delete-orphan"
     )
+    sentiment_rollup = relationship(
+        "KeywordSentimentRollup",
+        back_populates="keyword",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
     evaluations = relationship(
         "KeywordEvaluation", back_populates="keyword", cascade="all, delete-orphan"
     )
@@ -74,6 +85,7 @@ class Article(Base):
     summary = Column(Text)
     full_text = Column(Text)
     source_url = Column(Text, unique=True, nullable=False, index=True)
+    canonical_url = Column(Text, index=True)  # source_url without tracking params
     source = Column(String(255), index=True)
     published_date = Column(DateTime, index=True)
     scraped_date = Column(DateTime, default=func.now())
@@ -86,6 +98,7 @@ class Article(Base):
     )  # Added field for sentiment classification
     credibility_score = Column(Float, default=0.5)
     embedding = Column(VectorType(384))
+    embedding_compact = Column(LargeBinary)  # int8/float16 copy of embedding
 
     # Sentiment fields
     sentiment_overall = Column(Float)  # -1.0 to 1.0
@@ -111,6 +124,21 @@ class Article(Base):
     )
 
 
+@event.listens_for(Keyword.embedding, "set")
+@event.listens_for(Article.embedding, "set")
+def _update_compact_embedding(target, value, oldvalue, initiator):
+    """Keep ``embedding_compact`` in step with ``embedding`` when enabled."""
+
+    target.embedding_compact = encode_embedding(value)
+
+
+@event.listens_for(Article.source_url, "set")
+def _update_canonical_url(target, value, oldvalue, initiator):
+    """Keep ``canonical_url`` in step with ``source_url``."""
+
+    target.canonical_url = canonicalize_url(value)
+
+
 class KeywordArticle(Base):
     """Junction table for keywords and articles with relevance scoring."""
 
@@ -204,6 +232,10 @@ class SentimentTrend(Base):
     negative_count = Column(Integer)
     neutral_count = Column(Integer)
     top_sources = Column(JSONBType())  # Which sources were most positive/negative
+    # Running sums for incremental updates at ingest time
+    weighted_sum = Column(Float)  # sum(sentiment * confidence weight)
+    weight_total = Column(Float)  # sum(confidence weight)
+    source_stats = Column(JSONBType())  # source -> [sentiment sum, article count]
 
     # Relationships
     keyword = relationship("Keyword", back_populates="sentiment_trends")
@@ -221,6 +253,31 @@ class SentimentTrend(Base):
     )
 
 
+class KeywordSentimentRollup(Base):
+    """All-time sentiment totals per keyword, maintained at ingest time."""
+
+    __tablename__ = "keyword_sentiment_rollups"
+
+    keyword_id = Column(
+        Integer, ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True
+    )
+    article_count = Column(Integer, nullable=False, default=0)
+    sentiment_sum = Column(Float, nullable=False, default=0.0)
+    # Counts by stored sentiment_classification
+    strongly_positive_count = Column(Integer, nullable=False, default=0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    strongly_negative_count = Column(Integer, nullable=False, default=0)
+    # Counts by score (> 0.2 / < -0.2), used by keyword comparisons
+    score_positive_count = Column(Integer, nullable=False, default=0)
+    score_negative_count = Column(Integer, nullable=False, default=0)
+    source_stats = Column(JSONBType())  # source -> [sentiment sum, article count]
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    keyword = relationship("Keyword", back_populates="sentiment_rollup")
+
+
 class ComparativeSentiment(Base):
     """Comparative sentiment analysis between keywords."""
 
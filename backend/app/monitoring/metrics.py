@@ -96,6 +96,13 @@ sentiment_analyses_total = Counter(
     "sentiment_analyses_total", "Total sentiment analyses performed", registry=registry
 )
 
+gemini_requests_total = Counter(
+    "gemini_requests_total",
+    "Gemini requests by response cache result (hit, miss or bypass)",
+    ["cache"],
+    registry=registry,
+)
+
 documents_uploaded_total = Counter(
     "documents_uploaded_total",
     "Total documents uploaded",
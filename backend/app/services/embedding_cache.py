@@ -0,0 +1,191 @@
+"""
+Two-tier cache for sentence embeddings.
+
+Embeddings are keyed by model name and a SHA-256 of the normalized text. The
+first tier is an in-process LRU; the second is Redis (shared between API and
+Celery workers), storing vectors as raw float32 bytes. Both tiers keep float32
+(1.5 KB per 384-d vector instead of ~12 KB as a list of Python floats);
+lists are only built when a vector is returned. Redis is optional - when it
+is unavailable only the in-process tier is used.
+"""
+
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.cache import get_cache
+from app.config import get_settings
+from app.monitoring.metrics import cache_hits, cache_misses
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (NFC, collapsed whitespace)."""
+
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """In-process LRU in front of a Redis store for embedding vectors."""
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int = 384,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        use_redis: bool = True,
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_entries = max_entries or settings.embedding_cache_size
+        self.ttl_seconds = ttl_seconds or settings.embedding_cache_ttl_seconds
+        self.use_redis = use_redis
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+
+    def key_for(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"emb:{self.model_name}:{digest}"
+
+    def _redis(self):
+        if not self.use_redis:
+            return None
+        cache = get_cache()
+        return cache.redis_client if cache.available else None
+
+    def _is_valid(self, embedding) -> bool:
+        if embedding is None:
+            return False
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector.shape == (self.dim,) and bool(np.any(vector))
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        with self._lock:
+            self._memory[key] = embedding
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Cached embedding or None for each text (same order as input)
+        """
+        keys = [self.key_for(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        pending: Dict[str, List[int]] = {}
+
+        memory_hits = 0
+        with self._lock:
+            for position, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    results[position] = embedding
+                    memory_hits += 1
+                else:
+                    pending.setdefault(key, []).append(position)
+
+        self._stats["memory_hits"] += memory_hits
+        if memory_hits:
+            cache_hits.labels(cache_name="embeddings").inc(memory_hits)
+        if pending:
+            pending = self._fetch_from_redis(pending, results)
+
+        missed = sum(len(positions) for positions in pending.values())
+        if missed:
+            self._stats["misses"] += missed
+            cache_misses.labels(cache_name="embeddings").inc(missed)
+        return [None if vector is None else vector.tolist() for vector in results]
+
+    def _fetch_from_redis(
+        self, pending: Dict[str, List[int]], results: List[Optional[np.ndarray]]
+    ) -> Dict[str, List[int]]:
+        client = self._redis()
+        if client is None:
+            return pending
+
+        keys = list(pending)
+        try:
+            values = client.mget(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return pending
+
+        still_missing: Dict[str, List[int]] = {}
+        for key, raw in zip(keys, values):
+            if not raw:
+                still_missing[key] = pending[key]
+                continue
+            embedding = np.frombuffer(raw, dtype=np.float32)
+            self._remember(key, embedding)
+            for position in pending[key]:
+                results[position] = embedding
+            self._stats["redis_hits"] += len(pending[key])
+            cache_hits.labels(cache_name="embeddings").inc(len(pending[key]))
+        return still_missing
+
+    def get(self, text: str) -> Optional[List[float]]:
+        return self.get_many([text])[0]
+
+    def set_many(
+        self, texts: Sequence[str], embeddings: Sequence[Optional[List[float]]]
+    ) -> None:
+        """Store embeddings; empty, zero or malformed vectors are never cached."""
+
+        entries = {}
+        for text, embedding in zip(texts, embeddings):
+            if self._is_valid(embedding):
+                key = self.key_for(text)
+                vector = np.array(embedding, dtype=np.float32)
+                self._remember(key, vector)
+                entries[key] = vector
+        if not entries:
+            return
+
+        self._stats["stores"] += len(entries)
+        client = self._redis()
+        if client is None:
+            return
+
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for key, embedding in entries.items():
+                pipeline.setex(key, self.ttl_seconds, embedding.tobytes())
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    def set(self, text: str, embedding: Optional[List[float]]) -> None:
+        self.set_many([text], [embedding])
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire via TTL)."""
+
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> dict:
+        lookups = (
+            self._stats["memory_hits"] + self._stats["redis_hits"] + self._stats["misses"]
+        )
+        hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "entries": len(self._memory),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,322 @@
+"""
+Versioned on-disk embedding snapshots for memory-mapped search.
+
+A snapshot holds every embedding of a table as ``.npy`` arrays:
+
+- ``vectors``: ``(n, dim)`` normalized vectors (float32, float16 or int8)
+- ``scales``: per-row int8 scales (int8 storage only)
+- ``ids``: row IDs aligned with ``vectors``
+- ``sorted_ids`` / ``sorted_rows``: ID lookup table for pre-filtered search
+- ``centroids`` / ``offsets``: IVF partitioning; rows are written grouped by
+  centroid so every inverted list is one contiguous slice of ``vectors``
+
+Workers open the arrays with ``np.load(mmap_mode="r")`` so pages are shared
+through the OS page cache instead of being copied into each process. The
+``<table>.manifest.json`` file names the current version and the highest row
+ID it covers; rows after that are applied as a delta.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.quantization import compact_mode, dequantize_int8, quantize_int8
+from app.services.similarity import (
+    EMBEDDING_DIM,
+    STORAGE_DTYPES,
+    normalize_rows,
+    spherical_kmeans,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MIN_POINTS_PER_CENTROID = 39
+MAX_TRAINING_POINTS = 50000
+
+
+def _snapshot_dir(directory: Optional[str] = None) -> Optional[Path]:
+    directory = directory or settings.vector_snapshot_dir
+    return Path(directory) if directory else None
+
+
+def _manifest_path(directory: Path, table: str) -> Path:
+    return directory / f"{table}.manifest.json"
+
+
+class EmbeddingSnapshot:
+    """Read-only, memory-mapped view of an exported snapshot."""
+
+    def __init__(self, directory: Path, manifest: Dict):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.dim = manifest["dim"]
+        self.count = manifest["count"]
+        self.max_id = manifest["max_id"]
+        self.storage = manifest["storage"]
+
+        arrays = {}
+        for name, filename in manifest["files"].items():
+            arrays[name] = np.load(directory / filename, mmap_mode="r")
+        self.vectors = arrays["vectors"]
+        self.scales = arrays.get("scales")
+        self.ids = arrays["ids"]
+        self.sorted_ids = arrays["sorted_ids"]
+        self.sorted_rows = arrays["sorted_rows"]
+        self.centroids = arrays.get("centroids")
+        self.offsets = arrays.get("offsets")
+
+    def rows_for(self, ids: Iterable[int]) -> np.ndarray:
+        """Row positions of the given IDs (unknown IDs are dropped)."""
+
+        wanted = np.fromiter(ids, dtype=np.int64)
+        if wanted.size == 0 or self.count == 0:
+            return np.empty(0, dtype=np.int64)
+        positions = np.searchsorted(self.sorted_ids, wanted)
+        positions = np.clip(positions, 0, self.count - 1)
+        found = self.sorted_ids[positions] == wanted
+        return np.sort(np.asarray(self.sorted_rows[positions[found]], dtype=np.int64))
+
+    def contains(self, item_id: int) -> bool:
+        return self.rows_for([item_id]).size > 0
+
+    def probe_rows(self, query: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        """Rows of the ``nprobe`` inverted lists closest to ``query``."""
+
+        if self.centroids is None:
+            return None
+        nlist = self.centroids.shape[0]
+        nprobe = min(max(1, nprobe), nlist)
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate(
+            [np.arange(self.offsets[probe], self.offsets[probe + 1]) for probe in probes]
+        ).astype(np.int64)
+
+    def dequantize(self, rows) -> np.ndarray:
+        block = self.vectors[rows]
+        if self.storage == "int8":
+            return dequantize_int8(block, self.scales[rows])
+        return np.asarray(block, dtype=np.float32)
+
+
+def export_snapshot(
+    db: Session,
+    model,
+    directory: Optional[str] = None,
+    storage: Optional[str] = None,
+    nlist: Optional[int] = None,
+    batch_size: int = 5000,
+    dim: int = EMBEDDING_DIM,
+) -> Dict:
+    """
+    Write all embeddings of ``model`` to a new snapshot version.
+
+    Rows are streamed from the database into a temporary float32 memmap, so
+    memory stays bounded by ``batch_size`` regardless of the table size.
+
+    Args:
+        db: Database session
+        model: Model with an ``embedding`` column (Article or Keyword)
+        directory: Snapshot directory (defaults to ``VECTOR_SNAPSHOT_DIR``)
+        storage: ``float32``, ``float16`` or ``int8`` (defaults to compact mode)
+        nlist: IVF lists (defaults to ``VECTOR_INDEX_NLIST``; 1 disables IVF)
+        batch_size: Rows fetched per query
+        dim: Embedding dimensionality
+
+    Returns:
+        The manifest of the written snapshot
+    """
+    target = _snapshot_dir(directory)
+    if target is None:
+        raise ValueError("VECTOR_SNAPSHOT_DIR is not configured")
+    target.mkdir(parents=True, exist_ok=True)
+
+    table = model.__tablename__
+    storage = storage or compact_mode() or "float32"
+    version = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+    prefix = f"{table}.v{version}"
+
+    # Rows above max_id are left for the workers' delta sync.
+    max_id = db.query(func.max(model.id)).scalar() or 0
+    capacity = (
+        db.query(func.count(model.id))
+        .filter(model.id <= max_id, model.embedding.isnot(None))
+        .scalar()
+        or 0
+    )
+
+    raw_path = target / f"{prefix}.raw.npy"
+    raw = open_memmap(raw_path, mode="w+", dtype=np.float32, shape=(max(capacity, 1), dim))
+    ids = np.empty(capacity, dtype=np.int64)
+    count = 0
+    last_id = 0
+    while count < capacity:
+        rows = (
+            db.query(model.id, model.embedding)
+            .filter(
+                model.id > last_id,
+                model.id <= max_id,
+                model.embedding.isnot(None),
+            )
+            .order_by(model.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        usable = [
+            (row[0], row[1]) for row in rows if row[1] is not None and len(row[1]) == dim
+        ]
+        if not usable:
+            continue
+        normalized, valid = normalize_rows(np.asarray([pair[1] for pair in usable]))
+        batch_ids = np.asarray([pair[0] for pair in usable], dtype=np.int64)[valid]
+        batch = normalized[valid][: capacity - count]
+        raw[count : count + batch.shape[0]] = batch
+        ids[count : count + batch.shape[0]] = batch_ids[: batch.shape[0]]
+        count += batch.shape[0]
+
+    ids = ids[:count]
+    centroids, labels, nlist = _partition(raw, count, nlist or settings.vector_index_nlist)
+    order = np.argsort(labels, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))])
+
+    files = {}
+
+    def _save(name: str, array: np.ndarray) -> None:
+        filename = f"{prefix}.{name}.npy"
+        np.save(target / filename, array)
+        files[name] = filename
+
+    vectors_name = f"{prefix}.vectors.npy"
+    vectors = open_memmap(
+        target / vectors_name,
+        mode="w+",
+        dtype=STORAGE_DTYPES[storage],
+        shape=(max(count, 1), dim),
+    )
+    scales = np.ones(max(count, 1), dtype=np.float32)
+    for start in range(0, count, batch_size):
+        block = np.asarray(raw[order[start : start + batch_size]])
+        if storage == "int8":
+            block, scales[start : start + block.shape[0]] = quantize_int8(block)
+        vectors[start : start + block.shape[0]] = block
+    vectors.flush()
+    files["vectors"] = vectors_name
+    del vectors, raw
+    raw_path.unlink()
+
+    if storage == "int8":
+        _save("scales", scales)
+    ordered_ids = ids[order]
+    id_order = np.argsort(ordered_ids, kind="stable")
+    _save("ids", ordered_ids)
+    _save("sorted_ids", ordered_ids[id_order])
+    _save("sorted_rows", id_order.astype(np.int64))
+    if centroids is not None:
+        _save("centroids", centroids)
+        _save("offsets", offsets.astype(np.int64))
+
+    manifest = {
+        "table": table,
+        "version": version,
+        "dim": dim,
+        "count": int(count),
+        "max_id": int(max_id),
+        "storage": storage,
+        "nlist": int(nlist),
+        "created_at": datetime.utcnow().isoformat(),
+        "files": files,
+    }
+
+    # Publish atomically so workers never read a half-written manifest.
+    manifest_path = _manifest_path(target, table)
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, manifest_path)
+
+    _remove_old_versions(target, table, keep=settings.vector_snapshot_keep)
+    logger.info(
+        f"Exported {count} {table} embeddings to snapshot v{version} ({storage}, nlist={nlist})"
+    )
+    return manifest
+
+
+def _partition(
+    raw: np.ndarray, count: int, nlist: int
+) -> Tuple[Optional[np.ndarray], np.ndarray, int]:
+    """Train IVF centroids on a sample and label every row."""
+
+    if nlist <= 1 or count < nlist * MIN_POINTS_PER_CENTROID:
+        return None, np.zeros(count, dtype=np.int64), 1
+
+    rng = np.random.default_rng(0)
+    sample_rows = np.arange(count)
+    if count > MAX_TRAINING_POINTS:
+        sample_rows = np.sort(rng.choice(count, MAX_TRAINING_POINTS, replace=False))
+    centroids = spherical_kmeans(np.asarray(raw[sample_rows]), nlist)
+
+    labels = np.empty(count, dtype=np.int64)
+    block = 8192
+    for start in range(0, count, block):
+        labels[start : start + block] = np.argmax(
+            np.asarray(raw[start : start + block]) @ centroids.T, axis=1
+        )
+    return centroids, labels, nlist
+
+
+def _remove_old_versions(directory: Path, table: str, keep: int) -> None:
+    versions = sorted(
+        {path.name.split(".")[1] for path in directory.glob(f"{table}.v*.npy")}
+    )
+    for version in versions[: max(0, len(versions) - max(1, keep))]:
+        for path in directory.glob(f"{table}.{version}.*.npy"):
+            # Workers that still map an old file keep their pages until
+            # they reload; unlinking does not invalidate existing mappings.
+            path.unlink(missing_ok=True)
+
+
+def snapshot_version(table: str, directory: Optional[str] = None) -> Optional[str]:
+    """Version named by the current manifest of ``table`` (maps no files)."""
+
+    target = _snapshot_dir(directory)
+    if target is None:
+        return None
+
+    try:
+        return json.loads(_manifest_path(target, table).read_text())["version"]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read {table} snapshot manifest: {e}")
+        return None
+
+
+def load_snapshot(table: str, directory: Optional[str] = None) -> Optional[EmbeddingSnapshot]:
+    """Open the current snapshot of ``table``, or None if there is none."""
+
+    target = _snapshot_dir(directory)
+    if target is None:
+        return None
+
+    manifest_path = _manifest_path(target, table)
+    if not manifest_path.exists():
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        return EmbeddingSnapshot(target, manifest)
+    except Exception as e:
+        logger.warning(f"Failed to load {table} embedding snapshot: {e}")
+        return None
@@ -8,6 +8,10 @@ import logging
 import numpy as np
 from typing import List, Optional
 
+from app.config import get_settings
+from app.services.embedding_cache import EmbeddingCache
+from app.services.similarity import SimilarityEngine
+
 # Lazy import to avoid heavy dependency during lightweight unit tests.
 try:  # pragma: no cover - tested via high level behaviour
     from sentence_transformers import SentenceTransformer
@@ -28,6 +32,7 @@ except Exception:  # pragma: no cover
     SentenceTransformer = _FallbackSentenceTransformer  # type: ignore
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 # Model will generate 384-dimensional embeddings (matches our database schema)
 MODEL_NAME = "all-MiniLM-L6-v2"
@@ -38,6 +43,11 @@ class EmbeddingGenerator:
 
     def __init__(self):
         self.embedding_dim = 384
+        self.cache = (
+            EmbeddingCache(MODEL_NAME, dim=self.embedding_dim)
+            if settings.embedding_cache_enabled
+            else None
+        )
         try:
             self.model = SentenceTransformer(MODEL_NAME)
             if (
@@ -71,25 +81,35 @@ class EmbeddingGenerator:
             logger.warning("Empty text provided for embedding")
             return None
 
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+
         try:
             # Generate embedding
             embedding = self.model.encode(text, convert_to_numpy=True)
 
             # Convert to list for JSON serialization
-            return embedding.tolist()
+            result = embedding.tolist()
+            if self.cache is not None:
+                self.cache.set(text, result)
+            return result
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {str(e)}")
             return None
 
     def generate_embeddings_batch(
-        self, texts: List[str]
+        self, texts: List[str], batch_size: Optional[int] = None
     ) -> List[Optional[List[float]]]:
         """
         Generate embeddings for multiple texts (more efficient).
 
         Args:
             texts: List of texts to embed
+            batch_size: Maximum texts per encode call (defaults to
+                ``EMBEDDING_BATCH_SIZE``)
 
         Returns:
             List of embedding vectors (same order as input)
@@ -113,13 +133,33 @@ class EmbeddingGenerator:
             if not valid_texts:
                 return [None] * len(texts)
 
-            # Generate embeddings in batch
-            embeddings = self.model.encode(valid_texts, convert_to_numpy=True)
+            results = [None] * len(texts)
+            if self.cache is not None:
+                cached = self.cache.get_many(valid_texts)
+                for i, embedding in zip(valid_indices, cached):
+                    results[i] = embedding
+                valid_indices = [
+                    i for i, embedding in zip(valid_indices, cached) if embedding is None
+                ]
+                valid_texts = [texts[i] for i in valid_indices]
+                if not valid_texts:
+                    return results
+
+            # Encode each distinct uncached text once
+            unique_texts = list(dict.fromkeys(valid_texts))
+            batch_size = max(1, batch_size or settings.embedding_batch_size)
+            encoded = {}
+            for start in range(0, len(unique_texts), batch_size):
+                chunk = unique_texts[start : start + batch_size]
+                embeddings = self.model.encode(chunk, convert_to_numpy=True)
+                for text, embedding in zip(chunk, embeddings):
+                    encoded[text] = embedding.tolist()
+            if self.cache is not None:
+                self.cache.set_many(unique_texts, list(encoded.values()))
 
             # Map back to original positions
-            results = [None] * len(texts)
-            for i, embedding in zip(valid_indices, embeddings):
-                results[i] = embedding.tolist()
+            for i, text in zip(valid_indices, valid_texts):
+                results[i] = encoded[text]
 
             return results
 
@@ -172,20 +212,46 @@ class EmbeddingGenerator:
             List of (index, similarity_score) tuples, sorted by similarity
         """
         try:
-            similarities = []
-            for i, candidate in enumerate(candidate_embeddings):
-                if candidate:  # Skip None embeddings
-                    sim = self.compute_similarity(query_embedding, candidate)
-                    similarities.append((i, sim))
+            engine = SimilarityEngine.from_embeddings(
+                candidate_embeddings, dim=self.embedding_dim
+            )
+            return engine.top_k(np.asarray(query_embedding), top_k)[0]
+
+        except Exception as e:
+            logger.error(f"Failed to find similar embeddings: {str(e)}")
+            return []
+
+    def find_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        candidate_embeddings: List[List[float]],
+        top_k: int = 10,
+    ) -> List[List[tuple]]:
+        """
+        Find the most similar candidates for several queries at once.
+
+        Args:
+            query_embeddings: Query vectors
+            candidate_embeddings: List of candidate vectors
+            top_k: Number of top results per query
 
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+        Returns:
+            One list of (index, similarity_score) tuples per query
+        """
+        if not query_embeddings:
+            return []
 
-            return similarities[:top_k]
+        try:
+            engine = SimilarityEngine.from_embeddings(
+                candidate_embeddings, dim=self.embedding_dim
+            )
+            return engine.top_k(
+                np.asarray(query_embeddings, dtype=np.float32), top_k
+            )
 
         except Exception as e:
             logger.error(f"Failed to find similar embeddings: {str(e)}")
-            return []
+            return [[] for _ in query_embeddings]
 
 
 # Global generator instance
@@ -0,0 +1,190 @@
+"""
+Concurrent Gemini/NLP enrichment stage of the ingestion pipeline.
+
+Scraping runs dedup -> enrichment -> batched embeddings -> bulk write. The
+enrichment calls (keyword extraction, fact/opinion classification and
+sentiment; one combined request per article by default) are network bound,
+so articles are enriched on a bounded thread pool; every Gemini request
+still goes through the client's shared rate limiter, which keeps the run
+inside ``gemini_rate_limit_per_minute``. spaCy is CPU bound, so the whole
+batch is parsed up front with ``nlp.pipe`` (one parse per article), and the
+sentiment of short articles is requested in batches first (in ``combined``
+mode the per-article request then leaves sentiment out).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def enrich_article(
+    article_data,
+    keyword_extractor,
+    sentiment_analyzer,
+    gemini_sentiment=None,
+    spacy_result=None,
+) -> Dict:
+    """
+    Extract keywords, classify and analyze sentiment for one scraped article.
+
+    Args:
+        article_data: Scraped article (``NewsArticle``)
+        keyword_extractor: Keyword extractor
+        sentiment_analyzer: Sentiment analyzer
+        gemini_sentiment: Gemini sentiment already obtained from a batched request
+        spacy_result: spaCy entities and noun chunks from ``extract_spacy_batch``
+
+    Returns:
+        Prepared item with ``data``, ``extraction``, ``sentiment`` and
+        de-duplicated ``keywords``
+    """
+    analysis = None
+    if settings.gemini_analysis_mode == "combined":
+        # One request instead of three; missing sections fall back to
+        # their separate requests
+        analysis = keyword_extractor.analyze_article_gemini(
+            article_data.title,
+            article_data.full_text,
+            article_data.source_name,
+            include_sentiment=settings.enable_gemini_sentiment and not gemini_sentiment,
+        )
+    analysis = analysis or {}
+
+    extraction = keyword_extractor.extract_all(
+        article_data.title,
+        article_data.full_text,
+        use_gemini=True,
+        gemini_analysis=analysis,
+        spacy_result=spacy_result,
+    )
+    sentiment = sentiment_analyzer.analyze_article(
+        article_data.title,
+        article_data.full_text,
+        article_data.source_name,
+        use_gemini=True,
+        gemini_result=gemini_sentiment or analysis.get("sentiment"),
+    )
+    return {
+        "data": article_data,
+        "extraction": extraction,
+        "sentiment": sentiment,
+        "keywords": list(dict.fromkeys(extraction["keywords"])),
+    }
+
+
+def enrich_articles(
+    articles: Sequence,
+    keyword_extractor,
+    sentiment_analyzer,
+    max_workers: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Enrich articles concurrently, keeping the input order.
+
+    Articles whose enrichment fails are logged and left out.
+
+    Args:
+        articles: Scraped articles that passed dedup
+        keyword_extractor: Keyword extractor (shared by all threads)
+        sentiment_analyzer: Sentiment analyzer (shared by all threads)
+        max_workers: Concurrent articles (defaults to ``scraping_enrichment_workers``)
+
+    Returns:
+        Prepared items as returned by ``enrich_article``
+    """
+    sentiments = batch_sentiment(articles, sentiment_analyzer)
+    parses = keyword_extractor.extract_spacy_batch(
+        [article_data.full_text or "" for article_data in articles]
+    )
+
+    workers = min(max_workers or settings.scraping_enrichment_workers, len(articles))
+    if workers <= 1:
+        results = []
+        for article_data, sentiment, parsed in zip(articles, sentiments, parses):
+            try:
+                results.append(
+                    enrich_article(
+                        article_data, keyword_extractor, sentiment_analyzer, sentiment, parsed
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Failed to process article: {str(e)}")
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as pool:
+        futures = [
+            pool.submit(
+                enrich_article,
+                article_data,
+                keyword_extractor,
+                sentiment_analyzer,
+                sentiment,
+                parsed,
+            )
+            for article_data, sentiment, parsed in zip(articles, sentiments, parses)
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Failed to process article: {str(e)}")
+    return results
+
+
+def batch_sentiment(articles: Sequence, sentiment_analyzer) -> List[Optional[Dict]]:
+    """
+    Batched Gemini sentiment for the short articles of a run.
+
+    Used in both analysis modes; ``enrich_article`` leaves sentiment out of
+    the combined request for articles answered here. Articles that are long,
+    or missing from a batch answer, get None and fall back to a
+    single-article (or combined) request during enrichment.
+
+    Args:
+        articles: Scraped articles
+        sentiment_analyzer: Sentiment analyzer
+
+    Returns:
+        Gemini sentiment or None for each article, in input order
+    """
+    sentiments: List[Optional[Dict]] = [None] * len(articles)
+    if not settings.enable_gemini_sentiment or settings.gemini_sentiment_batch_size <= 1:
+        return sentiments
+
+    short = [
+        index
+        for index, article_data in enumerate(articles)
+        if len(article_data.full_text or "") <= settings.gemini_sentiment_batch_max_chars
+    ]
+    if len(short) < 2:
+        return sentiments
+
+    try:
+        results = sentiment_analyzer.analyze_sentiment_gemini_batch(
+            [
+                (
+                    articles[index].title,
+                    articles[index].full_text or "",
+                    articles[index].source_name,
+                )
+                for index in short
+            ],
+            fallback=False,
+        )
+    except Exception as e:
+        logger.error(f"Batched sentiment analysis failed: {str(e)}")
+        return sentiments
+
+    for index, result in zip(short, results):
+        sentiments[index] = result
+    logger.info(
+        f"Batched Gemini sentiment for {sum(r is not None for r in results)} "
+        f"of {len(short)} short articles"
+    )
+    return sentiments
@@ -0,0 +1,257 @@
+"""
+Full-text search over article title, summary and body.
+
+PostgreSQL: a weighted ``articles.search_vector`` tsvector kept current by a
+trigger (migration 019), stemmed with the text search configuration of each
+article's ``language``, served by a GIN index and ranked with ``ts_rank_cd``.
+
+SQLite: an external-content FTS5 table (``articles_fts``) with the porter
+stemmer and diacritic folding, kept current by triggers and ranked with
+``bm25``. FTS5 only ships an English stemmer.
+
+When neither index exists the search endpoint keeps its ILIKE filter.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Float, Integer, bindparam, func, literal_column, text
+from sqlalchemy.orm import Query, Session
+
+from app.models.models import Article
+
+logger = logging.getLogger(__name__)
+
+# Article language code -> PostgreSQL text search configuration
+LANGUAGE_CONFIGS = {
+    "en": "english",
+    "de": "german",
+    "fr": "french",
+    "es": "spanish",
+    "it": "italian",
+    "nl": "dutch",
+    "sv": "swedish",
+    "da": "danish",
+}
+DEFAULT_CONFIG = "simple"
+
+# bm25 column weights for (title, summary, full_text)
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+    "MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter= … "
+)
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, summary, full_text, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, summary, full_text) "
+    "VALUES (new.id, new.title, new.summary, new.full_text); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, summary, full_text) "
+    "VALUES ('delete', old.id, old.title, old.summary, old.full_text); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au "
+    "AFTER UPDATE OF title, summary, full_text ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, summary, full_text) "
+    "VALUES ('delete', old.id, old.title, old.summary, old.full_text); "
+    "INSERT INTO articles_fts(rowid, title, summary, full_text) "
+    "VALUES (new.id, new.title, new.summary, new.full_text); END",
+)
+
+# PostgreSQL schemas known to carry articles.search_vector (per database URL)
+_postgres_ready: Dict[str, bool] = {}
+
+
+def ensure_full_text_index(conn) -> bool:
+    """
+    Create the SQLite FTS5 table and its triggers if they are missing.
+
+    PostgreSQL objects come from migration 019 / ``init_db.sql``; for
+    PostgreSQL this only reports whether they exist.
+
+    Args:
+        conn: SQLAlchemy connection
+
+    Returns:
+        True when a full-text index is available
+    """
+    if conn.dialect.name == "postgresql":
+        return _postgres_has_index(conn)
+    if conn.dialect.name != "sqlite":
+        return False
+
+    if _sqlite_has_index(conn):
+        return True
+
+    for statement in SQLITE_FTS_DDL:
+        conn.execute(text(statement))
+    # Index rows that predate the FTS table
+    conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+    logger.info("Created SQLite FTS5 index for articles")
+    return True
+
+
+def _sqlite_has_index(conn) -> bool:
+    # Dropping ``articles`` also drops the triggers, so check for both.
+    found = conn.execute(
+        text(
+            "SELECT count(*) FROM sqlite_master WHERE "
+            "(type = 'table' AND name = 'articles_fts') OR "
+            "(type = 'trigger' AND name LIKE 'articles_fts_%')"
+        )
+    ).scalar()
+    # One virtual table plus its three triggers
+    return found == len(SQLITE_FTS_DDL)
+
+
+def _postgres_has_index(conn) -> bool:
+    key = str(conn.engine.url)
+    if not _postgres_ready.get(key):
+        _postgres_ready[key] = (
+            conn.execute(
+                text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'articles' AND column_name = 'search_vector'"
+                )
+            ).first()
+            is not None
+        )
+    return _postgres_ready[key]
+
+
+def search_config(language: Optional[str]) -> str:
+    """PostgreSQL text search configuration for an article language code."""
+
+    return LANGUAGE_CONFIGS.get((language or "").lower(), DEFAULT_CONFIG)
+
+
+def fts5_match_expression(query_text: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every term is quoted (so FTS5 operators in user input are inert) and
+    terms are AND-ed; a trailing ``*`` keeps prefix matching.
+    """
+    terms = []
+    for token in re.findall(r"\w+\*?", query_text, flags=re.UNICODE):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class FullTextMatch:
+    """A full-text condition that can be applied to an ``Article`` query."""
+
+    def __init__(self, dialect: str, query_text: str, language: Optional[str]):
+        self.dialect = dialect
+        self.query_text = query_text
+        self.language = language
+        self.score = None
+
+        if dialect == "postgresql":
+            self.search_vector = literal_column("articles.search_vector")
+            self.tsquery = self._postgres_tsquery()
+            self.score = func.ts_rank_cd(self.search_vector, self.tsquery)
+        else:
+            self.match = fts5_match_expression(query_text)
+            self.fts = (
+                text(
+                    "SELECT rowid AS article_id, "
+                    f"bm25(articles_fts, {', '.join(str(w) for w in SQLITE_WEIGHTS)}) AS rank "
+                    "FROM articles_fts WHERE articles_fts MATCH :fts_match"
+                )
+                .bindparams(fts_match=self.match)
+                .columns(article_id=Integer, rank=Float)
+                .subquery("fts")
+            )
+            # bm25() is lower-is-better; negate so higher scores rank first.
+            self.score = -self.fts.c.rank
+
+    def _postgres_tsquery(self):
+        query = bindparam("fts_query", self.query_text)
+        if self.language:
+            configs = [search_config(self.language)]
+        else:
+            # Without a language filter, match each stemming variant of the query.
+            configs = [DEFAULT_CONFIG] + sorted(set(LANGUAGE_CONFIGS.values()))
+        tsquery = None
+        for config in configs:
+            part = func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), query)
+            tsquery = part if tsquery is None else tsquery.op("||")(part)
+        return tsquery
+
+    @property
+    def is_empty(self) -> bool:
+        return self.dialect != "postgresql" and not self.match
+
+    def apply(self, query_builder: Query) -> Query:
+        """Restrict an ``Article`` query to matching rows."""
+
+        if self.dialect == "postgresql":
+            return query_builder.filter(self.search_vector.op("@@")(self.tsquery))
+        return query_builder.join(self.fts, self.fts.c.article_id == Article.id)
+
+    def snippets(self, db: Session, article_ids: Iterable[int]) -> Dict[int, str]:
+        """Highlighted excerpts for the given (already matched) articles."""
+
+        article_ids = list(article_ids)
+        if not article_ids:
+            return {}
+
+        if self.dialect == "postgresql":
+            rows = (
+                db.query(
+                    Article.id,
+                    func.ts_headline(
+                        func.article_search_config(Article.language),
+                        func.coalesce(Article.summary, func.left(Article.full_text, 5000)),
+                        self.tsquery,
+                        HEADLINE_OPTIONS,
+                    ),
+                )
+                .filter(Article.id.in_(article_ids))
+                .all()
+            )
+        else:
+            ids = ", ".join(str(int(article_id)) for article_id in article_ids)
+            rows = db.execute(
+                text(
+                    "SELECT rowid, snippet(articles_fts, -1, :start, :end, ' … ', 24) "
+                    "FROM articles_fts WHERE articles_fts MATCH :fts_match "
+                    f"AND rowid IN ({ids})"
+                ),
+                {"start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "fts_match": self.match},
+            ).all()
+        return {row[0]: row[1] for row in rows}
+
+
+def build_full_text_match(
+    db: Session, query_text: str, language: Optional[str] = None
+) -> Optional[FullTextMatch]:
+    """
+    Full-text condition for ``query_text``, or None if no index is available.
+
+    Args:
+        db: Database session
+        query_text: User query (web-search syntax on PostgreSQL)
+        language: Optional article language filter, selects the stemmer
+    """
+    conn = db.connection()
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        available = _postgres_has_index(conn)
+    elif dialect == "sqlite":
+        available = _sqlite_has_index(conn)
+    else:
+        available = False
+
+    if not available:
+        return None
+    return FullTextMatch(dialect, query_text, language)
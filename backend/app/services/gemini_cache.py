@@ -0,0 +1,190 @@
+"""
+Response cache for Gemini requests.
+
+Responses are keyed by model name, a SHA-256 of the prompt and the
+generation config, so a request is only answered from cache when Gemini
+would have been asked exactly the same thing. The first tier is an
+in-process LRU; the second is Redis (shared between API and Celery workers)
+or a directory on disk (``memory`` uses the first tier only). Every entry
+carries the TTL chosen by its call site.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.cache import get_cache
+from app.config import get_settings
+from app.monitoring.metrics import cache_hits, cache_misses, gemini_requests_total
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+BACKENDS = ("redis", "disk", "memory")
+# Requests at or below this temperature are treated as deterministic
+DETERMINISTIC_TEMPERATURE = 0.2
+
+
+def cache_key(model_name: str, prompt: str, config: Dict[str, Any]) -> str:
+    """Cache key of a request (model, prompt hash and generation config)."""
+
+    digest = hashlib.sha256(
+        json.dumps({"prompt": prompt, "config": config}, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"gemini:{model_name}:{digest}"
+
+
+def resolve_ttl(temperature: float, cache_ttl: Optional[int]) -> int:
+    """
+    TTL for a request in seconds (0 disables caching).
+
+    Call sites pass ``cache_ttl`` explicitly; otherwise deterministic
+    requests are kept for ``gemini_cache_deterministic_ttl_seconds`` and
+    sampled ones are not cached.
+    """
+    if cache_ttl is not None:
+        return max(int(cache_ttl), 0)
+    if temperature <= DETERMINISTIC_TEMPERATURE:
+        return settings.gemini_cache_deterministic_ttl_seconds
+    return 0
+
+
+class GeminiResponseCache:
+    """In-process LRU in front of a Redis or disk store for Gemini responses."""
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        self.backend = (backend or settings.gemini_cache_backend or "memory").lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(
+                f"Invalid Gemini cache backend: expected one of {', '.join(BACKENDS)}"
+            )
+        self.max_entries = max_entries or settings.gemini_cache_size
+        self.cache_dir = cache_dir or settings.gemini_cache_dir or os.path.join(
+            tempfile.gettempdir(), "gemini_cache"
+        )
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def _remember(self, key: str, text: str, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        digest = key.rsplit(":", 1)[-1]
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def _load(self, key: str) -> Optional[Tuple[float, str]]:
+        if self.backend == "redis":
+            cache = get_cache()
+            if not cache.available:
+                return None
+            client = cache.redis_client
+            pipeline = client.pipeline(transaction=False)
+            pipeline.get(key)
+            pipeline.pttl(key)
+            raw, ttl_ms = pipeline.execute()
+            if not raw:
+                return None
+            text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+            return time.time() + max(ttl_ms or 0, 0) / 1000.0, text
+
+        if self.backend == "disk":
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as handle:
+                    entry = json.load(handle)
+            except FileNotFoundError:
+                return None
+            if entry["expires_at"] <= time.time():
+                os.remove(self._path(key))
+                return None
+            return entry["expires_at"], entry["text"]
+
+        return None
+
+    def _store(self, key: str, text: str, ttl_seconds: int) -> None:
+        if self.backend == "redis":
+            cache = get_cache()
+            if cache.available:
+                cache.redis_client.setex(key, ttl_seconds, text)
+        elif self.backend == "disk":
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump({"expires_at": time.time() + ttl_seconds, "text": text}, handle)
+            os.replace(temp_path, path)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for ``key``, or None (counted in metrics)."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._memory[key]
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None:
+            try:
+                entry = self._load(key)
+            except Exception as e:
+                logger.warning(f"Gemini cache lookup failed: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(key, entry[1], entry[0])
+
+        if entry is None:
+            self._stats["misses"] += 1
+            cache_misses.labels(cache_name="gemini").inc()
+            gemini_requests_total.labels(cache="miss").inc()
+            return None
+
+        self._stats["hits"] += 1
+        cache_hits.labels(cache_name="gemini").inc()
+        gemini_requests_total.labels(cache="hit").inc()
+        return entry[1]
+
+    def set(self, key: str, text: str, ttl_seconds: int) -> None:
+        """Store a response for ``ttl_seconds``; empty responses are never cached."""
+
+        if not text or ttl_seconds <= 0:
+            return
+        self._remember(key, text, time.time() + ttl_seconds)
+        self._stats["stores"] += 1
+        try:
+            self._store(key, text, ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Gemini cache store failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-process tier (shared entries expire via TTL)."""
+
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "backend": self.backend,
+            "entries": len(self._memory),
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
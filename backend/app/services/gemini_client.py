@@ -1,9 +1,14 @@
 """Google Gemini API client with rate limiting and error handling."""
 
+import asyncio
+import concurrent.futures
+import contextvars
+import json
 import time
 import logging
-from typing import Optional, Dict, Any
-from functools import wraps
+import threading
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+from functools import partial, wraps
 
 # Optional import so local tests can run without the Google SDK.
 try:  # pragma: no cover - simple import guard
@@ -33,10 +38,23 @@ except Exception:  # pragma: no cover
         class _Dummy:
             gemini_api_key = ""
             gemini_rate_limit_per_minute = 30
+            gemini_max_concurrency = 4
+            gemini_request_timeout_seconds = 60.0
+            gemini_interactive_reserve = 5
 
         return _Dummy()
 
 
+from app.monitoring.metrics import gemini_requests_total  # noqa: E402
+from app.services.gemini_cache import GeminiResponseCache, cache_key, resolve_ttl  # noqa: E402
+from app.services.rate_limit import (  # noqa: E402
+    INTERACTIVE,
+    YIELD_SECONDS,
+    LocalRateLimitBackend,
+    current_priority,
+    get_rate_limit_backend,
+)
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
@@ -45,37 +63,137 @@ if hasattr(genai, "configure") and getattr(settings, "gemini_api_key", ""):
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """
+    Per-minute rate limiter for API calls.
+
+    The window lives in a shared backend (Redis when available, see
+    ``app.services.rate_limit``), so all processes draw from one budget.
+    Threads wait with ``wait_if_needed``; coroutines use
+    ``wait_if_needed_async``, which yields to the event loop instead of
+    sleeping. Calls in the ``interactive`` lane preempt ``bulk`` ones.
+    """
 
-    def __init__(self, max_calls_per_minute: int = 30):
+    def __init__(
+        self,
+        max_calls_per_minute: int = 30,
+        backend=None,
+        name: str = "gemini",
+        interactive_reserve: int = 0,
+    ):
         self.max_calls = max_calls_per_minute
-        self.calls = []
-        self.lock_until = 0
+        self.backend = backend or LocalRateLimitBackend()
+        self.name = name
+        self.interactive_reserve = min(interactive_reserve, max(max_calls_per_minute - 1, 0))
+
+    def _reserve(self, priority: Optional[str]) -> float:
+        """Record a call if the window has room, else return the seconds to wait."""
+        return self.backend.reserve(
+            self.name, self.max_calls, priority or current_priority(), self.interactive_reserve
+        )
+
+    def _log_wait(self, wait_time: float) -> None:
+        if wait_time > YIELD_SECONDS:
+            logger.warning(f"Rate limit reached. Waiting {wait_time:.2f} seconds...")
 
-    def wait_if_needed(self):
+    def wait_if_needed(self, priority: Optional[str] = None):
         """Wait if rate limit is exceeded."""
-        now = time.time()
+        priority = priority or current_priority()
+        waiting = False
+        try:
+            while (wait_time := self._reserve(priority)) > 0:
+                if priority == INTERACTIVE and not waiting:
+                    self.backend.add_waiting(self.name, 1)
+                    waiting = True
+                self._log_wait(wait_time)
+                time.sleep(wait_time)
+        finally:
+            if waiting:
+                self.backend.add_waiting(self.name, -1)
+
+    async def wait_if_needed_async(self, priority: Optional[str] = None):
+        """Wait without blocking the event loop if rate limit is exceeded."""
+        priority = priority or current_priority()
+        waiting = False
+        try:
+            while (wait_time := self._reserve(priority)) > 0:
+                if priority == INTERACTIVE and not waiting:
+                    self.backend.add_waiting(self.name, 1)
+                    waiting = True
+                self._log_wait(wait_time)
+                await asyncio.sleep(wait_time)
+        finally:
+            if waiting:
+                self.backend.add_waiting(self.name, -1)
 
-        # Remove calls older than 1 minute
-        self.calls = [call_time for call_time in self.calls if now - call_time < 60]
 
-        # Check if we've exceeded rate limit
-        if len(self.calls) >= self.max_calls:
-            wait_time = 60 - (now - self.calls[0])
-            if wait_time > 0:
-                logger.warning(
-                    f"Rate limit reached. Waiting {wait_time:.2f} seconds..."
-                )
-                time.sleep(wait_time)
-                self.calls = []
+T = TypeVar("T")
 
-        self.calls.append(now)
+
+def parse_json_response(response: str) -> Any:
+    """
+    Parse JSON from a Gemini response, unwrapping markdown code blocks.
+
+    Raises:
+        json.JSONDecodeError: If the response does not contain valid JSON
+    """
+    # Try to extract JSON from markdown code blocks
+    if "```json" in response:
+        json_start = response.find("```json") + 7
+        json_end = response.find("```", json_start)
+        json_str = response[json_start:json_end].strip()
+    elif "```" in response:
+        json_start = response.find("```") + 3
+        json_end = response.find("```", json_start)
+        json_str = response[json_start:json_end].strip()
+    else:
+        json_str = response.strip()
+
+    return json.loads(json_str)
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses a private event loop, or a helper thread when the calling thread
+    is already running one (so sync helpers stay callable from async code).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    context = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(context.run, asyncio.run, coroutine).result()
 
 
 class GeminiClient:
-    """Client for interacting with Google Gemini API."""
+    """
+    Client for interacting with Google Gemini API.
+
+    Requests are made on an async path (``*_async`` methods and
+    ``generate_json``) that answers repeated requests from the response
+    cache, waits for the rate limiter without blocking the loop and
+    propagates cancellation. The synchronous methods are thin wrappers
+    around it.
+
+    The SDK call itself is the blocking ``generate_content`` run on the
+    client's own thread pool of ``gemini_max_concurrency`` workers. The
+    pool bounds in-flight requests for the whole process, whichever event
+    loop or thread they come from, and no SDK state is tied to an event
+    loop (the SDK's async client is bound to the loop that created it,
+    while each sync call runs on a fresh one).
+    """
 
     def __init__(self):
+        self.max_concurrency = max(settings.gemini_max_concurrency, 1)
+        self.request_timeout = settings.gemini_request_timeout_seconds
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.model_name = "gemini-pro"
+        self.response_cache: Optional[GeminiResponseCache] = GeminiResponseCache()
+
         if genai is None:
             self.model = None
             self.rate_limiter = RateLimiter()
@@ -83,9 +201,11 @@ class GeminiClient:
             return
 
         try:
-            self.model = genai.GenerativeModel("gemini-pro")
+            self.model = genai.GenerativeModel(self.model_name)
             self.rate_limiter = RateLimiter(
-                max_calls_per_minute=settings.gemini_rate_limit_per_minute
+                max_calls_per_minute=settings.gemini_rate_limit_per_minute,
+                backend=get_rate_limit_backend(),
+                interactive_reserve=settings.gemini_interactive_reserve,
             )
             logger.info("Gemini API client initialized")
         except Exception:  # pragma: no cover - fallback when SDK misconfigured
@@ -93,44 +213,108 @@ class GeminiClient:
             self.rate_limiter = RateLimiter()
             logger.warning("Gemini SDK unavailable; using no-op model")
 
-    def _make_request(self, prompt: str, **kwargs) -> Optional[str]:
+    def _request_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Thread pool bounding in-flight requests across the process."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="gemini"
+                )
+            return self._pool
+
+    async def _generate_content_async(self, prompt: str, generation_config):
+        # Requests queue for a pool slot; a queued request that times out or
+        # is cancelled never starts, a running one keeps its slot until the
+        # SDK returns
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._request_pool(),
+            partial(
+                self.model.generate_content, prompt, generation_config=generation_config
+            ),
+        )
+
+    async def _make_request_async(self, prompt: str, **kwargs) -> Optional[str]:
         """
         Make a request to Gemini API with rate limiting and error handling.
 
+        Cancelling the awaiting task cancels the request; it is not retried.
+
         Args:
             prompt: The prompt to send to Gemini
-            **kwargs: Additional arguments for generate_content
+            **kwargs: Additional arguments for generate_content, plus
+                ``timeout`` (seconds, defaults to ``gemini_request_timeout_seconds``)
+                ``cache_ttl`` (seconds to cache the response; 0 disables,
+                None caches only deterministic requests) and ``expect_json``
+                (only cache responses that parse as JSON)
 
         Returns:
-            Generated text or None if error
+            Generated text or None if error or timeout
         """
+        timeout = kwargs.pop("timeout", self.request_timeout)
+        config = {
+            "temperature": kwargs.get("temperature", 0.7),
+            "top_p": kwargs.get("top_p", 0.95),
+            "top_k": kwargs.get("top_k", 40),
+            "max_output_tokens": kwargs.get("max_output_tokens", 2048),
+        }
+
+        key = None
+        ttl = resolve_ttl(config["temperature"], kwargs.get("cache_ttl"))
+        if ttl > 0 and self.response_cache is not None:
+            key = cache_key(self.model_name, prompt, config)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+        else:
+            gemini_requests_total.labels(cache="bypass").inc()
+
         try:
             # Apply rate limiting
-            self.rate_limiter.wait_if_needed()
+            await self.rate_limiter.wait_if_needed_async()
 
             # Make API call
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=kwargs.get("temperature", 0.7),
-                    top_p=kwargs.get("top_p", 0.95),
-                    top_k=kwargs.get("top_k", 40),
-                    max_output_tokens=kwargs.get("max_output_tokens", 2048),
-                ),
+            response = await asyncio.wait_for(
+                self._generate_content_async(prompt, genai.types.GenerationConfig(**config)),
+                timeout=timeout,
             )
 
             if response and response.text:
+                if key is not None and self._cacheable(response.text, kwargs):
+                    self.response_cache.set(key, response.text, ttl)
                 return response.text
             else:
                 logger.warning("Empty response from Gemini API")
                 return None
 
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini API request timed out after {timeout} seconds")
+            return None
         except Exception as e:
             logger.error(f"Error calling Gemini API: {str(e)}")
             return None
 
-    def generate_text(
-        self, prompt: str, temperature: float = 0.7, max_tokens: int = 2048
+    @staticmethod
+    def _cacheable(text: str, kwargs: Dict[str, Any]) -> bool:
+        """Malformed JSON answers are not cached so a retry asks Gemini again."""
+        if not kwargs.get("expect_json"):
+            return True
+        try:
+            parse_json_response(text)
+            return True
+        except json.JSONDecodeError:
+            return False
+
+    def _make_request(self, prompt: str, **kwargs) -> Optional[str]:
+        """Synchronous wrapper around ``_make_request_async``."""
+        return run_sync(self._make_request_async(prompt, **kwargs))
+
+    async def generate_text_async(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        cache_ttl: Optional[int] = None,
     ) -> Optional[str]:
         """
         Generate text using Gemini.
@@ -139,16 +323,27 @@ class GeminiClient:
             prompt: The prompt text
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
+            cache_ttl: Seconds to cache the response (see ``_make_request_async``)
 
         Returns:
             Generated text or None
         """
-        return self._make_request(
-            prompt, temperature=temperature, max_output_tokens=max_tokens
+        return await self._make_request_async(
+            prompt, temperature=temperature, max_output_tokens=max_tokens, cache_ttl=cache_ttl
         )
 
-    def generate_structured_output(
-        self, prompt: str, temperature: float = 0.3
+    def generate_text(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        cache_ttl: Optional[int] = None,
+    ) -> Optional[str]:
+        """Synchronous wrapper around ``generate_text_async``."""
+        return run_sync(self.generate_text_async(prompt, temperature, max_tokens, cache_ttl))
+
+    async def generate_structured_output_async(
+        self, prompt: str, temperature: float = 0.3, cache_ttl: Optional[int] = None
     ) -> Optional[str]:
         """
         Generate structured output (JSON) using Gemini.
@@ -158,16 +353,27 @@ class GeminiClient:
         Args:
             prompt: The prompt text (should request JSON output)
             temperature: Sampling temperature
+            cache_ttl: Seconds to cache the response (see ``_make_request_async``)
 
         Returns:
             Generated JSON string or None
         """
-        return self._make_request(
-            prompt, temperature=temperature, max_output_tokens=2048
+        return await self._make_request_async(
+            prompt,
+            temperature=temperature,
+            max_output_tokens=2048,
+            cache_ttl=cache_ttl,
+            expect_json=True,
         )
 
+    def generate_structured_output(
+        self, prompt: str, temperature: float = 0.3, cache_ttl: Optional[int] = None
+    ) -> Optional[str]:
+        """Synchronous wrapper around ``generate_structured_output_async``."""
+        return run_sync(self.generate_structured_output_async(prompt, temperature, cache_ttl))
+
     async def generate_json(
-        self, prompt: str, temperature: float = 0.3
+        self, prompt: str, temperature: float = 0.3, cache_ttl: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Generate and parse JSON output using Gemini.
@@ -175,33 +381,24 @@ class GeminiClient:
         Args:
             prompt: The prompt text (should request JSON output)
             temperature: Sampling temperature
+            cache_ttl: Seconds to cache the response (see ``_make_request_async``)
 
         Returns:
             Parsed JSON dict or None if error
         """
-        import json
-
-        response = self._make_request(
-            prompt, temperature=temperature, max_output_tokens=2048
+        response = await self._make_request_async(
+            prompt,
+            temperature=temperature,
+            max_output_tokens=2048,
+            cache_ttl=cache_ttl,
+            expect_json=True,
         )
 
         if not response:
             return None
 
         try:
-            # Try to extract JSON from markdown code blocks
-            if "```json" in response:
-                json_start = response.find("```json") + 7
-                json_end = response.find("```", json_start)
-                json_str = response[json_start:json_end].strip()
-            elif "```" in response:
-                json_start = response.find("```") + 3
-                json_end = response.find("```", json_start)
-                json_str = response[json_start:json_end].strip()
-            else:
-                json_str = response.strip()
-
-            return json.loads(json_str)
+            return parse_json_response(response)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from Gemini response: {e}")
             logger.debug(f"Response was: {response}")
@@ -9,9 +9,15 @@ from sqlalchemy.orm import Session
 from app.models.models import Keyword, KeywordEvaluation, KeywordSuggestion
 from app.services.embeddings import EmbeddingGenerator
 from app.services.gemini_client import get_gemini_client
+from app.services.vector_index import get_keyword_index
 
 logger = logging.getLogger(__name__)
 
+# Gemini response cache TTLs: retries and merges re-ask the same questions
+EVALUATION_CACHE_TTL = 7 * 24 * 3600
+MERGE_CACHE_TTL = 24 * 3600
+TRANSLATION_CACHE_TTL = 30 * 24 * 3600
+
 
 class KeywordApprovalService:
     """Gemini-backed keyword evaluation and approval workflow."""
@@ -54,7 +60,9 @@ Ensure scores are integers within 1-10. If no alternatives, return an empty arra
 """
 
         try:
-            response = await self.gemini_client.generate_json(prompt)
+            response = await self.gemini_client.generate_json(
+                prompt, cache_ttl=EVALUATION_CACHE_TTL
+            )
 
             if not isinstance(response, dict):
                 logger.warning("Invalid Gemini evaluation response for '%s'", keyword)
@@ -101,30 +109,34 @@ Ensure scores are integers within 1-10. If no alternatives, return an empty arra
 
         try:
             candidate_embedding = self.embedding_service.generate_embedding(keyword)
-            existing_keywords = (
-                db.query(Keyword).filter(Keyword.embedding.isnot(None)).all()
-            )
 
-            similar: List[Dict] = []
-            for existing in existing_keywords:
-                if not existing.embedding:
-                    continue
-
-                similarity = self.embedding_service.compute_similarity(
-                    candidate_embedding,
-                    existing.embedding,
+            keyword_index = get_keyword_index()
+            keyword_index.sync(db)
+            matches = [
+                (keyword_id, score)
+                for keyword_id, score in keyword_index.search(
+                    candidate_embedding, k=len(keyword_index)
                 )
+                if score >= similarity_threshold
+            ]
+            if not matches:
+                return []
 
-                if similarity >= similarity_threshold:
-                    similar.append(
-                        {
-                            "id": existing.id,
-                            "keyword_en": existing.keyword_en,
-                            "keyword_th": existing.keyword_th,
-                            "category": existing.category,
-                            "similarity": similarity,
-                        }
-                    )
+            scores = dict(matches)
+            existing_keywords = (
+                db.query(Keyword).filter(Keyword.id.in_(list(scores))).all()
+            )
+
+            similar: List[Dict] = [
+                {
+                    "id": existing.id,
+                    "keyword_en": existing.keyword_en,
+                    "keyword_th": existing.keyword_th,
+                    "category": existing.category,
+                    "similarity": scores[existing.id],
+                }
+                for existing in existing_keywords
+            ]
 
             similar.sort(key=lambda item: item["similarity"], reverse=True)
             return similar
@@ -166,7 +178,9 @@ Respond in JSON:
 """
 
         try:
-            response = await self.gemini_client.generate_json(prompt)
+            response = await self.gemini_client.generate_json(
+                prompt, cache_ttl=MERGE_CACHE_TTL
+            )
             if not isinstance(response, dict):
                 return self._default_merge_result()
 
@@ -297,7 +311,9 @@ Respond in JSON with language codes as keys using concise terminology suitable f
 """
 
         try:
-            response = await self.gemini_client.generate_json(prompt)
+            response = await self.gemini_client.generate_json(
+                prompt, cache_ttl=TRANSLATION_CACHE_TTL
+            )
             if not isinstance(response, dict):
                 logger.warning("Invalid translation response for '%s'", keyword_en)
                 return {}
@@ -347,6 +363,7 @@ Respond in JSON with language codes as keys using concise terminology suitable f
         db.add(new_keyword)
         db.commit()
         db.refresh(new_keyword)
+        get_keyword_index().add(new_keyword.id, new_keyword.embedding)
 
         logger.info(
             "Keyword '%s' approved (ID=%s)", new_keyword.keyword_en, new_keyword.id
@@ -406,6 +423,7 @@ Respond in JSON with language codes as keys using concise terminology suitable f
 
         db.commit()
         db.refresh(merged_keyword)
+        get_keyword_index().add(merged_keyword.id, merged_keyword.embedding)
 
         merge_reason = merge_prompt.get("reasoning", "Merged based on similarity")
         logger.info(
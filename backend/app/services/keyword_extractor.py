@@ -2,9 +2,12 @@
 Keyword extraction and classification service.
 
 Uses:
-1. spaCy for Named Entity Recognition (NER)
+1. spaCy for Named Entity Recognition (NER) and noun chunks, from one
+   parse per article (``nlp.pipe`` for batches)
 2. Gemini for fact/opinion classification
 3. Gemini for keyword relationship extraction
+4. Optionally one combined Gemini request for keywords, classification
+   and sentiment (``gemini_analysis_mode = "combined"``)
 """
 
 import json
@@ -17,9 +20,17 @@ try:  # pragma: no cover - spaCy is optional during tests
 except Exception:  # pragma: no cover
     spacy = None  # type: ignore
 
+from app.config import get_settings
 from app.services.gemini_client import get_gemini_client, retry_on_failure
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Text parsed per article (entities); noun chunks come from the first part
+SPACY_MAX_CHARS = 100000
+NOUN_CHUNK_MAX_CHARS = 50000
+# Components entity and noun chunk extraction never read
+SPACY_UNUSED_PIPES = ("lemmatizer", "textcat", "textcat_multilabel", "entity_linker")
 
 # Load spaCy model (will be downloaded in Docker container)
 if spacy is not None:
@@ -59,25 +70,102 @@ class KeywordExtractor:
             "news",
         }
 
-    def extract_entities_spacy(self, text: str) -> Dict[str, List[str]]:
+    def _unused_pipes(self) -> List[str]:
+        """Pipeline components that neither NER nor noun chunks need."""
+        return [name for name in SPACY_UNUSED_PIPES if name in self.nlp.pipe_names]
+
+    def extract_spacy(self, text: str) -> Dict:
         """
-        Extract named entities using spaCy NER.
+        Named entities and noun chunks from a single spaCy parse.
 
         Args:
             text: Article text
 
         Returns:
-            Dictionary with entity categories
+            Dictionary with ``entities`` (as ``extract_entities_spacy``) and
+            ``noun_chunks`` (as ``extract_noun_chunks``)
         """
         if not self.nlp:
             logger.error("spaCy model not loaded")
-            return {"people": [], "organizations": [], "locations": [], "other": []}
+            return self._spacy_result(None)
 
         try:
-            doc = self.nlp(text[:100000])  # Limit text length for performance
+            doc = self.nlp(text[:SPACY_MAX_CHARS], disable=self._unused_pipes())
+        except Exception as e:
+            logger.error(f"spaCy parsing failed: {str(e)}")
+            doc = None
+        return self._spacy_result(doc)
+
+    def extract_spacy_batch(
+        self,
+        texts: List[str],
+        n_process: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Parse many articles with ``nlp.pipe``, once each.
+
+        Args:
+            texts: Article texts
+            n_process: spaCy worker processes (defaults to ``spacy_n_process``;
+                Celery pool processes cannot fork, so keep 1 there)
+            batch_size: Texts per spaCy batch (defaults to ``spacy_batch_size``)
+
+        Returns:
+            One result per text, in input order (as ``extract_spacy``)
+        """
+        if not self.nlp:
+            logger.error("spaCy model not loaded")
+            return [self._spacy_result(None) for _ in texts]
+
+        try:
+            docs = self.nlp.pipe(
+                (text[:SPACY_MAX_CHARS] for text in texts),
+                n_process=n_process or settings.spacy_n_process,
+                batch_size=batch_size or settings.spacy_batch_size,
+                disable=self._unused_pipes(),
+            )
+            return [self._spacy_result(doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"spaCy batch parsing failed: {str(e)}")
+            return [self.extract_spacy(text) for text in texts]
+
+    def _spacy_result(self, doc) -> Dict:
+        return {
+            "entities": self._entities_from_doc(doc),
+            "noun_chunks": self._noun_chunks_from_doc(doc),
+        }
+
+    def extract_entities_spacy(self, text: str) -> Dict[str, List[str]]:
+        """
+        Extract named entities using spaCy NER.
+
+        Args:
+            text: Article text
+
+        Returns:
+            Dictionary with entity categories
+        """
+        return self.extract_spacy(text)["entities"]
 
-            entities = {"people": [], "organizations": [], "locations": [], "other": []}
+    def extract_noun_chunks(self, text: str) -> List[str]:
+        """
+        Extract important noun chunks as potential keywords.
+
+        Args:
+            text: Article text
+
+        Returns:
+            List of noun chunks
+        """
+        return self.extract_spacy(text)["noun_chunks"]
+
+    def _entities_from_doc(self, doc) -> Dict[str, List[str]]:
+        entities = {"people": [], "organizations": [], "locations": [], "other": []}
+        if doc is None:
+            return entities
 
+        try:
             for ent in doc.ents:
                 text_lower = ent.text.lower().strip()
 
@@ -110,24 +198,17 @@ class KeywordExtractor:
             logger.error(f"spaCy entity extraction failed: {str(e)}")
             return {"people": [], "organizations": [], "locations": [], "other": []}
 
-    def extract_noun_chunks(self, text: str) -> List[str]:
-        """
-        Extract important noun chunks as potential keywords.
-
-        Args:
-            text: Article text
-
-        Returns:
-            List of noun chunks
-        """
-        if not self.nlp:
+    def _noun_chunks_from_doc(self, doc) -> List[str]:
+        if doc is None:
             return []
 
         try:
-            doc = self.nlp(text[:50000])
             chunks = []
 
             for chunk in doc.noun_chunks:
+                # Noun chunks come from the start of long articles only
+                if chunk.end_char > NOUN_CHUNK_MAX_CHARS:
+                    break
                 chunk_text = chunk.text.lower().strip()
 
                 # Filter criteria
@@ -218,6 +299,9 @@ Return ONLY the JSON, no additional text."""
             clean_response = clean_response.strip()
 
             data = json.loads(clean_response)
+            if not isinstance(data, dict):
+                logger.error(f"Expected object from Gemini keyword extraction, got {type(data)}")
+                return None
             return data
 
         except Exception as e:
@@ -295,13 +379,168 @@ Return ONLY the JSON, no additional text."""
             clean_response = clean_response.strip()
 
             data = json.loads(clean_response)
+            if not isinstance(data, dict):
+                logger.error(f"Expected object from Gemini classification, got {type(data)}")
+                return None
             return data
 
         except Exception as e:
             logger.error(f"Gemini classification failed: {str(e)}")
             return None
 
-    def extract_all(self, title: str, text: str, use_gemini: bool = True) -> Dict:
+    @retry_on_failure(max_retries=2, delay=2.0)
+    def analyze_article_gemini(
+        self, title: str, text: str, source_name: str, include_sentiment: bool = True
+    ) -> Optional[Dict]:
+        """
+        Extract keywords, classify and (optionally) score sentiment in one request.
+
+        Replaces ``extract_keywords_gemini``, ``classify_fact_opinion`` and
+        ``SentimentAnalyzer.analyze_sentiment_gemini`` when
+        ``gemini_analysis_mode`` is ``combined``.
+
+        Args:
+            title: Article title
+            text: Article text (will be truncated)
+            source_name: Publication name
+            include_sentiment: Whether to request the sentiment section
+
+        Returns:
+            Dictionary with ``extraction`` (as ``extract_keywords_gemini``),
+            ``classification`` (as ``classify_fact_opinion``) and ``sentiment``
+            (as ``analyze_sentiment_gemini``); sections that are missing or
+            malformed are None. None if the request fails.
+        """
+        # Truncate text
+        max_chars = 8000
+        if len(text) > max_chars:
+            text = text[:max_chars] + "..."
+
+        sentiment_task = ""
+        sentiment_schema = ""
+        if include_sentiment:
+            sentiment_task = """
+4. Sentiment: how the article portrays Thailand or its main topic
+   - overall_polarity: -1.0 (very negative) to +1.0 (very positive); consider
+     word choice, framing and what is emphasized or omitted
+   - confidence: 0.0 (mixed or ambiguous signals) to 1.0 (clear, consistent tone)
+   - subjectivity: 0.0 (pure facts) to 1.0 (pure opinion)
+   - emotion_breakdown: distribute 1.0 across positive, negative and neutral
+   - A factual article about challenges can be neutral if presented objectively
+"""
+            sentiment_schema = """,
+  "sentiment": {
+    "overall_polarity": float,
+    "confidence": float,
+    "subjectivity": float,
+    "emotion_breakdown": {"positive": float, "negative": float, "neutral": float},
+    "classification": "STRONGLY_POSITIVE|POSITIVE|NEUTRAL|NEGATIVE|STRONGLY_NEGATIVE",
+    "key_phrases": {"positive": [strings], "negative": [strings]},
+    "reasoning": "2-3 sentence explanation"
+  }"""
+
+        prompt = f"""Analyze this news article and extract structured information:
+
+Article Title: {title}
+Article Text: {text}
+Publication: {source_name}
+
+1. Primary keywords (3-5 most important terms about Thailand or the main topic)
+   - Focus on concrete nouns: specific topics, sectors, events
+   - Named entities: people, organizations, locations (besides Thailand)
+   - Key relationships between keywords (related, causal or parent-child)
+
+2. Fact/opinion classification
+   - fact: verifiable claims, neutral language, quotes, statistics
+   - opinion: editorial commentary, value judgments, predictions
+   - mixed: both factual reporting and opinion/analysis
+
+3. Confidence of the classification: 0.0 (uncertain) to 1.0 (very certain)
+{sentiment_task}
+Return as JSON:
+{{
+  "keywords": [list of 3-5 primary keyword strings],
+  "entities": {{
+    "people": [list of names],
+    "organizations": [list of organizations],
+    "locations": [list of places]
+  }},
+  "relationships": [
+    {{
+      "keyword1": "...",
+      "keyword2": "...",
+      "type": "related|causal|parent-child",
+      "description": "brief explanation"
+    }}
+  ],
+  "classification": {{
+    "classification": "fact|opinion|mixed",
+    "confidence": float between 0 and 1,
+    "reasoning": "explanation of classification",
+    "fact_percentage": int (0-100),
+    "opinion_percentage": int (0-100)
+  }}{sentiment_schema}
+}}
+
+Return ONLY the JSON, no additional text."""
+
+        try:
+            response = self.gemini.generate_structured_output(prompt, temperature=0.2)
+
+            if not response:
+                return None
+
+            # Clean response
+            clean_response = response.strip()
+            if clean_response.startswith("```json"):
+                clean_response = clean_response[7:]
+            if clean_response.startswith("```"):
+                clean_response = clean_response[3:]
+            if clean_response.endswith("```"):
+                clean_response = clean_response[:-3]
+            clean_response = clean_response.strip()
+
+            data = json.loads(clean_response)
+            if not isinstance(data, dict):
+                # Callers fall back to the separate requests
+                logger.error(f"Expected object from Gemini article analysis, got {type(data)}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Gemini article analysis failed: {str(e)}")
+            return None
+
+        extraction = None
+        if isinstance(data.get("keywords"), list):
+            extraction = {
+                "keywords": data["keywords"],
+                "entities": data.get("entities") or {},
+                "relationships": data.get("relationships") or [],
+            }
+
+        classification = data.get("classification")
+        if not isinstance(classification, dict) or "classification" not in classification:
+            classification = None
+
+        sentiment = data.get("sentiment")
+        required_keys = ["overall_polarity", "confidence", "subjectivity", "emotion_breakdown"]
+        if not isinstance(sentiment, dict) or not all(key in sentiment for key in required_keys):
+            sentiment = None
+
+        return {
+            "extraction": extraction,
+            "classification": classification,
+            "sentiment": sentiment,
+        }
+
+    def extract_all(
+        self,
+        title: str,
+        text: str,
+        use_gemini: bool = True,
+        gemini_analysis: Optional[Dict] = None,
+        spacy_result: Optional[Dict] = None,
+    ) -> Dict:
         """
         Extract all information from article.
 
@@ -311,6 +550,10 @@ Return ONLY the JSON, no additional text."""
             title: Article title
             text: Article text
             use_gemini: Whether to use Gemini (slower but better)
+            gemini_analysis: Result of ``analyze_article_gemini``; its sections
+                are used instead of separate Gemini requests
+            spacy_result: Result of ``extract_spacy`` (e.g. from
+                ``extract_spacy_batch``); the article is parsed when None
 
         Returns:
             Complete extraction results
@@ -324,17 +567,20 @@ Return ONLY the JSON, no additional text."""
             "method": "hybrid",
         }
 
-        # Get spaCy entities
-        spacy_entities = self.extract_entities_spacy(text)
-        results["entities"] = spacy_entities
-
-        # Get noun chunks as backup keywords
-        noun_chunks = self.extract_noun_chunks(text)
+        # One spaCy parse gives entities and noun chunks (backup keywords)
+        spacy_result = spacy_result or self.extract_spacy(text)
+        results["entities"] = dict(spacy_result["entities"])
+        noun_chunks = spacy_result["noun_chunks"]
 
         # Try Gemini if enabled
         if use_gemini:
-            gemini_keywords = self.extract_keywords_gemini(title, text)
-            classification = self.classify_fact_opinion(title, text)
+            gemini_analysis = gemini_analysis or {}
+            gemini_keywords = gemini_analysis.get("extraction")
+            if gemini_keywords is None:
+                gemini_keywords = self.extract_keywords_gemini(title, text)
+            classification = gemini_analysis.get("classification")
+            if classification is None:
+                classification = self.classify_fact_opinion(title, text)
 
             if gemini_keywords:
                 results["keywords"] = gemini_keywords.get("keywords", [])
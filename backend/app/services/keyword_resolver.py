@@ -0,0 +1,138 @@
+"""
+Batched keyword resolution for article ingestion.
+
+Keyword strings from a whole batch of articles are resolved with one ``IN``
+query; missing keywords are created with ``INSERT ... ON CONFLICT DO
+NOTHING RETURNING`` so concurrent workers ingesting the same new keyword
+never hit a unique violation, and keyword/article links are inserted in
+bulk the same way.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_for
+from app.models.models import Keyword, KeywordArticle
+from app.db.quantization import encode_embedding
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def keyword_texts(items: Iterable[Any]) -> List[str]:
+    """Unique, stripped keyword strings (items may be strings or ``{"text": ...}``)."""
+
+    texts = []
+    for item in items:
+        text = item.get("text") if isinstance(item, dict) else item
+        if isinstance(text, str) and text.strip():
+            texts.append(text.strip())
+    return list(dict.fromkeys(texts))
+
+
+def resolve_keywords(
+    db: Session,
+    texts: Sequence[str],
+    defaults: Optional[Union[Dict[str, Any], Callable[[str], Dict[str, Any]]]] = None,
+    embed: Optional[Callable[[List[str]], List]] = None,
+) -> Tuple[Dict[str, Keyword], Set[int]]:
+    """
+    Load existing keywords and bulk-create the missing ones (the caller commits).
+
+    Args:
+        db: Database session
+        texts: Keyword strings (``keyword_en``); duplicates are ignored
+        defaults: Column values for created keywords (e.g. ``category``), or
+            a function returning them for a keyword text
+        embed: Optional function returning one embedding per missing text
+
+    Returns:
+        Tuple of (keyword text -> Keyword, IDs of keywords created here).
+        Keywords created concurrently by another worker are returned but
+        not counted as created.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    if not unique_texts:
+        return {}, set()
+
+    keywords_by_text = _load_keywords(db, unique_texts)
+    missing = [text for text in unique_texts if text not in keywords_by_text]
+    if not missing:
+        return keywords_by_text, set()
+
+    embeddings = embed(missing) if embed else [None] * len(missing)
+    rows = []
+    for text, embedding in zip(missing, embeddings):
+        values = defaults(text) if callable(defaults) else defaults
+        row = dict(values or {}, keyword_en=text)
+        if embedding is not None:
+            # Core inserts bypass the ORM listener that fills the compact copy
+            row["embedding"] = embedding
+            row["embedding_compact"] = encode_embedding(embedding)
+        rows.append(row)
+
+    created_ids: Set[int] = set()
+    table = Keyword.__table__
+    # Rows with and without embeddings need separate statements
+    for has_embedding in (True, False):
+        group = [row for row in rows if ("embedding" in row) == has_embedding]
+        for start in range(0, len(group), BATCH_SIZE):
+            statement = (
+                insert_for(db, table)
+                .values(group[start : start + BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=["keyword_en"])
+                .returning(table.c.id)
+            )
+            created_ids.update(row[0] for row in db.execute(statement))
+
+    # Picks up both our rows and those that lost the race to another worker
+    keywords_by_text.update(_load_keywords(db, missing))
+    raced = len(missing) - len(created_ids)
+    if raced:
+        logger.debug(f"{raced} keywords were created concurrently by another worker")
+    return keywords_by_text, created_ids
+
+
+def link_keywords(
+    db: Session,
+    links: Iterable[Tuple[int, int]],
+    relevance_score: Optional[float] = None,
+) -> Set[Tuple[int, int]]:
+    """
+    Bulk-insert keyword/article links, skipping ones that already exist.
+
+    Args:
+        db: Database session (the caller commits)
+        links: ``(keyword_id, article_id)`` pairs
+        relevance_score: Relevance stored on every new link
+
+    Returns:
+        The ``(keyword_id, article_id)`` pairs that were inserted
+    """
+    rows = [
+        {"keyword_id": keyword_id, "article_id": article_id, "relevance_score": relevance_score}
+        for keyword_id, article_id in dict.fromkeys(links)
+    ]
+    table = KeywordArticle.__table__
+    inserted: Set[Tuple[int, int]] = set()
+    for start in range(0, len(rows), BATCH_SIZE):
+        statement = (
+            insert_for(db, table)
+            .values(rows[start : start + BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["keyword_id", "article_id"])
+            .returning(table.c.keyword_id, table.c.article_id)
+        )
+        inserted.update((row[0], row[1]) for row in db.execute(statement))
+    return inserted
+
+
+def _load_keywords(db: Session, texts: Sequence[str]) -> Dict[str, Keyword]:
+    keywords: Dict[str, Keyword] = {}
+    for start in range(0, len(texts), BATCH_SIZE):
+        batch = list(texts[start : start + BATCH_SIZE])
+        for keyword in db.query(Keyword).filter(Keyword.keyword_en.in_(batch)):
+            keywords[keyword.keyword_en] = keyword
+    return keywords
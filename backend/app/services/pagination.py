@@ -0,0 +1,202 @@
+"""
+Keyset (cursor) pagination and cheap total counts for listing endpoints.
+
+Cursors are opaque URL-safe tokens holding the sort key name plus the sort
+value and ID of the last row returned, so the next page is a range scan on
+``(column, id)`` instead of an ``OFFSET``. Rows with a NULL sort value are
+always ordered last, in both directions and on every dialect.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Query, Session
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TOTAL_MODES = ("exact", "estimated", "none")
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """Encode the position after a row as an opaque cursor token."""
+
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort_key, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_key: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor token produced by ``encode_cursor``.
+
+    Args:
+        token: Cursor from a previous response
+        sort_key: Sort key the cursor must have been issued for
+
+    Returns:
+        Tuple of ``(sort value, row id)``
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another sort order
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        row_id = int(payload["id"])
+        issued_for = payload["s"]
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    if issued_for != sort_key:
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, row_id
+
+
+def keyset_order(column, id_column, descending: bool = True) -> Tuple:
+    """ORDER BY clause matching ``keyset_filter`` (NULL sort values last)."""
+
+    if descending:
+        return (column.desc().nulls_last(), id_column.desc())
+    return (column.asc().nulls_last(), id_column.asc())
+
+
+def keyset_filter(column, id_column, value: Any, row_id: int, descending: bool = True):
+    """Condition selecting rows that sort after ``(value, row_id)``."""
+
+    id_after = id_column < row_id if descending else id_column > row_id
+    if value is None:
+        return and_(column.is_(None), id_after)
+    value_after = column < value if descending else column > value
+    return or_(value_after, and_(column == value, id_after), column.is_(None))
+
+
+def keyset_page(
+    query: Query,
+    column,
+    id_column,
+    sort_key: str,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of an (unordered) query ordered by ``(column, id)``.
+
+    Args:
+        query: Filtered query without ORDER BY / LIMIT
+        column: Sort column (e.g. ``Article.published_date``)
+        id_column: Tie-breaking primary key column
+        sort_key: Name stored in cursors to reject mismatched sort orders
+        page_size: Rows per page
+        cursor: Cursor from the previous page, if any
+        descending: Sort direction
+        offset: Rows to skip (page-number access without a cursor)
+
+    Returns:
+        Tuple of ``(rows, next_cursor)``; ``next_cursor`` is None on the last page
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key)
+        query = query.filter(keyset_filter(column, id_column, value, row_id, descending))
+
+    query = query.order_by(*keyset_order(column, id_column, descending))
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(page_size + 1).all()
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(sort_key, getattr(last, column.key), getattr(last, id_column.key))
+
+
+def count_total(
+    db: Session, query: Query, mode: str = "exact", threshold: Optional[int] = None
+) -> Tuple[Optional[int], bool]:
+    """
+    Total row count for a listing query.
+
+    ``estimated`` counts exactly up to ``threshold`` rows; beyond that it
+    uses the PostgreSQL planner estimate (or reports ``threshold + 1`` as a
+    lower bound on other databases) instead of scanning every match.
+
+    Args:
+        db: Database session
+        query: Filtered query without ORDER BY / LIMIT
+        mode: ``exact``, ``estimated`` or ``none``
+        threshold: Exact-count limit for ``estimated`` mode
+
+    Returns:
+        Tuple of ``(total or None, is_estimate)``
+
+    Raises:
+        ValueError: If ``mode`` is not supported
+    """
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"Invalid total_mode: expected one of {', '.join(TOTAL_MODES)}")
+    if mode == "none":
+        return None, False
+    if mode == "exact":
+        return query.count(), False
+
+    threshold = threshold or settings.pagination_count_threshold
+    bounded = (
+        db.query(func.count())
+        .select_from(query.order_by(None).limit(threshold + 1).subquery())
+        .scalar()
+    )
+    if bounded <= threshold:
+        return bounded, False
+
+    planned = _planner_estimate(db, query)
+    return max(planned or 0, threshold + 1), True
+
+
+def _planner_estimate(db: Session, query: Query) -> Optional[int]:
+    connection = db.connection()
+    if connection.dialect.name != "postgresql":
+        return None
+
+    try:
+        compiled = query.order_by(None).statement.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Planner row estimate failed: {e}")
+        return None
+
+
+def pagination_payload(
+    page: Optional[int],
+    page_size: int,
+    total: Optional[int],
+    total_is_estimate: bool = False,
+    next_cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Standard ``pagination`` block for listing responses."""
+
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+        "total_is_estimate": total_is_estimate,
+        "next_cursor": next_cursor,
+    }
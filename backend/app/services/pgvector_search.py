@@ -0,0 +1,272 @@
+"""
+pgvector-native similarity search and index management.
+
+On PostgreSQL the cosine distance operator ``<=>`` is evaluated in SQL and
+combined with ``ORDER BY ... LIMIT`` so HNSW/IVFFlat indexes can serve the
+query. Other engines (SQLite in tests and local development) fall back to
+the in-process vector index.
+"""
+
+import logging
+import math
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, literal, text
+from sqlalchemy.orm import Query, Session
+
+from app.config import get_settings
+from app.db.types import VectorType
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+EMBEDDING_DIM = 384
+
+INDEX_METHODS = ("hnsw", "ivfflat")
+
+# Tables carrying an ``embedding vector(384)`` column.
+VECTOR_TABLES = ("articles", "keywords")
+
+# Largest hnsw.ef_search pgvector accepts
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def uses_pgvector(db: Session) -> bool:
+    """Return True when similarity should be computed inside PostgreSQL."""
+
+    backend = (settings.semantic_search_backend or "auto").lower()
+    if backend == "memory":
+        return False
+
+    bind = db.get_bind()
+    is_postgres = bind is not None and bind.dialect.name == "postgresql"
+    if backend == "pgvector" and not is_postgres:
+        logger.warning("pgvector backend requested on a non-PostgreSQL database")
+    return is_postgres
+
+
+def cosine_distance(column, query_embedding: Sequence[float]):
+    """SQL expression for ``column <=> :query`` (cosine distance)."""
+
+    query_vector = literal(
+        [float(value) for value in query_embedding], type_=VectorType(EMBEDDING_DIM)
+    )
+    return column.op("<=>", return_type=Float)(query_vector)
+
+
+def apply_search_parameters(
+    db: Session,
+    method: Optional[str] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    limit: Optional[int] = None,
+    exact: bool = False,
+) -> None:
+    """
+    Set per-transaction recall/speed knobs for the active index method.
+
+    An HNSW scan returns at most ``ef_search`` rows, so ``ef_search`` is
+    raised to ``limit``. ``exact`` (or a limit beyond what the index can
+    return) disables index scans, so the query is answered by an exact
+    sequential scan and sort.
+    """
+    method = (method or settings.pgvector_index_method).lower()
+    if method == "hnsw" and not exact:
+        value = max(int(ef_search or settings.pgvector_hnsw_ef_search), int(limit or 0))
+        exact = value > HNSW_MAX_EF_SEARCH
+        if not exact:
+            db.execute(text(f"SET LOCAL hnsw.ef_search = {value}"))
+    elif method == "ivfflat" and not exact:
+        value = int(probes or settings.pgvector_ivfflat_probes)
+        db.execute(text(f"SET LOCAL ivfflat.probes = {value}"))
+
+    if exact:
+        db.execute(text("SET LOCAL enable_indexscan = off"))
+
+
+@contextmanager
+def scoped_search_parameters(db: Session, **parameters) -> Iterator[None]:
+    """
+    Apply ``apply_search_parameters`` for the duration of a block only.
+
+    ``SET LOCAL`` lasts until the end of the transaction, which would leave
+    index scans disabled (or ``ef_search`` raised) for every later query in
+    the request. The block runs inside a savepoint; rolling back to it
+    resets the settings to their previous values. Only use this around
+    read-only queries.
+    """
+    savepoint = db.begin_nested()
+    try:
+        apply_search_parameters(db, **parameters)
+        yield
+    finally:
+        savepoint.rollback()
+
+
+def nearest_neighbours(
+    db: Session,
+    base_query: Query,
+    model,
+    query_embedding: Sequence[float],
+    limit: int,
+    exclude_id: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Run an index-backed k-NN query.
+
+    Index scans filter after the approximate search, so a filtered
+    ``base_query`` could lose most of its matches; filtered queries are
+    answered by an exact scan instead.
+
+    Args:
+        db: Database session
+        base_query: ID query (``db.query(Model.id)``) with any filters applied
+        model: Model owning the ``embedding`` column
+        query_embedding: Query vector
+        limit: Maximum number of neighbours
+        exclude_id: Optional row ID to leave out (e.g. the query article)
+
+    Returns:
+        ``(id, cosine_similarity)`` pairs ordered by similarity
+    """
+    if query_embedding is None:
+        return []
+    vector = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    if vector.shape[0] != EMBEDDING_DIM or not np.any(vector):
+        # Cosine distance is undefined for the zero vector.
+        return []
+
+    # Filters applied by the caller (the ones added below are cheap)
+    filtered = base_query.whereclause is not None
+
+    distance = cosine_distance(model.embedding, vector)
+    query = base_query.add_columns(distance.label("distance")).filter(
+        model.embedding.isnot(None)
+    )
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+
+    with scoped_search_parameters(
+        db, limit=limit + (1 if exclude_id is not None else 0), exact=filtered
+    ):
+        rows = query.order_by(distance).limit(limit).all()
+    return [(int(row[0]), 1.0 - float(row[1])) for row in rows]
+
+
+def default_ivfflat_lists(row_count: int) -> int:
+    """pgvector guidance: rows/1000 up to 1M rows, sqrt(rows) beyond."""
+
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def index_name(table: str, method: str) -> str:
+    return f"idx_{table}_embedding_{method}"
+
+
+def build_index_statements(
+    table: str,
+    method: str,
+    lists: Optional[int] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    concurrently: bool = True,
+) -> List[str]:
+    """
+    DDL that drops any existing embedding index on ``table`` and builds a new one.
+
+    Both index methods are dropped first so switching between HNSW and
+    IVFFlat never leaves two indexes on the same column.
+    """
+    method = method.lower()
+    if method not in INDEX_METHODS:
+        raise ValueError(f"Unsupported vector index method: {method}")
+    if table not in VECTOR_TABLES:
+        raise ValueError(f"Table has no embedding column: {table}")
+
+    keyword = " CONCURRENTLY" if concurrently else ""
+    statements = [
+        f"DROP INDEX{keyword} IF EXISTS {index_name(table, existing)}"
+        for existing in INDEX_METHODS
+    ]
+
+    if method == "hnsw":
+        options = (
+            f"m = {int(m or settings.pgvector_hnsw_m)}, "
+            f"ef_construction = "
+            f"{int(ef_construction or settings.pgvector_hnsw_ef_construction)}"
+        )
+    else:
+        options = f"lists = {int(lists or 100)}"
+
+    statements.append(
+        f"CREATE INDEX{keyword} {index_name(table, method)} ON {table} "
+        f"USING {method} (embedding vector_cosine_ops) WITH ({options})"
+    )
+    return statements
+
+
+def rebuild_vector_indexes(
+    engine,
+    method: Optional[str] = None,
+    lists: Optional[int] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    tables: Sequence[str] = VECTOR_TABLES,
+) -> Dict[str, Dict]:
+    """
+    Build or rebuild HNSW/IVFFlat indexes on the embedding columns.
+
+    Statements run in autocommit mode so ``CREATE INDEX CONCURRENTLY`` does
+    not block ingestion while the index is built.
+    """
+    if engine.dialect.name != "postgresql":
+        return {table: {"status": "skipped", "reason": "not_postgresql"} for table in tables}
+
+    method = (method or settings.pgvector_index_method).lower()
+    results: Dict[str, Dict] = {}
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in tables:
+            table_lists = lists or settings.pgvector_ivfflat_lists
+            if method == "ivfflat" and not table_lists:
+                row_count = conn.execute(
+                    text(f"SELECT count(*) FROM {table} WHERE embedding IS NOT NULL")
+                ).scalar()
+                table_lists = default_ivfflat_lists(row_count or 0)
+
+            for statement in build_index_statements(
+                table, method, lists=table_lists, m=m, ef_construction=ef_construction
+            ):
+                conn.execute(text(statement))
+
+            results[table] = {
+                "status": "rebuilt",
+                "index": index_name(table, method),
+                "method": method,
+                "lists": table_lists if method == "ivfflat" else None,
+            }
+            logger.info(f"Rebuilt {method} embedding index on {table}")
+
+    return results
+
+
+def list_vector_indexes(db: Session) -> List[Dict[str, str]]:
+    """Describe the embedding indexes currently present in PostgreSQL."""
+
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+
+    rows = db.execute(
+        text(
+            "SELECT tablename, indexname, indexdef FROM pg_indexes "
+            "WHERE indexname LIKE 'idx_%_embedding_%' ORDER BY tablename"
+        )
+    ).all()
+    return [
+        {"table": row.tablename, "index": row.indexname, "definition": row.indexdef}
+        for row in rows
+    ]
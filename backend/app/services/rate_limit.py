@@ -0,0 +1,212 @@
+"""
+Shared sliding-window rate limiting for external APIs.
+
+Every API and Celery process draws from one per-minute budget: the Redis
+backend keeps the window in a sorted set updated by an atomic Lua script,
+and ``LocalRateLimitBackend`` is an in-process stand-in used when Redis is
+unavailable (and in tests).
+
+Calls run in one of two priority lanes. ``interactive`` calls (admin
+requests) may use the whole budget; ``bulk`` calls (ingestion) leave
+``reserve`` calls per window free and step aside while an interactive call
+is waiting, so admin requests preempt background work.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+# How long bulk callers back off while an interactive call is waiting
+YIELD_SECONDS = 0.25
+# Waiting counters expire in case a process dies mid-wait
+WAITING_TTL_SECONDS = 120
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("rate_limit_priority", default=BULK)
+
+
+def current_priority() -> str:
+    """Priority lane of the calling context (``bulk`` unless set)."""
+
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """Run the enclosed API calls in the given priority lane."""
+
+    if priority not in PRIORITIES:
+        raise ValueError(f"Invalid priority: expected one of {', '.join(PRIORITIES)}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class LocalRateLimitBackend:
+    """In-process sliding window (one budget per process)."""
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self._calls: Dict[str, List[float]] = {}
+        self._waiting: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, name: str, limit: int, priority: str = BULK, reserve: int = 0) -> float:
+        """
+        Record a call if the window has room for the lane.
+
+        Args:
+            name: Budget name (e.g. ``gemini``)
+            limit: Calls allowed per window
+            priority: ``interactive`` or ``bulk``
+            reserve: Calls per window that bulk callers leave free
+
+        Returns:
+            0 if the call was recorded, else the seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.time()
+            calls = [t for t in self._calls.get(name, []) if now - t < self.window_seconds]
+            self._calls[name] = calls
+
+            if priority != INTERACTIVE:
+                if self._waiting.get(name, 0) > 0:
+                    return YIELD_SECONDS
+                limit = max(limit - reserve, 1)
+
+            if len(calls) < limit:
+                calls.append(now)
+                return 0.0
+            # Wait until enough old calls leave the window to make room
+            return max(calls[len(calls) - limit] + self.window_seconds - now, 0.01)
+
+    def add_waiting(self, name: str, delta: int) -> None:
+        with self._lock:
+            self._waiting[name] = max(self._waiting.get(name, 0) + delta, 0)
+
+    def calls(self, name: str) -> List[float]:
+        """Timestamps of the calls recorded in the current window."""
+        with self._lock:
+            now = time.time()
+            return [t for t in self._calls.get(name, []) if now - t < self.window_seconds]
+
+
+# KEYS: window sorted set, interactive waiting counter
+# ARGV: window (ms), limit, bulk reserve, priority, member
+RESERVE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+if ARGV[4] ~= 'interactive' then
+    if tonumber(redis.call('GET', KEYS[2]) or '0') > 0 then
+        return -1
+    end
+    limit = math.max(limit - tonumber(ARGV[3]), 1)
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[5])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], count - limit, count - limit, 'WITHSCORES')
+return math.max(tonumber(oldest[2]) + window - now, 10)
+"""
+
+
+class RedisRateLimitBackend:
+    """Sliding window shared by every process through Redis."""
+
+    def __init__(self, client, window_seconds: float = 60.0, prefix: str = "ratelimit"):
+        self.client = client
+        self.window_seconds = window_seconds
+        self.prefix = prefix
+        self._script = client.register_script(RESERVE_SCRIPT)
+        self._fallback = LocalRateLimitBackend(window_seconds)
+
+    def _keys(self, name: str) -> List[str]:
+        return [f"{self.prefix}:{name}:calls", f"{self.prefix}:{name}:waiting"]
+
+    def reserve(self, name: str, limit: int, priority: str = BULK, reserve: int = 0) -> float:
+        """Same contract as ``LocalRateLimitBackend.reserve``."""
+        try:
+            wait_ms = int(
+                self._script(
+                    keys=self._keys(name),
+                    args=[
+                        int(self.window_seconds * 1000),
+                        limit,
+                        reserve,
+                        priority,
+                        uuid.uuid4().hex,
+                    ],
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local window: {e}")
+            return self._fallback.reserve(name, limit, priority, reserve)
+
+        if wait_ms < 0:
+            return YIELD_SECONDS
+        return wait_ms / 1000.0
+
+    def add_waiting(self, name: str, delta: int) -> None:
+        key = self._keys(name)[1]
+        try:
+            pipe = self.client.pipeline()
+            pipe.incrby(key, delta)
+            pipe.expire(key, WAITING_TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to update rate limiter waiting count: {e}")
+            self._fallback.add_waiting(name, delta)
+
+
+# Global backend instance
+_backend = None
+
+
+def get_rate_limit_backend():
+    """
+    Get or create the process-wide rate limit backend.
+
+    ``rate_limit_backend`` selects ``redis``, ``local`` or ``auto`` (Redis
+    when reachable, otherwise local).
+    """
+    global _backend
+    if _backend is None:
+        mode = (settings.rate_limit_backend or "auto").lower()
+        client = None
+        if mode in ("auto", "redis"):
+            from app.cache import get_cache  # Lazy import
+
+            cache = get_cache()
+            client = cache.redis_client if cache.available else None
+            if client is None and mode == "redis":
+                logger.warning("Redis unavailable; rate limits are per process")
+        _backend = RedisRateLimitBackend(client) if client is not None else LocalRateLimitBackend()
+    return _backend
+
+
+def set_rate_limit_backend(backend: Optional[object]) -> None:
+    """Replace the process-wide backend (None re-resolves it on next use)."""
+
+    global _backend
+    _backend = backend
@@ -25,6 +25,9 @@ from app.models.models import NewsSource
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# The hourly research prompt is identical between runs; reuse its answer
+RESEARCH_CACHE_TTL = 3 * 3600
+
 
 class NewsArticle:
     """Represents a scraped news article."""
@@ -172,7 +175,9 @@ Return ONLY the JSON array, no additional text.
 If no recent articles found, return empty array []."""
 
         try:
-            response = self.gemini.generate_structured_output(prompt, temperature=0.3)
+            response = self.gemini.generate_structured_output(
+                prompt, temperature=0.3, cache_ttl=RESEARCH_CACHE_TTL
+            )
 
             if not response:
                 logger.warning("Empty response from Gemini news research")
@@ -8,11 +8,24 @@ Implements:
 4. Emotion breakdown calculation
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, Optional, Tuple
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from app.services.gemini_client import get_gemini_client, retry_on_failure
+from app.services.gemini_client import (
+    get_gemini_client,
+    parse_json_response,
+    retry_on_failure,
+    run_sync,
+)
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -21,6 +34,131 @@ settings = get_settings()
 # Initialize VADER
 vader_analyzer = SentimentIntensityAnalyzer()
 
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+WHITESPACE = re.compile(r"\s+")
+
+
+class SentenceScoreCache:
+    """Thread-safe LRU of VADER scores keyed by sentence hash."""
+
+    def __init__(self, max_size: int = 20000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(sentence: str) -> bytes:
+        return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, float]]:
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                self._entries.move_to_end(key)
+            return scores
+
+    def add(self, key: bytes, scores: Dict[str, float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = scores
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+sentence_cache = SentenceScoreCache(settings.sentiment_sentence_cache_size)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of a text, whitespace-normalized (VADER is case sensitive, so case is kept)."""
+
+    sentences = (WHITESPACE.sub(" ", part).strip() for part in SENTENCE_BOUNDARY.split(text or ""))
+    return [sentence for sentence in sentences if sentence]
+
+
+def score_sentences(
+    text: str, vader: Optional[SentimentIntensityAnalyzer] = None
+) -> List[Tuple[str, Dict[str, float]]]:
+    """
+    VADER scores of each sentence, memoized in ``sentence_cache``.
+
+    Paragraphs shared by syndicated or near-duplicate articles are only
+    scored once.
+
+    Returns:
+        ``(sentence, polarity_scores)`` pairs in text order
+    """
+    vader = vader or vader_analyzer
+    scored = []
+    for sentence in split_sentences(text):
+        key = SentenceScoreCache.key(sentence)
+        scores = sentence_cache.get(key)
+        if scores is None:
+            scores = vader.polarity_scores(sentence)
+            sentence_cache.add(key, scores)
+        scored.append((sentence, scores))
+    return scored
+
+
+def aggregate_sentence_scores(scored: Sequence[Tuple[str, Dict[str, float]]]) -> Dict[str, float]:
+    """Article-level scores: sentence scores averaged by sentence length in words."""
+
+    totals = {"compound": 0.0, "pos": 0.0, "neg": 0.0, "neu": 0.0}
+    weight_total = 0
+    for sentence, scores in scored:
+        weight = len(sentence.split())
+        weight_total += weight
+        for name in totals:
+            totals[name] += scores[name] * weight
+    if not weight_total:
+        return totals
+    return {name: round(value / weight_total, 4) for name, value in totals.items()}
+
+
+def vader_polarity(
+    text: str, vader: Optional[SentimentIntensityAnalyzer] = None
+) -> Dict[str, float]:
+    """VADER ``polarity_scores`` of a text in the configured ``sentiment_vader_mode``."""
+
+    if settings.sentiment_vader_mode == "sentence":
+        return aggregate_sentence_scores(score_sentences(text, vader))
+    return (vader or vader_analyzer).polarity_scores(text)
+
+
+# Columns returned by analyze_batch (named after the Article fields)
+BATCH_COLUMNS = (
+    "sentiment_overall",
+    "sentiment_confidence",
+    "sentiment_subjectivity",
+    "emotion_positive",
+    "emotion_negative",
+    "emotion_neutral",
+)
+
+REQUIRED_GEMINI_KEYS = [
+    "overall_polarity",
+    "confidence",
+    "subjectivity",
+    "emotion_breakdown",
+]
+
 
 class SentimentAnalyzer:
     """Multi-layered sentiment analysis for news articles."""
@@ -40,7 +178,7 @@ class SentimentAnalyzer:
             Dictionary with sentiment scores
         """
         try:
-            scores = self.vader.polarity_scores(text)
+            scores = vader_polarity(text, self.vader)
             return {
                 "overall": scores["compound"],  # -1 to 1
                 "positive": scores["pos"],
@@ -60,6 +198,82 @@ class SentimentAnalyzer:
                 "confidence": 0.0,
             }
 
+    def analyze_sentences(self, text: str) -> List[Dict[str, any]]:
+        """
+        Per-sentence VADER breakdown of a text.
+
+        Args:
+            text: Article text
+
+        Returns:
+            List of dicts with ``text``, ``overall``, ``positive``, ``negative``
+            and ``neutral`` per sentence, in text order
+        """
+        return [
+            {
+                "text": sentence,
+                "overall": scores["compound"],
+                "positive": scores["pos"],
+                "negative": scores["neg"],
+                "neutral": scores["neu"],
+            }
+            for sentence, scores in score_sentences(text, self.vader)
+        ]
+
+    def analyze_batch(
+        self,
+        texts: Sequence[Optional[str]],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        VADER-score many texts across a process pool.
+
+        VADER is pure Python and CPU bound, so texts are split into chunks
+        scored in worker processes; each worker reuses the lexicon loaded
+        when it imports this module. Scores match the VADER fallback of
+        ``analyze_article``.
+
+        Args:
+            texts: Texts to score (None is scored as empty)
+            workers: Worker processes (defaults to ``sentiment_batch_workers``;
+                1 scores in-process). Celery pool processes cannot fork, so
+                tasks pass 1.
+            chunk_size: Texts per chunk (defaults to ``sentiment_batch_chunk_size``)
+            executor: Existing executor to submit chunks to (overrides ``workers``)
+
+        Returns:
+            Dict of ``BATCH_COLUMNS`` to float arrays plus ``classification``
+            (object array), each aligned with ``texts``
+        """
+        texts = [text or "" for text in texts]
+        chunk_size = max(chunk_size or settings.sentiment_batch_chunk_size, 1)
+        chunks = [texts[start : start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        workers = min(workers or settings.sentiment_batch_workers, len(chunks))
+
+        if executor is not None:
+            parts = list(executor.map(_score_vader_chunk, chunks))
+        elif workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_score_vader_chunk, chunks))
+        else:
+            parts = [_score_vader_chunk(chunk) for chunk in chunks]
+
+        # Rows of (compound, pos, neg, neu)
+        scores = np.concatenate(parts) if parts else np.zeros((0, 4))
+        overall = scores[:, 0]
+        confidence = np.abs(overall)
+        return {
+            "sentiment_overall": overall,
+            "sentiment_confidence": confidence,
+            "sentiment_subjectivity": confidence * 0.7 + 0.3,
+            "emotion_positive": scores[:, 1],
+            "emotion_negative": scores[:, 2],
+            "emotion_neutral": scores[:, 3],
+            "classification": classify_sentiment_array(overall, confidence),
+        }
+
     @retry_on_failure(max_retries=2, delay=2.0)
     def analyze_sentiment_gemini(
         self, title: str, text: str, source_name: str
@@ -156,13 +370,7 @@ Return ONLY the JSON, no additional text."""
             sentiment_data = json.loads(clean_response)
 
             # Validate structure
-            required_keys = [
-                "overall_polarity",
-                "confidence",
-                "subjectivity",
-                "emotion_breakdown",
-            ]
-            if not all(key in sentiment_data for key in required_keys):
+            if not all(key in sentiment_data for key in REQUIRED_GEMINI_KEYS):
                 logger.error(
                     f"Missing required keys in Gemini response: {sentiment_data.keys()}"
                 )
@@ -178,6 +386,142 @@ Return ONLY the JSON, no additional text."""
             logger.error(f"Gemini sentiment analysis failed: {str(e)}")
             return None
 
+    def analyze_sentiment_gemini_batch(
+        self,
+        articles: Sequence[Tuple[str, str, str]],
+        batch_size: Optional[int] = None,
+        fallback: bool = True,
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Get Gemini sentiment for several short articles per request.
+
+        Articles are packed ``batch_size`` to a prompt (chunks are sent
+        concurrently) and Gemini answers with a JSON array keyed by article
+        index. Intended for short texts such as the summary-only articles
+        from ``create_articles_from_gemini_research``.
+
+        Args:
+            articles: ``(title, text, source_name)`` tuples
+            batch_size: Articles per request (defaults to ``gemini_sentiment_batch_size``)
+            fallback: Retry entries missing or malformed in the batch answer
+                with ``analyze_sentiment_gemini``
+
+        Returns:
+            One result per article, in input order (as ``analyze_sentiment_gemini``;
+            None where no valid result was obtained)
+        """
+        batch_size = max(batch_size or settings.gemini_sentiment_batch_size, 1)
+        chunks = [
+            list(range(start, min(start + batch_size, len(articles))))
+            for start in range(0, len(articles), batch_size)
+        ]
+
+        async def run_chunks():
+            return await asyncio.gather(
+                *(
+                    self._analyze_sentiment_chunk([articles[i] for i in chunk])
+                    for chunk in chunks
+                )
+            )
+
+        results: List[Optional[Dict[str, any]]] = [None] * len(articles)
+        if chunks:
+            for chunk, parsed in zip(chunks, run_sync(run_chunks())):
+                for position, index in enumerate(chunk):
+                    results[index] = parsed.get(position)
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            logger.info(
+                f"{len(missing)} of {len(articles)} articles missing from batched "
+                f"Gemini sentiment{'; retrying individually' if fallback else ''}"
+            )
+            if fallback:
+                for index in missing:
+                    results[index] = self.analyze_sentiment_gemini(*articles[index])
+        return results
+
+    async def _analyze_sentiment_chunk(
+        self, articles: Sequence[Tuple[str, str, str]]
+    ) -> Dict[int, Dict[str, any]]:
+        """Valid results of one batched request, keyed by position in ``articles``."""
+
+        max_chars = settings.gemini_sentiment_batch_max_chars
+        blocks = []
+        for index, (title, text, source_name) in enumerate(articles):
+            if len(text) > max_chars:
+                text = text[:max_chars] + "..."
+            blocks.append(
+                f"[Article {index}]\nTitle: {title}\nPublication: {source_name}\nText: {text}"
+            )
+        articles_text = "\n\n".join(blocks)
+
+        prompt = f"""Analyze the sentiment and opinion in each of these {len(articles)} news articles about Thailand.
+Assess every article on its own; do not let one article influence another.
+
+{articles_text}
+
+For each article:
+- overall_polarity: -1.0 (very negative) to +1.0 (very positive); consider
+  word choice, framing and what is emphasized or omitted
+- confidence: 0.0 (mixed or ambiguous signals) to 1.0 (clear, consistent tone)
+- subjectivity: 0.0 (pure facts) to 1.0 (pure opinion)
+- emotion_breakdown: distribute 1.0 across positive, negative and neutral
+- A factual article about challenges can be neutral if presented objectively
+
+Return a JSON array with one object per article:
+[
+  {{
+    "index": int (the article number),
+    "overall_polarity": float,
+    "confidence": float,
+    "subjectivity": float,
+    "emotion_breakdown": {{"positive": float, "negative": float, "neutral": float}},
+    "classification": "STRONGLY_POSITIVE|POSITIVE|NEUTRAL|NEGATIVE|STRONGLY_NEGATIVE",
+    "key_phrases": {{"positive": [strings], "negative": [strings]}},
+    "reasoning": "1-2 sentence explanation"
+  }}
+]
+
+Return ONLY the JSON array, no additional text."""
+
+        try:
+            response = await self.gemini.generate_structured_output_async(
+                prompt, temperature=0.2
+            )
+            if not response:
+                logger.warning("Empty response from batched Gemini sentiment analysis")
+                return {}
+            data = parse_json_response(response)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse batched Gemini sentiment response: {str(e)}")
+            return {}
+        except Exception as e:
+            logger.error(f"Batched Gemini sentiment analysis failed: {str(e)}")
+            return {}
+
+        if not isinstance(data, list):
+            logger.error(f"Expected list from batched Gemini sentiment, got {type(data)}")
+            return {}
+
+        parsed: Dict[int, Dict[str, any]] = {}
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            if not isinstance(index, int) or not 0 <= index < len(articles):
+                continue
+            emotions = entry.get("emotion_breakdown")
+            if not all(key in entry for key in REQUIRED_GEMINI_KEYS) or not (
+                isinstance(emotions, dict)
+                and all(key in emotions for key in ("positive", "negative", "neutral"))
+            ):
+                continue
+            entry = dict(entry)
+            entry.pop("index")
+            parsed[index] = entry
+        return parsed
+
     def classify_sentiment(self, overall_polarity: float, confidence: float) -> str:
         """
         Classify sentiment into categories with confidence-adjusted thresholds.
@@ -209,7 +553,12 @@ Return ONLY the JSON, no additional text."""
             return "NEUTRAL"
 
     def analyze_article(
-        self, title: str, text: str, source_name: str, use_gemini: bool = True
+        self,
+        title: str,
+        text: str,
+        source_name: str,
+        use_gemini: bool = True,
+        gemini_result: Optional[Dict[str, any]] = None,
     ) -> Dict[str, any]:
         """
         Perform complete sentiment analysis on an article.
@@ -221,6 +570,8 @@ Return ONLY the JSON, no additional text."""
             text: Article full text
             source_name: Publication name
             use_gemini: Whether to use Gemini (slower but more accurate)
+            gemini_result: Gemini sentiment already obtained from a combined
+                article analysis (skips the separate sentiment request)
 
         Returns:
             Complete sentiment analysis results
@@ -232,8 +583,9 @@ Return ONLY the JSON, no additional text."""
         full_text = f"{title}. {text}"
 
         # Try Gemini if enabled and configured
-        gemini_result = None
-        if use_gemini and settings.enable_gemini_sentiment:
+        if not (use_gemini and settings.enable_gemini_sentiment):
+            gemini_result = None
+        elif gemini_result is None:
             gemini_result = self.analyze_sentiment_gemini(title, text, source_name)
 
         # Use Gemini result if available, otherwise fall back to VADER
@@ -285,6 +637,37 @@ Return ONLY the JSON, no additional text."""
             }
 
 
+def _score_vader_chunk(texts: Sequence[str]) -> np.ndarray:
+    """VADER (compound, pos, neg, neu) rows for a chunk (runs in pool workers)."""
+
+    scores = np.empty((len(texts), 4), dtype=np.float64)
+    for row, text in enumerate(texts):
+        try:
+            result = vader_polarity(text)
+            scores[row] = (result["compound"], result["pos"], result["neg"], result["neu"])
+        except Exception as e:
+            logger.error(f"VADER analysis failed: {str(e)}")
+            scores[row] = (0.0, 0.33, 0.33, 0.34)
+    return scores
+
+
+def classify_sentiment_array(overall: np.ndarray, confidence: np.ndarray) -> np.ndarray:
+    """Vectorized ``SentimentAnalyzer.classify_sentiment``."""
+
+    multiplier = np.maximum(confidence, 0.3)
+    strong, moderate = 0.5 * multiplier, 0.2 * multiplier
+    return np.select(
+        [
+            overall >= strong,
+            overall >= moderate,
+            overall <= -strong,
+            overall <= -moderate,
+        ],
+        ["STRONGLY_POSITIVE", "POSITIVE", "STRONGLY_NEGATIVE", "NEGATIVE"],
+        default="NEUTRAL",
+    ).astype(object)
+
+
 # Global analyzer instance
 _sentiment_analyzer: Optional[SentimentAnalyzer] = None
 
@@ -0,0 +1,132 @@
+"""
+Bulk VADER re-scoring of stored articles.
+
+Articles are read in id order in batches of ``sentiment_rescore_batch_size``,
+scored with ``SentimentAnalyzer.analyze_batch`` (chunks fanned out over one
+process pool for the whole run) and written back with one bulk update per
+batch. Article id ranges are independent, so the Celery tasks split the
+table into ranges and re-score them in parallel.
+
+Re-scoring replaces the stored sentiment fields with the VADER baseline, so
+by default only articles that are unscored or carry a VADER score are
+touched; Gemini scores are overwritten only with ``include_gemini``. The
+Celery task re-aggregates trends and rollups once every range is done.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.models import Article
+from app.services.sentiment import BATCH_COLUMNS, get_sentiment_analyzer
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# VADER stores confidence = |compound| and subjectivity = 0.7 * confidence + 0.3
+# (see ``SentimentAnalyzer.analyze_article``); Gemini scores are independent.
+VADER_SCORE_TOLERANCE = 1e-6
+
+
+def vader_scored():
+    """Filter matching articles without a (complete) sentiment score or with a VADER one."""
+
+    magnitude = func.abs(Article.sentiment_overall)
+    return or_(
+        Article.sentiment_overall.is_(None),
+        Article.sentiment_confidence.is_(None),
+        Article.sentiment_subjectivity.is_(None),
+        and_(
+            func.abs(Article.sentiment_confidence - magnitude) < VADER_SCORE_TOLERANCE,
+            func.abs(Article.sentiment_subjectivity - (magnitude * 0.7 + 0.3))
+            < VADER_SCORE_TOLERANCE,
+        ),
+    )
+
+
+def article_id_ranges(db: Session, chunk_size: int) -> List[Tuple[int, int]]:
+    """Inclusive ``(first_id, last_id)`` ranges covering the articles table."""
+
+    low, high = db.query(func.min(Article.id), func.max(Article.id)).one()
+    if low is None:
+        return []
+    return [(start, min(start + chunk_size - 1, high)) for start in range(low, high + 1, chunk_size)]
+
+
+def rescore_articles(
+    db: Session,
+    start_id: Optional[int] = None,
+    end_id: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    include_gemini: bool = False,
+) -> Dict:
+    """
+    Re-score the sentiment of stored articles with VADER.
+
+    Args:
+        db: Database session (committed after every batch)
+        start_id: First article id (inclusive; all articles when None)
+        end_id: Last article id (inclusive)
+        batch_size: Articles read and written per batch (defaults to
+            ``sentiment_rescore_batch_size``)
+        workers: Scoring processes (defaults to ``sentiment_batch_workers``;
+            pass 1 inside Celery workers)
+        include_gemini: Also overwrite Gemini-derived scores (only unscored
+            and VADER-scored articles are re-scored by default)
+
+    Returns:
+        Dict with the number of articles re-scored
+    """
+    batch_size = batch_size or settings.sentiment_rescore_batch_size
+    workers = workers or settings.sentiment_batch_workers
+    analyzer = get_sentiment_analyzer()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        rescored = 0
+        last_id = start_id - 1 if start_id is not None else None
+        while True:
+            query = db.query(Article.id, Article.full_text, Article.summary, Article.title)
+            if last_id is not None:
+                query = query.filter(Article.id > last_id)
+            if end_id is not None:
+                query = query.filter(Article.id <= end_id)
+            if not include_gemini:
+                query = query.filter(vader_scored())
+            rows = query.order_by(Article.id.asc()).limit(batch_size).all()
+            if not rows:
+                break
+
+            # Same text ingestion scores; older rows may only have a summary
+            columns = analyzer.analyze_batch(
+                [full_text or summary or title for _, full_text, summary, title in rows],
+                workers=1,
+                executor=pool,
+            )
+            db.bulk_update_mappings(
+                Article,
+                [
+                    {
+                        "id": row[0],
+                        **{name: float(columns[name][index]) for name in BATCH_COLUMNS},
+                        # Keep the stored label consistent with the new score
+                        "sentiment_classification": columns["classification"][index],
+                    }
+                    for index, row in enumerate(rows)
+                ],
+            )
+            db.commit()
+            rescored += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    logger.info(f"Re-scored sentiment for {rescored} articles")
+    return {"rescored": rescored}
@@ -0,0 +1,295 @@
+"""
+Per-keyword sentiment rollups for constant-time API reads.
+
+``keyword_sentiment_rollups`` holds, for every keyword, the count and sum of
+its scored articles, counts per stored ``sentiment_classification``, counts by
+score band and per-source sums. Ingestion adds new keyword/article links in
+place (via ``record_article_links``); ``rebuild_rollups`` recomputes rows with
+one grouped query and is used for reconciliation and the initial fill.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.db.upsert import bulk_upsert
+from app.models.models import Article, KeywordArticle, KeywordSentimentRollup
+
+logger = logging.getLogger(__name__)
+
+# sentiment_classification label -> rollup column
+CLASSIFICATION_COLUMNS = {
+    "STRONGLY_POSITIVE": "strongly_positive_count",
+    "POSITIVE": "positive_count",
+    "NEUTRAL": "neutral_count",
+    "NEGATIVE": "negative_count",
+    "STRONGLY_NEGATIVE": "strongly_negative_count",
+}
+# Score band used by keyword comparisons
+SCORE_THRESHOLD = 0.2
+
+
+@dataclass
+class KeywordRollup:
+    """All-time sentiment totals of one keyword."""
+
+    keyword_id: int
+    article_count: int = 0
+    sentiment_sum: float = 0.0
+    strongly_positive_count: int = 0
+    positive_count: int = 0
+    neutral_count: int = 0
+    negative_count: int = 0
+    strongly_negative_count: int = 0
+    score_positive_count: int = 0
+    score_negative_count: int = 0
+    # source -> [sentiment sum, article count]; articles without a source are
+    # counted in the totals only
+    sources: Dict[str, List[float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, row: KeywordSentimentRollup) -> "KeywordRollup":
+        return cls(
+            keyword_id=row.keyword_id,
+            article_count=row.article_count or 0,
+            sentiment_sum=row.sentiment_sum or 0.0,
+            strongly_positive_count=row.strongly_positive_count or 0,
+            positive_count=row.positive_count or 0,
+            neutral_count=row.neutral_count or 0,
+            negative_count=row.negative_count or 0,
+            strongly_negative_count=row.strongly_negative_count or 0,
+            score_positive_count=row.score_positive_count or 0,
+            score_negative_count=row.score_negative_count or 0,
+            sources={
+                source: list(totals) for source, totals in (row.source_stats or {}).items()
+            },
+        )
+
+    @property
+    def average_sentiment(self) -> Optional[float]:
+        return self.sentiment_sum / self.article_count if self.article_count else None
+
+    @property
+    def score_neutral_count(self) -> int:
+        return self.article_count - self.score_positive_count - self.score_negative_count
+
+    def distribution(self) -> Dict[str, int]:
+        return {
+            "strongly_positive": self.strongly_positive_count,
+            "positive": self.positive_count,
+            "neutral": self.neutral_count,
+            "negative": self.negative_count,
+            "strongly_negative": self.strongly_negative_count,
+        }
+
+    def source_averages(self) -> Dict[str, float]:
+        return {
+            source: total / count for source, (total, count) in self.sources.items() if count
+        }
+
+    def add_article(self, article: Article) -> None:
+        sentiment = article.sentiment_overall
+        self.article_count += 1
+        self.sentiment_sum += sentiment
+        column = CLASSIFICATION_COLUMNS.get(article.sentiment_classification)
+        if column:
+            setattr(self, column, getattr(self, column) + 1)
+        if sentiment > SCORE_THRESHOLD:
+            self.score_positive_count += 1
+        elif sentiment < -SCORE_THRESHOLD:
+            self.score_negative_count += 1
+        if article.source:
+            totals = self.sources.setdefault(article.source, [0.0, 0])
+            totals[0] += sentiment
+            totals[1] += 1
+
+    def merge(self, other: "KeywordRollup") -> None:
+        self.article_count += other.article_count
+        self.sentiment_sum += other.sentiment_sum
+        for column in CLASSIFICATION_COLUMNS.values():
+            setattr(self, column, getattr(self, column) + getattr(other, column))
+        self.score_positive_count += other.score_positive_count
+        self.score_negative_count += other.score_negative_count
+        for source, (total, count) in other.sources.items():
+            totals = self.sources.setdefault(source, [0.0, 0])
+            totals[0] += total
+            totals[1] += count
+
+    def as_row(self) -> Dict:
+        row = {
+            "keyword_id": self.keyword_id,
+            "article_count": self.article_count,
+            "sentiment_sum": self.sentiment_sum,
+            "score_positive_count": self.score_positive_count,
+            "score_negative_count": self.score_negative_count,
+            "source_stats": self.sources,
+        }
+        for column in CLASSIFICATION_COLUMNS.values():
+            row[column] = getattr(self, column)
+        return row
+
+
+def compute_rollups(
+    db: Session, keyword_ids: Optional[Sequence[int]] = None
+) -> Dict[int, KeywordRollup]:
+    """
+    Compute rollups from the articles with one grouped query.
+
+    Args:
+        db: Database session
+        keyword_ids: Restrict to these keywords (all keywords when None)
+
+    Returns:
+        Mapping of keyword ID to rollup (keywords without scored articles are absent)
+    """
+    sentiment = Article.sentiment_overall
+    columns = [
+        KeywordArticle.keyword_id,
+        Article.source,
+        func.count(Article.id),
+        func.sum(sentiment),
+        func.sum(case((sentiment > SCORE_THRESHOLD, 1), else_=0)),
+        func.sum(case((sentiment < -SCORE_THRESHOLD, 1), else_=0)),
+    ] + [
+        func.sum(case((Article.sentiment_classification == label, 1), else_=0))
+        for label in CLASSIFICATION_COLUMNS
+    ]
+    query = (
+        db.query(*columns)
+        .join(Article, Article.id == KeywordArticle.article_id)
+        .filter(sentiment.isnot(None))
+        .group_by(KeywordArticle.keyword_id, Article.source)
+    )
+    if keyword_ids is not None:
+        query = query.filter(KeywordArticle.keyword_id.in_(list(keyword_ids)))
+
+    rollups: Dict[int, KeywordRollup] = {}
+    for row in query.all():
+        keyword_id, source, count, total = row[0], row[1], int(row[2]), float(row[3] or 0.0)
+        part = KeywordRollup(
+            keyword_id=keyword_id,
+            article_count=count,
+            sentiment_sum=total,
+            score_positive_count=int(row[4] or 0),
+            score_negative_count=int(row[5] or 0),
+            sources={source: [total, count]} if source else {},
+        )
+        for column, value in zip(CLASSIFICATION_COLUMNS.values(), row[6:]):
+            setattr(part, column, int(value or 0))
+        rollups.setdefault(keyword_id, KeywordRollup(keyword_id=keyword_id)).merge(part)
+    return rollups
+
+
+def load_rollups(db: Session, keyword_ids: Sequence[int]) -> Dict[int, KeywordRollup]:
+    """
+    Read rollups for the given keywords.
+
+    Keywords without a stored row (e.g. before the first rebuild) are
+    computed on the fly, so every requested ID is present in the result.
+    """
+    keyword_ids = list(keyword_ids)
+    rollups = {
+        row.keyword_id: KeywordRollup.from_row(row)
+        for row in db.query(KeywordSentimentRollup)
+        .filter(KeywordSentimentRollup.keyword_id.in_(keyword_ids))
+        .all()
+    }
+    missing = [keyword_id for keyword_id in keyword_ids if keyword_id not in rollups]
+    if missing:
+        rollups.update(compute_rollups(db, missing))
+    for keyword_id in missing:
+        rollups.setdefault(keyword_id, KeywordRollup(keyword_id=keyword_id))
+    return rollups
+
+
+def rebuild_rollups(db: Session, keyword_ids: Optional[Sequence[int]] = None) -> int:
+    """
+    Recompute and store rollups (the caller commits).
+
+    Args:
+        db: Database session
+        keyword_ids: Keywords to rebuild (all keywords when None)
+
+    Returns:
+        Number of rollup rows written
+    """
+    rollups = compute_rollups(db, keyword_ids)
+    if keyword_ids is None:
+        db.query(KeywordSentimentRollup).delete(synchronize_session=False)
+    else:
+        # Keywords that lost all their scored articles are reset to zero.
+        for keyword_id in keyword_ids:
+            rollups.setdefault(keyword_id, KeywordRollup(keyword_id=keyword_id))
+
+    return bulk_upsert(
+        db,
+        KeywordSentimentRollup.__table__,
+        [rollup.as_row() for rollup in rollups.values()],
+        conflict_columns=("keyword_id",),
+    )
+
+
+def apply_rollup_links(db: Session, links: Iterable[Tuple[Article, int]]) -> int:
+    """
+    Add newly linked articles to their keywords' rollups in place.
+
+    Existing rows are locked and incremented; keywords without a row get one
+    computed from all their articles (which already includes the new links,
+    so they must be flushed first). Runs in a savepoint; failures are logged
+    and left to reconciliation.
+
+    Args:
+        db: Database session
+        links: ``(article, keyword_id)`` pairs that were just created
+
+    Returns:
+        Number of rollup rows updated or created
+    """
+    deltas: Dict[int, KeywordRollup] = {}
+    for article, keyword_id in links:
+        if article.sentiment_overall is None:
+            continue
+        deltas.setdefault(keyword_id, KeywordRollup(keyword_id=keyword_id)).add_article(article)
+    if not deltas:
+        return 0
+
+    try:
+        with db.begin_nested():
+            rows = (
+                db.query(KeywordSentimentRollup)
+                .filter(KeywordSentimentRollup.keyword_id.in_(sorted(deltas)))
+                .order_by(KeywordSentimentRollup.keyword_id)
+                .with_for_update()
+                .populate_existing()
+                .all()
+            )
+            for row in rows:
+                rollup = KeywordRollup.from_row(row)
+                rollup.merge(deltas[row.keyword_id])
+                for column, value in rollup.as_row().items():
+                    setattr(row, column, value)
+
+            existing = {row.keyword_id for row in rows}
+            missing = [keyword_id for keyword_id in sorted(deltas) if keyword_id not in existing]
+            if missing:
+                db.flush()
+                computed = compute_rollups(db, missing)
+                bulk_upsert(
+                    db,
+                    KeywordSentimentRollup.__table__,
+                    [
+                        computed[keyword_id].as_row()
+                        for keyword_id in missing
+                        if keyword_id in computed
+                    ],
+                    conflict_columns=("keyword_id",),
+                    update_columns=(),
+                )
+            db.flush()
+            return len(deltas)
+    except Exception as e:
+        logger.warning(f"Incremental keyword sentiment rollup update failed: {e}")
+        return 0
@@ -0,0 +1,487 @@
+"""
+Set-based aggregation of daily keyword sentiment trends.
+
+All keywords and days in a date range are aggregated by one grouped query
+over ``keyword_articles`` joined to ``articles``, grouped by keyword, day and
+source. The rows are streamed in ``(keyword_id, day)`` order, folded into one
+``TrendAggregate`` per keyword and day, and written back with a bulk upsert
+on ``uq_keyword_date``.
+
+Trend rows also carry their running sums (``weighted_sum``, ``weight_total``
+and ``source_stats``), so ingestion tasks can add new keyword/article links
+in place with ``record_article_links``; the nightly aggregation then only
+reconciles.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.upsert import bulk_upsert
+from app.models.models import Article, KeywordArticle, SentimentTrend
+from app.services.sentiment_rollups import apply_rollup_links
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Weight used when an article has no (or zero) sentiment confidence; VADER
+# scores exactly neutral articles with confidence 0.0
+DEFAULT_WEIGHT = 0.5
+# Lower bound of the confidence multiplier in classify_sentiment_category
+MIN_CONFIDENCE_MULTIPLIER = 0.3
+MODERATE_THRESHOLD = 0.2
+UNKNOWN_SOURCE = "unknown"
+
+
+@dataclass
+class TrendAggregate:
+    """Sentiment totals of one keyword on one day."""
+
+    keyword_id: int
+    day: date
+    weighted_sum: float = 0.0
+    weight_total: float = 0.0
+    article_count: int = 0
+    positive_count: int = 0
+    negative_count: int = 0
+    neutral_count: int = 0
+    # source -> [sentiment sum, article count]
+    sources: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def avg_sentiment(self) -> float:
+        return self.weighted_sum / self.weight_total if self.weight_total > 0 else 0.0
+
+    def top_sources(self) -> Dict[str, float]:
+        """Average (unweighted) sentiment per source."""
+
+        return {
+            source: round(total / count, 3)
+            for source, (total, count) in self.sources.items()
+            if count
+        }
+
+    def add_article(self, source: Optional[str], sentiment: float, confidence: Optional[float]):
+        weight = confidence or DEFAULT_WEIGHT
+        self.weighted_sum += sentiment * weight
+        self.weight_total += weight
+        self.article_count += 1
+        bucket = sentiment_bucket_for(sentiment, confidence)
+        if bucket == "positive":
+            self.positive_count += 1
+        elif bucket == "negative":
+            self.negative_count += 1
+        else:
+            self.neutral_count += 1
+        totals = self.sources.setdefault(source or UNKNOWN_SOURCE, [0.0, 0])
+        totals[0] += sentiment
+        totals[1] += 1
+
+    def as_row(self) -> Dict:
+        return {
+            "keyword_id": self.keyword_id,
+            "date": self.day,
+            "avg_sentiment": self.avg_sentiment,
+            "article_count": self.article_count,
+            "positive_count": self.positive_count,
+            "negative_count": self.negative_count,
+            "neutral_count": self.neutral_count,
+            "top_sources": self.top_sources(),
+            "weighted_sum": self.weighted_sum,
+            "weight_total": self.weight_total,
+            "source_stats": self.sources,
+        }
+
+
+def sentiment_bucket_for(sentiment: float, confidence: Optional[float]) -> str:
+    """Python counterpart of ``sentiment_bucket`` for a single article."""
+
+    confidence = confidence or DEFAULT_WEIGHT
+    threshold = MODERATE_THRESHOLD * max(confidence, MIN_CONFIDENCE_MULTIPLIER)
+    if sentiment >= threshold:
+        return "positive"
+    if sentiment <= -threshold:
+        return "negative"
+    return "neutral"
+
+
+def sentiment_weight():
+    """SQL expression for an article's aggregation weight (``confidence or 0.5``)."""
+
+    return func.coalesce(func.nullif(Article.sentiment_confidence, 0), DEFAULT_WEIGHT)
+
+
+def sentiment_bucket(bucket: str):
+    """
+    SQL 0/1 expression for an article's sentiment bucket.
+
+    Mirrors ``classify_sentiment_category``: STRONGLY_POSITIVE and POSITIVE
+    count as positive, the negative categories as negative.
+
+    Args:
+        bucket: ``positive``, ``negative`` or ``neutral``
+    """
+    confidence = sentiment_weight()
+    multiplier = case(
+        (confidence < MIN_CONFIDENCE_MULTIPLIER, MIN_CONFIDENCE_MULTIPLIER),
+        else_=confidence,
+    )
+    threshold = MODERATE_THRESHOLD * multiplier
+    positive = Article.sentiment_overall >= threshold
+    negative = Article.sentiment_overall <= -threshold
+
+    if bucket == "positive":
+        return case((positive, 1), else_=0)
+    if bucket == "negative":
+        return case((positive, 0), (negative, 1), else_=0)
+    return case((positive, 0), (negative, 0), else_=1)
+
+
+def _as_date(value) -> date:
+    # SQLite's date() returns ISO strings, PostgreSQL returns dates.
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def compute_daily_trends(
+    db: Session,
+    start: date,
+    end: date,
+    keyword_ids: Optional[Sequence[int]] = None,
+    yield_per: int = 2000,
+) -> Iterator[TrendAggregate]:
+    """
+    Stream per-keyword daily aggregates for ``start``..``end`` (inclusive).
+
+    Args:
+        db: Database session
+        start: First day
+        end: Last day
+        keyword_ids: Restrict to these keywords (all keywords when None)
+        yield_per: Rows fetched per round trip
+
+    Yields:
+        One ``TrendAggregate`` per keyword and day with scored articles
+    """
+    day = func.date(Article.published_date).label("day")
+    source = func.coalesce(Article.source, UNKNOWN_SOURCE).label("source")
+    weight = sentiment_weight()
+
+    query = (
+        db.query(
+            KeywordArticle.keyword_id,
+            day,
+            source,
+            func.sum(Article.sentiment_overall * weight),
+            func.sum(weight),
+            func.count(Article.id),
+            func.sum(sentiment_bucket("positive")),
+            func.sum(sentiment_bucket("negative")),
+            func.sum(sentiment_bucket("neutral")),
+            func.sum(Article.sentiment_overall),
+        )
+        .join(Article, Article.id == KeywordArticle.article_id)
+        .filter(
+            Article.published_date >= datetime.combine(start, time.min),
+            Article.published_date < datetime.combine(end + timedelta(days=1), time.min),
+            Article.sentiment_overall.isnot(None),
+        )
+        .group_by(KeywordArticle.keyword_id, day, source)
+        .order_by(KeywordArticle.keyword_id, day, source)
+    )
+    if keyword_ids is not None:
+        query = query.filter(KeywordArticle.keyword_id.in_(list(keyword_ids)))
+
+    current: Optional[TrendAggregate] = None
+    for row in query.yield_per(yield_per):
+        keyword_id, row_day = row[0], _as_date(row[1])
+        if current is None or (current.keyword_id, current.day) != (keyword_id, row_day):
+            if current is not None:
+                yield current
+            current = TrendAggregate(keyword_id=keyword_id, day=row_day)
+
+        current.weighted_sum += float(row[3] or 0.0)
+        current.weight_total += float(row[4] or 0.0)
+        current.article_count += int(row[5] or 0)
+        current.positive_count += int(row[6] or 0)
+        current.negative_count += int(row[7] or 0)
+        current.neutral_count += int(row[8] or 0)
+        current.sources[row[2]] = [float(row[9] or 0.0), int(row[5] or 0)]
+
+    if current is not None:
+        yield current
+
+
+def write_trends(db: Session, aggregates: Sequence[TrendAggregate]) -> int:
+    """Bulk upsert aggregates into ``sentiment_trends`` (the caller commits)."""
+
+    return bulk_upsert(
+        db,
+        SentimentTrend.__table__,
+        [aggregate.as_row() for aggregate in aggregates],
+        conflict_columns=("keyword_id", "date"),
+    )
+
+
+def aggregate_trends(
+    db: Session,
+    start: date,
+    end: date,
+    keyword_ids: Optional[Sequence[int]] = None,
+    batch_size: int = 500,
+) -> Dict:
+    """
+    Recompute and store trends for every keyword/day in a date range.
+
+    Args:
+        db: Database session (committed once at the end)
+        start: First day
+        end: Last day
+        keyword_ids: Restrict to these keywords (all keywords when None)
+        batch_size: Aggregates per upsert statement
+
+    Returns:
+        Dict with the number of trend rows written and keywords touched
+    """
+    written = 0
+    keywords = set()
+    days = set()
+    batch: List[TrendAggregate] = []
+    for aggregate in compute_daily_trends(db, start, end, keyword_ids):
+        batch.append(aggregate)
+        keywords.add(aggregate.keyword_id)
+        days.add(aggregate.day)
+        if len(batch) >= batch_size:
+            written += write_trends(db, batch)
+            batch = []
+    written += write_trends(db, batch)
+    db.commit()
+
+    logger.info(
+        f"Aggregated {written} sentiment trend rows for {len(keywords)} keywords "
+        f"({start} to {end})"
+    )
+    return {
+        "trends_written": written,
+        "keywords_processed": len(keywords),
+        "keyword_ids": sorted(keywords),
+        "dates": [str(day) for day in sorted(days)],
+    }
+
+
+def date_chunks(start: date, end: date, chunk_days: int) -> List[Tuple[date, date]]:
+    """Split ``start``..``end`` (inclusive) into consecutive ranges of ``chunk_days``."""
+
+    if end < start:
+        raise ValueError("end_date must not be before start_date")
+    chunk_days = max(1, chunk_days)
+    chunks = []
+    current = start
+    while current <= end:
+        chunk_end = min(end, current + timedelta(days=chunk_days - 1))
+        chunks.append((current, chunk_end))
+        current = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def _reset_engine() -> None:
+    # Forked workers must not reuse the parent's pooled connections.
+    from app.database import engine
+
+    engine.dispose(close=False)
+
+
+def _aggregate_chunk(
+    start: date, end: date, keyword_ids: Optional[Sequence[int]], session_factory=None
+) -> Dict:
+    if session_factory is None:
+        from app.database import SessionLocal
+
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        return aggregate_trends(db, start, end, keyword_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def backfill_trends(
+    start: date,
+    end: date,
+    keyword_ids: Optional[Sequence[int]] = None,
+    chunk_days: Optional[int] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, Dict], None]] = None,
+    session_factory=None,
+) -> Dict:
+    """
+    Re-aggregate trends for a keyword set over a date range.
+
+    The range is split into chunks of ``chunk_days``; each chunk is one
+    grouped scan of its articles and one bulk upsert, so chunks are
+    independent and run in parallel across a process pool when
+    ``workers`` > 1. Use the ``backfill_sentiment_trends`` Celery task
+    from inside workers (Celery pool processes cannot fork a pool).
+
+    Args:
+        start: First day
+        end: Last day
+        keyword_ids: Restrict to these keywords (all keywords when None)
+        chunk_days: Days per chunk (defaults to ``SENTIMENT_BACKFILL_CHUNK_DAYS``)
+        workers: Worker processes (defaults to ``SENTIMENT_BACKFILL_WORKERS``)
+        progress: Called as ``progress(done, total, chunk_result)`` after each chunk
+        session_factory: Session factory for in-process runs (``workers`` = 1)
+
+    Returns:
+        Dict with chunk, trend row and failure totals
+    """
+    chunks = date_chunks(start, end, chunk_days or settings.sentiment_backfill_chunk_days)
+    workers = min(workers or settings.sentiment_backfill_workers, len(chunks))
+    keyword_ids = list(keyword_ids) if keyword_ids is not None else None
+
+    summary = {"chunks": len(chunks), "trends_written": 0, "failed_chunks": []}
+
+    def _record(done: int, chunk: Tuple[date, date], result: Optional[Dict], error=None):
+        if error is not None:
+            logger.error(f"Sentiment backfill chunk {chunk[0]}..{chunk[1]} failed: {error}")
+            summary["failed_chunks"].append(f"{chunk[0]}..{chunk[1]}")
+            result = {"trends_written": 0, "error": str(error)}
+        else:
+            summary["trends_written"] += result["trends_written"]
+        if progress is not None:
+            progress(done, len(chunks), result)
+
+    if workers <= 1:
+        for done, chunk in enumerate(chunks, start=1):
+            try:
+                result = _aggregate_chunk(chunk[0], chunk[1], keyword_ids, session_factory)
+                _record(done, chunk, result)
+            except Exception as e:
+                _record(done, chunk, None, e)
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_reset_engine) as pool:
+        futures = {
+            pool.submit(_aggregate_chunk, chunk[0], chunk[1], keyword_ids): chunk
+            for chunk in chunks
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                _record(done, futures[future], future.result())
+            except Exception as e:
+                _record(done, futures[future], None, e)
+    return summary
+
+
+def record_article_links(db: Session, links: Iterable[Tuple[Article, int]]) -> int:
+    """
+    Add newly linked articles to their keyword/day trend rows in place.
+
+    Call after flushing the links and before committing, so the trend update
+    lands in the same transaction. Rows are locked in key order; rows that
+    predate the running-sum columns are recomputed from the articles instead.
+    Failures are logged and rolled back to a savepoint without affecting the
+    caller's transaction (the nightly aggregation reconciles them). The
+    keywords' all-time rollups are updated the same way.
+
+    Args:
+        db: Database session
+        links: ``(article, keyword_id)`` pairs that were just created
+
+    Returns:
+        Number of trend rows updated
+    """
+    links = list(links)
+    apply_rollup_links(db, links)
+
+    deltas: Dict[Tuple[int, date], TrendAggregate] = {}
+    for article, keyword_id in links:
+        if article.sentiment_overall is None or article.published_date is None:
+            continue
+        key = (keyword_id, _as_date(article.published_date))
+        if key not in deltas:
+            deltas[key] = TrendAggregate(keyword_id=keyword_id, day=key[1])
+        deltas[key].add_article(
+            article.source, article.sentiment_overall, article.sentiment_confidence
+        )
+    if not deltas:
+        return 0
+
+    try:
+        with db.begin_nested():
+            return _apply_trend_deltas(db, deltas)
+    except Exception as e:
+        logger.warning(f"Incremental sentiment trend update failed: {e}")
+        return 0
+
+
+def _apply_trend_deltas(db: Session, deltas: Dict[Tuple[int, date], TrendAggregate]) -> int:
+    keys = sorted(deltas)
+    # Make sure every row exists so all of them can be locked.
+    bulk_upsert(
+        db,
+        SentimentTrend.__table__,
+        [TrendAggregate(keyword_id=key[0], day=key[1]).as_row() for key in keys],
+        conflict_columns=("keyword_id", "date"),
+        update_columns=(),
+    )
+    rows = (
+        db.query(SentimentTrend)
+        .filter(tuple_(SentimentTrend.keyword_id, SentimentTrend.date).in_(keys))
+        .order_by(SentimentTrend.keyword_id, SentimentTrend.date)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+
+    stale = []
+    for row in rows:
+        delta = deltas[(row.keyword_id, row.date)]
+        if row.weight_total is None and row.article_count:
+            # Written before running sums existed; rebuild from the articles.
+            stale.append(row)
+            continue
+
+        sources = {
+            source: list(totals) for source, totals in (row.source_stats or {}).items()
+        }
+        for source, (total, count) in delta.sources.items():
+            current = sources.setdefault(source, [0.0, 0])
+            current[0] += total
+            current[1] += count
+        merged = TrendAggregate(
+            keyword_id=row.keyword_id,
+            day=row.date,
+            weighted_sum=(row.weighted_sum or 0.0) + delta.weighted_sum,
+            weight_total=(row.weight_total or 0.0) + delta.weight_total,
+            article_count=(row.article_count or 0) + delta.article_count,
+            positive_count=(row.positive_count or 0) + delta.positive_count,
+            negative_count=(row.negative_count or 0) + delta.negative_count,
+            neutral_count=(row.neutral_count or 0) + delta.neutral_count,
+            sources=sources,
+        )
+        for column, value in merged.as_row().items():
+            setattr(row, column, value)
+
+    for row in stale:
+        db.flush()
+        recomputed = list(compute_daily_trends(db, row.date, row.date, [row.keyword_id]))
+        if recomputed:
+            for column, value in recomputed[0].as_row().items():
+                setattr(row, column, value)
+
+    db.flush()
+    return len(rows)
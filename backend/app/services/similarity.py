@@ -0,0 +1,299 @@
+"""
+Matrix-backed cosine similarity engine.
+
+Embeddings are L2-normalized once on insert and held in a single contiguous
+``(N, dim)`` array, so a batch of queries is answered with one matrix
+multiplication followed by ``argpartition`` to select the top-k rows.
+
+The array is float32 by default; ``storage="float16"`` or ``"int8"`` keeps it
+2x/4x smaller and scores in fixed-size blocks so the temporary float32 copy
+never spans the whole collection.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.db.quantization import dequantize_int8, quantize_int8
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 384
+
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+def normalize_rows(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """L2-normalize rows, returning the normalized matrix and a validity mask."""
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1)
+    valid = np.isfinite(norms) & (norms > 0)
+    normalized = np.zeros_like(vectors, dtype=np.float32)
+    normalized[valid] = vectors[valid] / norms[valid, None]
+    return normalized, valid
+
+
+def spherical_kmeans(
+    sample: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """
+    Fit ``nlist`` unit-norm centroids to normalized vectors (cosine k-means).
+
+    Args:
+        sample: ``(n, dim)`` normalized training vectors, ``n >= nlist``
+        nlist: Number of centroids
+        iterations: Lloyd iterations
+        seed: Random seed for initialization and empty-cluster reseeding
+    """
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)]
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+        centroids, _ = normalize_rows(sums)
+    return centroids
+
+
+class SimilarityEngine:
+    """Top-k cosine similarity over pre-normalized embeddings addressed by ID."""
+
+    # Rows dequantized per block when scoring compact storage.
+    score_block_rows = 8192
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        initial_capacity: int = 1024,
+        storage: str = "float32",
+    ):
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unsupported embedding storage: {storage}")
+        self.dim = dim
+        self.storage = storage
+        capacity = max(1, initial_capacity)
+        self.vectors = np.zeros((capacity, dim), dtype=STORAGE_DTYPES[storage])
+        self.scales = np.ones(capacity, dtype=np.float32) if storage == "int8" else None
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.size = 0
+        self.row_of: Dict[int, int] = {}
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: Sequence[Optional[Sequence[float]]],
+        ids: Optional[Sequence[int]] = None,
+        dim: int = EMBEDDING_DIM,
+        storage: str = "float32",
+    ) -> "SimilarityEngine":
+        """
+        Build an engine from raw embeddings, skipping missing or zero vectors.
+
+        Args:
+            embeddings: Candidate vectors (None entries are ignored)
+            ids: External IDs for each vector (defaults to the list position)
+            dim: Embedding dimensionality
+            storage: ``float32``, ``float16`` or ``int8``
+        """
+        if ids is None:
+            ids = range(len(embeddings))
+
+        kept_ids = []
+        kept_vectors = []
+        for item_id, embedding in zip(ids, embeddings):
+            if embedding is None:
+                continue
+            vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            if vector.shape[0] != dim:
+                continue
+            kept_ids.append(int(item_id))
+            kept_vectors.append(vector)
+
+        engine = cls(dim=dim, initial_capacity=max(len(kept_ids), 1), storage=storage)
+        if kept_ids:
+            engine.add(kept_ids, np.vstack(kept_vectors))
+        return engine
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vector storage."""
+        scales = self.scales.nbytes if self.scales is not None else 0
+        return self.vectors.nbytes + scales + self.ids.nbytes
+
+    def _ensure_capacity(self, extra: int) -> None:
+        required = self.size + extra
+        capacity = self.vectors.shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dim), dtype=self.vectors.dtype)
+        vectors[: self.size] = self.vectors[: self.size]
+        ids = np.full(capacity, -1, dtype=np.int64)
+        ids[: self.size] = self.ids[: self.size]
+        if self.scales is not None:
+            scales = np.ones(capacity, dtype=np.float32)
+            scales[: self.size] = self.scales[: self.size]
+            self.scales = scales
+        self.vectors = vectors
+        self.ids = ids
+
+    def add(
+        self, ids: Sequence[int], vectors: np.ndarray, normalized: bool = False
+    ) -> np.ndarray:
+        """
+        Insert or overwrite vectors.
+
+        Vectors with a zero or non-finite norm are skipped. Returns the row
+        index of every stored vector.
+        """
+        if not normalized:
+            vectors, valid = normalize_rows(vectors)
+            ids = [item_id for item_id, ok in zip(ids, valid) if ok]
+            vectors = vectors[valid]
+
+        new_count = sum(1 for item_id in ids if item_id not in self.row_of)
+        self._ensure_capacity(new_count)
+
+        rows = np.empty(len(ids), dtype=np.int64)
+        for position, item_id in enumerate(ids):
+            row = self.row_of.get(item_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.row_of[item_id] = row
+                self.ids[row] = item_id
+            rows[position] = row
+
+        if len(rows):
+            if self.storage == "int8":
+                self.vectors[rows], self.scales[rows] = quantize_int8(vectors)
+            else:
+                self.vectors[rows] = vectors
+        return rows
+
+    def remove(self, ids: Iterable[int]) -> List[int]:
+        """Tombstone rows for the given IDs; returns the freed row indices."""
+
+        freed = []
+        for item_id in ids:
+            row = self.row_of.pop(item_id, None)
+            if row is not None:
+                self.ids[row] = -1
+                self.vectors[row] = 0
+                freed.append(row)
+        return freed
+
+    def live_rows(self) -> np.ndarray:
+        return np.nonzero(self.ids[: self.size] >= 0)[0]
+
+    def rows_for(self, ids: Iterable[int]) -> np.ndarray:
+        rows = [self.row_of[item_id] for item_id in ids if item_id in self.row_of]
+        return np.asarray(rows, dtype=np.int64)
+
+    def vector(self, item_id: int) -> Optional[np.ndarray]:
+        row = self.row_of.get(item_id)
+        if row is None:
+            return None
+        return self.dequantize_rows(np.asarray([row]))[0]
+
+    def dequantize_rows(self, rows) -> np.ndarray:
+        """Float32 copies of the stored vectors at ``rows``."""
+        block = self.vectors[rows]
+        if self.storage == "int8":
+            return dequantize_int8(block, self.scales[rows])
+        return block.astype(np.float32, copy=False)
+
+    def _scores(self, queries: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        if self.storage == "float32":
+            block = self.vectors[: self.size] if rows is None else self.vectors[rows]
+            return queries @ block.T
+
+        count = self.size if rows is None else rows.size
+        scores = np.empty((queries.shape[0], count), dtype=np.float32)
+        for start in range(0, count, self.score_block_rows):
+            stop = min(start + self.score_block_rows, count)
+            block_rows = slice(start, stop) if rows is None else rows[start:stop]
+            scores[:, start:stop] = queries @ self.dequantize_rows(block_rows).T
+        return scores
+
+    def top_k(
+        self,
+        queries: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray] = None,
+        min_similarity: Optional[float] = None,
+        exclude_ids: Optional[Iterable[int]] = None,
+        queries_normalized: bool = False,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Answer a batch of top-k queries with a single matrix multiplication.
+
+        Args:
+            queries: ``(q, dim)`` or ``(dim,)`` query vectors
+            k: Number of neighbours per query
+            rows: Optional subset of row indices to search
+            min_similarity: Drop results scoring below this threshold
+            exclude_ids: IDs never returned (e.g. the query item itself)
+            queries_normalized: Skip normalizing the queries
+
+        Returns:
+            One list of ``(id, similarity)`` pairs per query, best first
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+
+        if queries_normalized:
+            valid = np.ones(queries.shape[0], dtype=bool)
+        else:
+            queries, valid = normalize_rows(queries)
+
+        results: List[List[Tuple[int, float]]] = [[] for _ in range(queries.shape[0])]
+        if k <= 0 or not self.row_of or queries.shape[1] != self.dim:
+            return results
+
+        if rows is None:
+            # Contiguous view: tombstoned rows are zero vectors and masked below.
+            candidate_ids = self.ids[: self.size]
+        else:
+            if rows.size == 0:
+                return results
+            candidate_ids = self.ids[rows]
+        scores = self._scores(queries, rows)
+
+        mask = candidate_ids < 0
+        if exclude_ids is not None:
+            mask |= np.isin(candidate_ids, np.fromiter(exclude_ids, dtype=np.int64))
+        if mask.any():
+            scores[:, mask] = -np.inf
+
+        n = scores.shape[1]
+        k = min(k, n)
+        if k < n:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), (scores.shape[0], n))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        threshold = -np.inf if min_similarity is None else min_similarity
+        for query_index in np.nonzero(valid)[0]:
+            results[query_index] = [
+                (int(candidate_ids[column]), float(score))
+                for column, score in zip(top[query_index], top_scores[query_index])
+                if np.isfinite(score) and score >= threshold
+            ]
+        return results
@@ -0,0 +1,149 @@
+"""
+Batch duplicate checks for article ingestion.
+
+Scraped URLs are matched on their canonical form (``app.db.urls``) so the
+same story shared with different ``utm_*`` tags is only processed once. A
+bounded in-process map of recently seen URL hashes answers repeated URLs
+without a query; everything else is checked with one ``IN`` query per batch
+before any Gemini or embedding work.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+QUERY_BATCH_SIZE = 500
+
+
+def url_hash(canonical_url: str) -> bytes:
+    """Compact 16-byte key of a canonical URL."""
+
+    return hashlib.blake2b(canonical_url.encode("utf-8"), digest_size=16).digest()
+
+
+class RecentUrlCache:
+    """Thread-safe LRU map of recently seen URL hashes to article IDs."""
+
+    def __init__(self, max_size: int = 50000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, canonical_url: str) -> Optional[int]:
+        key = url_hash(canonical_url)
+        with self._lock:
+            article_id = self._entries.get(key)
+            if article_id is not None:
+                self._entries.move_to_end(key)
+            return article_id
+
+    def add(self, canonical_url: str, article_id: int) -> None:
+        if self.max_size <= 0:
+            return
+        key = url_hash(canonical_url)
+        with self._lock:
+            self._entries[key] = article_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def find_existing_articles(
+    db: Session, urls: Iterable[Optional[str]], cache: Optional[RecentUrlCache] = None
+) -> Dict[str, int]:
+    """
+    Find already stored articles for a batch of scraped URLs.
+
+    Args:
+        db: Database session
+        urls: Candidate URLs as scraped
+        cache: Recently seen URLs (the process-wide cache when None)
+
+    Returns:
+        Mapping of canonical URL to article ID for URLs that are already stored
+    """
+    cache = cache if cache is not None else get_recent_urls()
+    raw_urls: Dict[str, List[str]] = {}
+    for url in urls:
+        canonical = canonicalize_url(url)
+        if canonical:
+            raw_urls.setdefault(canonical, []).append(url.strip())
+    canonical_urls = list(raw_urls)
+
+    existing: Dict[str, int] = {}
+    unknown: List[str] = []
+    for canonical in canonical_urls:
+        article_id = cache.get(canonical)
+        if article_id is None:
+            unknown.append(canonical)
+        else:
+            existing[canonical] = article_id
+
+    from app.models.models import Article  # Avoid circular import
+
+    for start in range(0, len(unknown), QUERY_BATCH_SIZE):
+        batch = unknown[start : start + QUERY_BATCH_SIZE]
+        # source_url also matches rows stored before canonical_url existed
+        source_urls = {url for canonical in batch for url in raw_urls[canonical]}
+        source_urls.update(batch)
+        rows = (
+            db.query(Article.id, Article.source_url, Article.canonical_url)
+            .filter(
+                or_(
+                    Article.canonical_url.in_(batch),
+                    Article.source_url.in_(sorted(source_urls)),
+                )
+            )
+            .all()
+        )
+        for article_id, source_url, canonical_url in rows:
+            canonical = canonical_url or canonicalize_url(source_url)
+            existing[canonical] = article_id
+            cache.add(canonical, article_id)
+
+    if existing:
+        logger.debug(
+            f"{len(existing)} of {len(canonical_urls)} URLs already stored "
+            f"({len(canonical_urls) - len(unknown)} answered from cache)"
+        )
+    return existing
+
+
+def remember_articles(articles: Iterable, cache: Optional[RecentUrlCache] = None) -> None:
+    """Add newly stored articles to the recent URL cache."""
+
+    cache = cache if cache is not None else get_recent_urls()
+    for article in articles:
+        canonical = article.canonical_url or canonicalize_url(article.source_url)
+        if canonical and article.id is not None:
+            cache.add(canonical, article.id)
+
+
+# Global cache instance
+_recent_urls: Optional[RecentUrlCache] = None
+
+
+def get_recent_urls() -> RecentUrlCache:
+    """Get or create the process-wide recent URL cache."""
+    global _recent_urls
+    if _recent_urls is None:
+        _recent_urls = RecentUrlCache(settings.url_dedup_cache_size)
+    return _recent_urls
@@ -0,0 +1,798 @@
+"""
+In-process approximate nearest-neighbour index for embedding search.
+
+Backends:
+1. IVF (inverted file over spherical k-means centroids, pure NumPy)
+2. HNSW (requires the optional ``hnswlib`` package)
+3. Flat (exact brute force, used for small collections)
+4. Snapshot (memory-mapped export plus an in-memory delta, see
+   ``embedding_snapshot``)
+
+The index is built from the ``embedding`` column of a model (articles or
+keywords) and kept current by applying the delta of rows created since the
+last sync, plus explicit ``add`` calls from the ingestion tasks. Rows deleted
+from the table are pruned periodically, and IVF centroids are trained on a
+background thread so no request waits for k-means.
+
+When ``EMBEDDING_COMPACT_MODE`` is ``int8`` or ``float16`` the Flat and IVF
+backends hold compact vectors, are loaded from the ``embedding_compact``
+column, and rescore their top candidates against the float32 embeddings.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.embedding_snapshot import EmbeddingSnapshot, load_snapshot, snapshot_version
+from app.db.quantization import compact_mode, decode_embedding
+from app.services.similarity import (
+    EMBEDDING_DIM,
+    SimilarityEngine,
+    normalize_rows,
+    spherical_kmeans,
+)
+
+# Optional dependency: HNSW graphs are only available when hnswlib is installed.
+try:  # pragma: no cover - simple import guard
+    import hnswlib
+except Exception:  # pragma: no cover
+    hnswlib = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _score_rows(
+    store: SimilarityEngine, query: np.ndarray, rows: Optional[np.ndarray], k: int
+) -> List[Tuple[int, float]]:
+    """Exact cosine scoring of a normalized query against a subset of rows."""
+
+    if rows is not None and rows.size == 0:
+        return []
+    return store.top_k(query, k, rows=rows, queries_normalized=True)[0]
+
+
+class VectorIndex:
+    """Interface shared by all nearest-neighbour backends."""
+
+    name = "base"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def remove(self, ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def indexed_ids(self) -> np.ndarray:
+        """IDs currently searchable."""
+        raise NotImplementedError
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        allowed_ids: Optional[Set[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(id, cosine_similarity)`` pairs, best first."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class FlatIndex(VectorIndex):
+    """Exact search over every stored vector."""
+
+    name = "flat"
+
+    def __init__(self, dim: int = EMBEDDING_DIM, storage: str = "float32"):
+        super().__init__(dim)
+        self.storage = storage
+        self.store = SimilarityEngine(dim, storage=storage)
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        self.store.add(ids, vectors, normalized=True)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        self.store.remove(ids)
+
+    def indexed_ids(self) -> np.ndarray:
+        return np.fromiter(self.store.row_of, dtype=np.int64, count=len(self.store.row_of))
+
+    def search(self, query, k, allowed_ids=None):
+        rows = self.store.rows_for(allowed_ids) if allowed_ids is not None else None
+        return _score_rows(self.store, query, rows, k)
+
+    def __len__(self) -> int:
+        return len(self.store.row_of)
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file index over spherical k-means centroids.
+
+    Until centroids are trained the index answers exactly. Training is not
+    triggered by ``add``; the owner calls ``train`` (``VectorIndexService``
+    does so on a background thread) once ``needs_training`` is set. Once
+    trained, queries only score the vectors assigned to the ``nprobe``
+    closest centroids.
+    """
+
+    name = "ivf"
+    min_points_per_centroid = 39
+    kmeans_iterations = 10
+    max_training_points = 50000
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        nlist: int = 256,
+        nprobe: int = 16,
+        storage: str = "float32",
+    ):
+        super().__init__(dim)
+        self.nlist = max(1, nlist)
+        self.nprobe = max(1, nprobe)
+        self.storage = storage
+        self.store = SimilarityEngine(dim, storage=storage)
+        self.centroids: Optional[np.ndarray] = None
+        self.assignment = np.empty(0, dtype=np.int64)
+        self.lists: List[List[int]] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def needs_training(self) -> bool:
+        return not self.is_trained and len(self) >= self.nlist * self.min_points_per_centroid
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def training_sample(self, seed: int = 0) -> Optional[np.ndarray]:
+        """Copy of the vectors to fit centroids on (None while too few are stored)."""
+
+        rows = self.store.live_rows()
+        if rows.size < self.nlist * self.min_points_per_centroid:
+            return None
+
+        rng = np.random.default_rng(seed)
+        if rows.size > self.max_training_points:
+            rows = rng.choice(rows, self.max_training_points, replace=False)
+        return self.store.dequantize_rows(rows)
+
+    def fit_centroids(self, sample: np.ndarray, seed: int = 0) -> np.ndarray:
+        """Spherical k-means over a training sample (does not touch the index)."""
+
+        return spherical_kmeans(sample, self.nlist, iterations=self.kmeans_iterations, seed=seed)
+
+    def train(self, seed: int = 0) -> None:
+        """Fit centroids on the stored vectors and rebuild the inverted lists."""
+
+        sample = self.training_sample(seed)
+        if sample is not None:
+            self.set_centroids(self.fit_centroids(sample, seed))
+
+    def set_centroids(self, centroids: np.ndarray) -> None:
+        """Install trained centroids and assign every stored vector to a list."""
+
+        rows = self.store.live_rows()
+        self.centroids = centroids
+        self.assignment = np.full(self.store.vectors.shape[0], -1, dtype=np.int64)
+        self.lists = [[] for _ in range(self.nlist)]
+        labels = self._assign(self.store.dequantize_rows(rows))
+        for row, label in zip(rows, labels):
+            self.assignment[row] = label
+            self.lists[label].append(int(row))
+
+        logger.info(f"Trained IVF index with {self.nlist} lists on {rows.size} vectors")
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        rows = self.store.add(ids, vectors, normalized=True)
+
+        if not self.is_trained:
+            return
+
+        if self.assignment.shape[0] < self.store.vectors.shape[0]:
+            grown = np.full(self.store.vectors.shape[0], -1, dtype=np.int64)
+            grown[: self.assignment.shape[0]] = self.assignment
+            self.assignment = grown
+
+        labels = self._assign(vectors)
+        for row, label in zip(rows, labels):
+            previous = self.assignment[row]
+            if previous == label:
+                continue
+            if previous >= 0:
+                self.lists[previous].remove(int(row))
+            self.assignment[row] = label
+            self.lists[label].append(int(row))
+
+    def remove(self, ids: Iterable[int]) -> None:
+        for row in self.store.remove(ids):
+            if self.is_trained and self.assignment[row] >= 0:
+                self.lists[self.assignment[row]].remove(row)
+                self.assignment[row] = -1
+
+    def indexed_ids(self) -> np.ndarray:
+        return np.fromiter(self.store.row_of, dtype=np.int64, count=len(self.store.row_of))
+
+    def search(self, query, k, allowed_ids=None):
+        if allowed_ids is not None:
+            # Pre-filtered candidate sets are scored exactly.
+            return _score_rows(self.store, query, self.store.rows_for(allowed_ids), k)
+
+        if not self.is_trained:
+            return _score_rows(self.store, query, None, k)
+
+        nprobe = min(self.nprobe, self.nlist)
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        rows = [row for probe in probes for row in self.lists[probe]]
+        return _score_rows(self.store, query, np.asarray(rows, dtype=np.int64), k)
+
+    def __len__(self) -> int:
+        return len(self.store.row_of)
+
+
+class HNSWIndex(VectorIndex):
+    """Hierarchical navigable small-world graph backed by hnswlib."""
+
+    name = "hnsw"
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        initial_capacity: int = 10000,
+    ):
+        if hnswlib is None:
+            raise RuntimeError("hnswlib is not installed")
+        super().__init__(dim)
+        self.ef_search = ef_search
+        self.graph = hnswlib.Index(space="cosine", dim=dim)
+        self.graph.init_index(
+            max_elements=initial_capacity,
+            ef_construction=ef_construction,
+            M=m,
+            allow_replace_deleted=True,
+        )
+        self.graph.set_ef(ef_search)
+        self.ids: Set[int] = set()
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        required = len(self.ids | set(ids))
+        capacity = self.graph.get_max_elements()
+        if required > capacity:
+            self.graph.resize_index(max(required, capacity * 2))
+        self.graph.add_items(vectors, np.asarray(ids, dtype=np.int64), replace_deleted=True)
+        self.ids.update(int(item_id) for item_id in ids)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        for item_id in ids:
+            if item_id in self.ids:
+                self.graph.mark_deleted(item_id)
+                self.ids.discard(item_id)
+
+    def indexed_ids(self) -> np.ndarray:
+        return np.fromiter(self.ids, dtype=np.int64, count=len(self.ids))
+
+    def search(self, query, k, allowed_ids=None):
+        if not self.ids:
+            return []
+        if allowed_ids is None:
+            k = min(k, len(self.ids))
+            filter_fn = None
+        else:
+            candidates = self.ids.intersection(allowed_ids)
+            if not candidates:
+                return []
+            # hnswlib raises when fewer than k elements pass the filter
+            k = min(k, len(candidates))
+            filter_fn = candidates.__contains__
+        self.graph.set_ef(max(self.ef_search, k))
+        try:
+            labels, distances = self.graph.knn_query(query, k=k, filter=filter_fn)
+        except RuntimeError:
+            if filter_fn is None:
+                raise
+            # The filtered graph walk can still come up short when the
+            # candidates are poorly connected; score them exactly instead
+            return self._score_exact(query, sorted(candidates), k)
+        return [
+            (int(label), float(1.0 - distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+    def _score_exact(self, query, ids: List[int], k: int) -> List[Tuple[int, float]]:
+        vectors, _ = normalize_rows(np.asarray(self.graph.get_items(ids), dtype=np.float32))
+        scores = vectors @ np.asarray(query, dtype=np.float32).reshape(-1)
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [(ids[row], float(scores[row])) for row in top]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class SnapshotIndex(VectorIndex):
+    """
+    Memory-mapped snapshot for the bulk of the rows plus an in-memory delta.
+
+    Rows indexed after the snapshot go to ``delta``; re-indexed or removed
+    snapshot rows are shadowed by ID so stale copies are never returned.
+    """
+
+    name = "snapshot"
+    score_block_rows = 16384
+
+    def __init__(
+        self,
+        snapshot: EmbeddingSnapshot,
+        delta: VectorIndex,
+        nprobe: int = 16,
+        exact: bool = False,
+    ):
+        super().__init__(snapshot.dim)
+        self.snapshot = snapshot
+        self.delta = delta
+        self.nprobe = nprobe
+        # Exact indexes (flat) scan every snapshot row instead of probing lists
+        self.exact = exact
+        self.storage = snapshot.storage
+        self.shadowed: Set[int] = set()
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        self.shadowed.update(
+            int(item_id) for item_id in ids
+            if item_id <= self.snapshot.max_id and self.snapshot.contains(item_id)
+        )
+        self.delta.add(ids, vectors)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        self.shadowed.update(
+            int(item_id) for item_id in ids if self.snapshot.contains(item_id)
+        )
+        self.delta.remove(ids)
+
+    def indexed_ids(self) -> np.ndarray:
+        ids = np.asarray(self.snapshot.ids)
+        if self.shadowed:
+            ids = ids[~np.isin(ids, np.fromiter(self.shadowed, dtype=np.int64))]
+        return np.union1d(ids, self.delta.indexed_ids())
+
+    def _search_snapshot(self, query, k, allowed_ids) -> List[Tuple[int, float]]:
+        if self.snapshot.count == 0:
+            return []
+        if allowed_ids is not None:
+            rows = self.snapshot.rows_for(allowed_ids)
+        elif self.exact:
+            rows = None
+        else:
+            rows = self.snapshot.probe_rows(query, self.nprobe)
+        total = self.snapshot.count if rows is None else rows.size
+        shadowed = np.fromiter(self.shadowed, dtype=np.int64) if self.shadowed else None
+
+        best_ids = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, total, self.score_block_rows):
+            stop = min(start + self.score_block_rows, total)
+            block_rows = slice(start, stop) if rows is None else rows[start:stop]
+            scores = self.snapshot.dequantize(block_rows) @ query
+            ids = np.asarray(self.snapshot.ids[block_rows])
+            if shadowed is not None:
+                scores[np.isin(ids, shadowed)] = -np.inf
+
+            best_ids = np.concatenate([best_ids, ids])
+            best_scores = np.concatenate([best_scores, scores])
+            if best_scores.size > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_ids, best_scores = best_ids[keep], best_scores[keep]
+
+        return [
+            (int(item_id), float(score))
+            for item_id, score in zip(best_ids, best_scores)
+            if np.isfinite(score)
+        ]
+
+    def search(self, query, k, allowed_ids=None):
+        if k <= 0:
+            return []
+        hits = self._search_snapshot(query, k, allowed_ids)
+        hits.extend(self.delta.search(query, k, allowed_ids=allowed_ids))
+        hits.sort(key=lambda pair: pair[1], reverse=True)
+        return hits[:k]
+
+    def __len__(self) -> int:
+        return self.snapshot.count - len(self.shadowed) + len(self.delta)
+
+
+def create_vector_index(
+    backend: Optional[str] = None,
+    dim: int = EMBEDDING_DIM,
+    storage: Optional[str] = None,
+) -> VectorIndex:
+    """Instantiate the configured index backend, falling back to IVF."""
+
+    backend = (backend or settings.vector_index_backend or "ivf").lower()
+    storage = storage or compact_mode() or "float32"
+
+    if backend == "hnsw":
+        if hnswlib is not None:
+            return HNSWIndex(
+                dim=dim,
+                m=settings.vector_index_hnsw_m,
+                ef_construction=settings.vector_index_hnsw_ef_construction,
+                ef_search=settings.vector_index_hnsw_ef_search,
+            )
+        logger.warning("hnswlib not installed; falling back to IVF vector index")
+        backend = "ivf"
+
+    if backend == "flat":
+        return FlatIndex(dim=dim, storage=storage)
+
+    if backend != "ivf":
+        logger.warning(f"Unknown vector index backend '{backend}'; using IVF")
+
+    return IVFIndex(
+        dim=dim,
+        nlist=settings.vector_index_nlist,
+        nprobe=settings.vector_index_nprobe,
+        storage=storage,
+    )
+
+
+class VectorIndexService:
+    """
+    Keeps a nearest-neighbour index in sync with a model's embedding column.
+
+    The index is loaded lazily on first use. Afterwards, ``sync`` only reads
+    rows whose primary key is greater than the last one indexed, so workers
+    pick up newly ingested rows without rescanning the table. Every
+    ``vector_index_prune_seconds`` it also compares the indexed IDs with the
+    table's IDs and removes rows deleted since, and it starts IVF training
+    on a background thread once enough vectors are indexed.
+    """
+
+    sync_batch_size = 2000
+
+    def __init__(self, model, backend: Optional[str] = None, dim: int = EMBEDDING_DIM):
+        self.model = model
+        self.backend = backend
+        self.dim = dim
+        self.index = create_vector_index(backend, dim)
+        self.last_indexed_id = 0
+        self.last_synced_at = 0.0
+        self.last_pruned_at = 0.0
+        self.snapshot_version: Optional[str] = None
+        self._snapshot_checked = False
+        self._lock = threading.RLock()
+        self._training: Optional[threading.Thread] = None
+
+    @property
+    def compact(self) -> bool:
+        """True when the index holds quantized vectors and results are rescored."""
+        return getattr(self.index, "storage", "float32") != "float32"
+
+    def _prepare(
+        self, ids: Sequence[int], embeddings: Sequence[Sequence[float]]
+    ) -> Tuple[List[int], np.ndarray]:
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        normalized, valid = normalize_rows(vectors)
+        kept_ids = [int(item_id) for item_id, ok in zip(ids, valid) if ok]
+        return kept_ids, normalized[valid]
+
+    def add(self, item_id: int, embedding: Optional[Sequence[float]]) -> None:
+        """Index (or re-index) a single row, e.g. right after ingestion."""
+
+        self.add_many([item_id], [embedding])
+
+    def add_many(
+        self, ids: Sequence[int], embeddings: Sequence[Optional[Sequence[float]]]
+    ) -> int:
+        pairs = [
+            (item_id, embedding)
+            for item_id, embedding in zip(ids, embeddings)
+            if embedding is not None and len(embedding) == self.dim
+        ]
+        if not pairs:
+            return 0
+
+        kept_ids, vectors = self._prepare(*zip(*pairs))
+        if not kept_ids:
+            return 0
+
+        with self._lock:
+            self.index.add(kept_ids, vectors)
+            self.last_indexed_id = max(self.last_indexed_id, max(kept_ids))
+        return len(kept_ids)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self.index.remove(list(ids))
+
+    def load_snapshot(self) -> bool:
+        """
+        Start from the memory-mapped snapshot of this table, if one exists.
+
+        Only rows created after the snapshot are then read by ``sync``, which
+        also calls this again when a newer snapshot has been exported.
+        """
+        snapshot = load_snapshot(self.model.__tablename__)
+        if snapshot is None or snapshot.dim != self.dim:
+            return False
+
+        with self._lock:
+            self.index = SnapshotIndex(
+                snapshot,
+                create_vector_index(self.backend, self.dim, storage=snapshot.storage),
+                nprobe=settings.vector_index_nprobe,
+                exact=(self.backend or settings.vector_index_backend) == "flat",
+            )
+            self.last_indexed_id = snapshot.max_id
+            self.last_synced_at = 0.0
+            self.snapshot_version = snapshot.version
+            self._snapshot_checked = True
+
+        logger.info(
+            f"Mapped {self.model.__tablename__} embedding snapshot v{snapshot.version} "
+            f"({snapshot.count} vectors, up to id {snapshot.max_id})"
+        )
+        return True
+
+    def sync(self, db, force: bool = False) -> int:
+        """Index rows created since the last sync; returns the number added."""
+
+        if not self._snapshot_checked:
+            self._snapshot_checked = True
+            if self.last_indexed_id == 0 and settings.vector_snapshot_dir:
+                self.load_snapshot()
+
+        now = time.monotonic()
+        if (
+            not force
+            and self.last_synced_at
+            and now - self.last_synced_at < settings.vector_index_refresh_seconds
+        ):
+            return 0
+
+        if self.snapshot_version is not None and self._newer_snapshot_exported():
+            # Remap so the delta (and its memory) shrinks back to the rows
+            # ingested after the new export
+            self.load_snapshot()
+
+        added = 0
+        with self._lock:
+            while True:
+                rows = self._fetch_delta(db)
+                if not rows:
+                    break
+
+                added += self.add_many([row[0] for row in rows], [row[1] for row in rows])
+                # Advance past rows that carried no usable embedding as well.
+                self.last_indexed_id = max(self.last_indexed_id, rows[-1][0])
+
+                if len(rows) < self.sync_batch_size:
+                    break
+
+            self.last_synced_at = now
+
+            if force or now - self.last_pruned_at >= settings.vector_index_prune_seconds:
+                self.prune(db)
+                self.last_pruned_at = now
+
+        if added:
+            logger.info(
+                f"Indexed {added} new {self.model.__tablename__} embeddings "
+                f"(total={len(self.index)})"
+            )
+        self._start_training()
+        return added
+
+    def _newer_snapshot_exported(self) -> bool:
+        latest = snapshot_version(self.model.__tablename__)
+        # Versions are zero-padded UTC timestamps, so they compare as strings
+        return latest is not None and latest > self.snapshot_version
+
+    def prune(self, db) -> int:
+        """Remove indexed rows that no longer exist in the table; returns the count."""
+
+        with self._lock:
+            indexed = self.index.indexed_ids()
+            if indexed.size == 0:
+                return 0
+            existing = np.fromiter(
+                (
+                    row[0]
+                    for row in db.query(self.model.id)
+                    .filter(self.model.id <= int(indexed.max()))
+                    .yield_per(10000)
+                ),
+                dtype=np.int64,
+            )
+            deleted = indexed[~np.isin(indexed, existing)]
+            if deleted.size:
+                self.index.remove(deleted.tolist())
+                logger.info(
+                    f"Pruned {deleted.size} deleted {self.model.__tablename__} "
+                    f"rows from the vector index"
+                )
+            return int(deleted.size)
+
+    def _ivf_index(self) -> Optional[IVFIndex]:
+        index = self.index.delta if isinstance(self.index, SnapshotIndex) else self.index
+        return index if isinstance(index, IVFIndex) else None
+
+    def _start_training(self) -> None:
+        """Train IVF centroids on a background thread once enough rows are indexed."""
+
+        with self._lock:
+            index = self._ivf_index()
+            if index is None or not index.needs_training:
+                return
+            if self._training is not None and self._training.is_alive():
+                return
+            self._training = threading.Thread(
+                target=self.train_index, name="ivf-train", daemon=True
+            )
+            self._training.start()
+
+    def train_index(self) -> bool:
+        """
+        Fit IVF centroids without blocking searches.
+
+        The training sample is copied under the lock, k-means runs outside
+        it (searches stay exact meanwhile), and the centroids are installed
+        under the lock again.
+        """
+        with self._lock:
+            index = self._ivf_index()
+            if index is None or not index.needs_training:
+                return False
+            sample = index.training_sample()
+        if sample is None:
+            return False
+
+        centroids = index.fit_centroids(sample)
+        with self._lock:
+            # Skip if the index was replaced (rebuild, snapshot) meanwhile
+            if self._ivf_index() is not index or index.is_trained:
+                return False
+            index.set_centroids(centroids)
+        return True
+
+    def _fetch_delta(self, db) -> List[Tuple[int, Optional[Sequence[float]]]]:
+        """Next batch of ``(id, embedding)`` rows after ``last_indexed_id``."""
+
+        if not self.compact:
+            return (
+                db.query(self.model.id, self.model.embedding)
+                .filter(
+                    self.model.id > self.last_indexed_id,
+                    self.model.embedding.isnot(None),
+                )
+                .order_by(self.model.id.asc())
+                .limit(self.sync_batch_size)
+                .all()
+            )
+
+        # Compact blobs are a fraction of the float payload; rows written
+        # before compact storage was enabled fall back to the float column.
+        rows = (
+            db.query(self.model.id, self.model.embedding_compact)
+            .filter(self.model.id > self.last_indexed_id)
+            .order_by(self.model.id.asc())
+            .limit(self.sync_batch_size)
+            .all()
+        )
+        decoded = [(row[0], decode_embedding(row[1], self.dim)) for row in rows]
+        missing = [item_id for item_id, vector in decoded if vector is None]
+        if missing:
+            floats = dict(
+                db.query(self.model.id, self.model.embedding)
+                .filter(self.model.id.in_(missing), self.model.embedding.isnot(None))
+                .all()
+            )
+            decoded = [
+                (item_id, vector if vector is not None else floats.get(item_id))
+                for item_id, vector in decoded
+            ]
+        return decoded
+
+    def rebuild(self, db) -> int:
+        """Discard the current index and rebuild it (snapshot first, then the database)."""
+
+        with self._lock:
+            self.index = create_vector_index(self.backend, self.dim)
+            self.last_indexed_id = 0
+            self.last_synced_at = 0.0
+            self.snapshot_version = None
+            self._snapshot_checked = False
+            return self.sync(db, force=True)
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int,
+        candidate_ids: Optional[Iterable[int]] = None,
+        db=None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the ``k`` most similar rows as ``(id, similarity)`` pairs.
+
+        Args:
+            query_embedding: Query vector
+            k: Maximum number of neighbours
+            candidate_ids: Optional pre-filtered ID set to restrict the search
+            db: Session used to rescore compact-index candidates in float32
+        """
+        if query_embedding is None:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if query.shape[0] != self.dim or not np.isfinite(norm) or norm == 0:
+            return []
+        query = query / norm
+
+        allowed = set(candidate_ids) if candidate_ids is not None else None
+        rescore = self.compact and db is not None
+        fetch_k = k * max(1, settings.vector_rescore_factor) if rescore else k
+        with self._lock:
+            hits = self.index.search(query, fetch_k, allowed_ids=allowed)
+
+        if not rescore or not hits:
+            return hits
+        return self._rescore(db, query, [item_id for item_id, _ in hits], k)
+
+    def _rescore(
+        self, db, query: np.ndarray, ids: List[int], k: int
+    ) -> List[Tuple[int, float]]:
+        """Exact float32 scores for the compact index's top candidates."""
+
+        rows = (
+            db.query(self.model.id, self.model.embedding)
+            .filter(self.model.id.in_(ids))
+            .all()
+        )
+        engine = SimilarityEngine.from_embeddings(
+            [row[1] for row in rows], ids=[row[0] for row in rows], dim=self.dim
+        )
+        return engine.top_k(query, k, queries_normalized=True)[0]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+# Global index instances
+_article_index: Optional[VectorIndexService] = None
+_keyword_index: Optional[VectorIndexService] = None
+
+
+def get_article_index() -> VectorIndexService:
+    """Get or create the global article embedding index."""
+    global _article_index
+    if _article_index is None:
+        from app.models.models import Article
+
+        _article_index = VectorIndexService(Article)
+    return _article_index
+
+
+def get_keyword_index() -> VectorIndexService:
+    """Get or create the global keyword embedding index (exact search)."""
+    global _keyword_index
+    if _keyword_index is None:
+        from app.models.models import Keyword
+
+        _keyword_index = VectorIndexService(Keyword, backend="flat")
+    return _keyword_index
@@ -64,6 +64,10 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.keyword_search.process_keyword_queue",
         "schedule": crontab(minute="*/15"),  # Every 15 minutes
     },
+    "export-embedding-snapshots": {
+        "task": "app.tasks.vector_maintenance.export_embedding_snapshots",
+        "schedule": crontab(hour=5, minute=0),  # Daily at 05:00 UTC
+    },
 }
 
 # Import tasks to register them
@@ -73,4 +77,5 @@ from app.tasks import (
     keyword_management,
     keyword_search,
     backup_tasks,
+    vector_maintenance,
 )  # noqa: F401
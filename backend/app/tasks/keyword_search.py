@@ -12,8 +12,17 @@ from app.database import SessionLocal
 from app.models.models import Article, Keyword, KeywordArticle, KeywordSearchQueue
 from app.services.scraper import scrape_news_sync
 from app.services.sentiment import get_sentiment_analyzer
+from app.services.sentiment_trends import record_article_links
+from app.services.enrichment import enrich_articles
+from app.services.keyword_resolver import link_keywords
+from app.services.url_dedup import (
+    canonicalize_url,
+    find_existing_articles,
+    remember_articles,
+)
 from app.services.keyword_extractor import get_keyword_extractor
 from app.services.embeddings import get_embedding_generator
+from app.services.vector_index import get_article_index
 from app.services.keyword_scheduler import (
     SchedulingCandidate,
     complete_job,
@@ -39,7 +48,8 @@ def search_keyword_immediately(keyword_id: int):
     1. Checks if keyword was searched in last 3 hours
     2. If not, triggers immediate news scraping for this keyword
     3. Updates last_searched timestamp
-    4. Processes and stores found articles
+    4. Links already stored articles, enriches new ones concurrently and
+       stores them
 
     Args:
         keyword_id: ID of the keyword to search for
@@ -108,54 +118,63 @@ def search_keyword_immediately(keyword_id: int):
                 "last_searched": now.isoformat(),
             }
 
-        processed_count = 0
-        skipped_count = 0
+        # Check every candidate URL in one pass before any Gemini/embedding work
+        existing_ids = find_existing_articles(db, [article.url for article in articles])
+        existing_articles = {
+            article.id: article
+            for article in db.query(Article).filter(
+                Article.id.in_(set(existing_ids.values()))
+            )
+        }
+        # Cached IDs of articles deleted since are processed as new
+        existing_ids = {
+            url: article_id
+            for url, article_id in existing_ids.items()
+            if article_id in existing_articles
+        }
 
+        # Link already stored articles to the keyword if not already linked
+        inserted = set()
+        try:
+            inserted = link_keywords(
+                db,
+                [(keyword.id, article_id) for article_id in existing_articles],
+                relevance_score=0.9,  # High relevance for targeted search
+            )
+            record_article_links(
+                db, [(existing_articles[article_id], keyword.id) for _, article_id in inserted]
+            )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to link existing articles: {str(e)}")
+            db.rollback()
+            inserted = set()
+        processed_count = len(inserted)
+        skipped_count = len(existing_articles) - len(inserted)
+
+        seen = set(existing_ids)
+        new_articles = []
         for article_data in articles:
-            try:
-                # Check if article already exists
-                existing = (
-                    db.query(Article).filter_by(source_url=article_data.url).first()
-                )
+            canonical = canonicalize_url(article_data.url)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            new_articles.append(article_data)
 
-                if existing:
-                    # Link to keyword if not already linked
-                    existing_link = (
-                        db.query(KeywordArticle)
-                        .filter_by(keyword_id=keyword.id, article_id=existing.id)
-                        .first()
-                    )
-
-                    if not existing_link:
-                        keyword_article = KeywordArticle(
-                            keyword_id=keyword.id,
-                            article_id=existing.id,
-                            relevance_score=0.9,  # High relevance for targeted search
-                        )
-                        db.add(keyword_article)
-                        db.commit()
-                        processed_count += 1
-                    else:
-                        skipped_count += 1
-                    continue
-
-                # Extract keywords and classify
-                extraction = keyword_extractor.extract_all(
-                    article_data.title, article_data.full_text, use_gemini=True
-                )
+        # Extract keywords, classify and analyze sentiment concurrently
+        prepared = enrich_articles(new_articles, keyword_extractor, sentiment_analyzer)
 
-                # Analyze sentiment
-                sentiment = sentiment_analyzer.analyze_article(
-                    article_data.title,
-                    article_data.full_text,
-                    article_data.source_name,
-                    use_gemini=True,
-                )
-
-                # Generate embedding for full article
-                article_text = f"{article_data.title}. {article_data.summary}"
-                embedding = embedding_generator.generate_embedding(article_text)
+        # Generate embeddings for all new articles in batched encode calls
+        embeddings = embedding_generator.generate_embeddings_batch(
+            [f"{item['data'].title}. {item['data'].summary}" for item in prepared],
+            batch_size=settings.embedding_batch_size,
+        )
 
+        for item, embedding in zip(prepared, embeddings):
+            article_data = item["data"]
+            extraction = item["extraction"]
+            sentiment = item["sentiment"]
+            try:
                 # Create article record
                 article = Article(
                     title=article_data.title,
@@ -188,8 +207,12 @@ def search_keyword_immediately(keyword_id: int):
                     relevance_score=0.95,  # Very high relevance for targeted search
                 )
                 db.add(keyword_article)
+                db.flush()
+                record_article_links(db, [(article, keyword.id)])
 
                 db.commit()
+                remember_articles([article])
+                get_article_index().add(article.id, embedding)
                 processed_count += 1
                 logger.info(f"Processed: {article_data.title[:50]}...")
 
@@ -8,22 +8,33 @@ Scheduled tasks:
 
 import logging
 from datetime import datetime
+from typing import Dict, List, Set, Tuple
 from sqlalchemy.orm import Session
+from app.config import get_settings
 from app.tasks.celery_app import celery_app
 from app.database import SessionLocal
 from app.models.models import (
     Article,
     Keyword,
-    KeywordArticle,
     SourceIngestionHistory,
     NewsSource,
 )
 from app.services.scraper import scrape_news_sync
+from app.services.enrichment import enrich_articles
+from app.services.keyword_resolver import link_keywords, resolve_keywords
 from app.services.sentiment import get_sentiment_analyzer
+from app.services.sentiment_trends import record_article_links
+from app.services.url_dedup import (
+    canonicalize_url,
+    find_existing_articles,
+    remember_articles,
+)
 from app.services.keyword_extractor import get_keyword_extractor
 from app.services.embeddings import get_embedding_generator
+from app.services.vector_index import get_article_index
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 @celery_app.task(name="app.tasks.scraping.scrape_news")
@@ -33,11 +44,11 @@ def scrape_news():
 
     This task:
     1. Scrapes articles from BBC, Reuters, DW, France24
-    2. Extracts keywords and entities
-    3. Analyzes sentiment
-    4. Classifies as fact/opinion
-    5. Generates embeddings
-    6. Stores in database
+    2. Drops articles whose URL is already stored
+    3. Extracts keywords and entities, classifies as fact/opinion and
+       analyzes sentiment for several articles concurrently
+    4. Generates embeddings for all new articles and keywords in batches
+    5. Stores in database
     """
     logger.info("Starting hourly news scraping task...")
 
@@ -47,116 +58,45 @@ def scrape_news():
         sentiment_analyzer = get_sentiment_analyzer()
         keyword_extractor = get_keyword_extractor()
         embedding_generator = get_embedding_generator()
+        article_index = get_article_index()
 
         # Scrape articles
         articles = scrape_news_sync(max_articles=10)  # Limit for testing
         logger.info(f"Scraped {len(articles)} articles")
 
-        processed_count = 0
-        skipped_count = 0
-        ingestion_records = {}
-
-        for article_data in articles:
-            try:
-                # Check if article already exists
-                existing = (
-                    db.query(Article).filter_by(source_url=article_data.url).first()
-                )
-
-                if existing:
-                    logger.debug(
-                        f"Article already exists: {article_data.title[:50]}..."
-                    )
-                    skipped_count += 1
-                    continue
-
-                # Extract keywords and classify
-                extraction = keyword_extractor.extract_all(
-                    article_data.title, article_data.full_text, use_gemini=True
-                )
+        new_articles = _filter_new_articles(db, articles)
+        skipped_count = len(articles) - len(new_articles)
 
-                # Analyze sentiment
-                sentiment = sentiment_analyzer.analyze_article(
-                    article_data.title,
-                    article_data.full_text,
-                    article_data.source_name,
-                    use_gemini=True,
-                )
+        # Extract keywords, classify and analyze sentiment concurrently
+        prepared = enrich_articles(new_articles, keyword_extractor, sentiment_analyzer)
 
-                # Generate embedding for full article
-                article_text = f"{article_data.title}. {article_data.summary}"
-                embedding = embedding_generator.generate_embedding(article_text)
-
-                # Create article record
-                article = Article(
-                    title=article_data.title,
-                    summary=article_data.summary,
-                    full_text=article_data.full_text,
-                    source_url=article_data.url,
-                    source=article_data.source_name,
-                    published_date=article_data.publish_date,
-                    scraped_date=datetime.now(),
-                    language=article_data.language,
-                    classification=extraction["classification"],
-                    credibility_score=extraction["classification_confidence"],
-                    embedding=embedding,
-                    # Sentiment fields
-                    sentiment_overall=sentiment["sentiment_overall"],
-                    sentiment_confidence=sentiment["sentiment_confidence"],
-                    sentiment_subjectivity=sentiment["sentiment_subjectivity"],
-                    emotion_positive=sentiment["emotion_positive"],
-                    emotion_negative=sentiment["emotion_negative"],
-                    emotion_neutral=sentiment["emotion_neutral"],
-                )
+        # Embed every new article of the run in batched encode calls
+        article_embeddings = embedding_generator.generate_embeddings_batch(
+            [f"{item['data'].title}. {item['data'].summary}" for item in prepared],
+            batch_size=settings.embedding_batch_size,
+        )
+        for item, embedding in zip(prepared, article_embeddings):
+            item["embedding"] = embedding
 
-                db.add(article)
-                db.flush()  # Get article ID
-
-                # Process keywords
-                for keyword_text in extraction["keywords"]:
-                    # Find or create keyword
-                    keyword = db.query(Keyword).filter_by(keyword_en=keyword_text).first()
-
-                    if not keyword:
-                        # Generate embedding for keyword
-                        keyword_embedding = embedding_generator.generate_embedding(
-                            keyword_text
-                        )
-
-                        keyword = Keyword(
-                            keyword_en=keyword_text,
-                            category="auto",
-                            popularity_score=1.0,
-                            search_count=0,
-                            embedding=keyword_embedding,
-                        )
-                        db.add(keyword)
-                        db.flush()
-                    else:
-                        # Update popularity
-                        keyword.popularity_score += 0.1
-                        keyword.last_updated = datetime.now()
-
-                    # Link article to keyword
-                    keyword_article = KeywordArticle(
-                        keyword_id=keyword.id,
-                        article_id=article.id,
-                        relevance_score=0.8,  # Could calculate based on frequency
-                    )
-                    db.add(keyword_article)
+        keywords_by_text, new_keyword_ids = _resolve_keywords(
+            db,
+            embedding_generator,
+            [text for item in prepared for text in item["keywords"]],
+        )
 
-                db.commit()
-                processed_count += 1
-                logger.info(f"Processed: {article_data.title[:50]}...")
+        stored = _store_articles(db, prepared, keywords_by_text, new_keyword_ids)
 
-                if article_data.source_name:
-                    ingestion_records.setdefault(article_data.source_name, 0)
-                    ingestion_records[article_data.source_name] += 1
+        remember_articles(article for _, article in stored)
 
-            except Exception as e:
-                logger.error(f"Failed to process article: {str(e)}")
-                db.rollback()
-                continue
+        ingestion_records = {}
+        for item, article in stored:
+            article_index.add(article.id, item["embedding"])
+            logger.info(f"Processed: {item['data'].title[:50]}...")
+            source_name = item["data"].source_name
+            if source_name:
+                ingestion_records.setdefault(source_name, 0)
+                ingestion_records[source_name] += 1
+        processed_count = len(stored)
 
         try:
             for source_name, count in ingestion_records.items():
@@ -196,6 +136,152 @@ def scrape_news():
         db.close()
 
 
+def _filter_new_articles(db: Session, articles: List) -> List:
+    """Drop scraped articles whose canonical URL is already stored (one query per run)."""
+
+    existing = find_existing_articles(db, [article.url for article in articles])
+
+    new_articles = []
+    seen = set()
+    for article in articles:
+        canonical = canonicalize_url(article.url)
+        if canonical in existing or canonical in seen:
+            logger.debug(f"Article already exists: {article.title[:50]}...")
+            continue
+        seen.add(canonical)
+        new_articles.append(article)
+    return new_articles
+
+
+def _resolve_keywords(
+    db: Session, embedding_generator, keyword_texts: List[str]
+) -> Tuple[Dict[str, Keyword], Set[int]]:
+    """
+    Load existing keywords and create missing ones with batched embeddings.
+
+    Concurrent workers creating the same keyword do not conflict; the
+    keyword is returned without being counted as created here.
+
+    Args:
+        db: Database session
+        embedding_generator: Embedding generator
+        keyword_texts: Keyword strings from every article of the run
+
+    Returns:
+        Tuple of (keyword text -> Keyword, IDs of keywords created here)
+    """
+    keywords_by_text, new_ids = resolve_keywords(
+        db,
+        keyword_texts,
+        defaults={"category": "auto", "popularity_score": 1.0, "search_count": 0},
+        embed=lambda texts: embedding_generator.generate_embeddings_batch(
+            texts, batch_size=settings.embedding_batch_size
+        ),
+    )
+    if new_ids:
+        # Keep new keywords even if storing the articles fails below
+        db.commit()
+    return keywords_by_text, new_ids
+
+
+def _store_articles(
+    db: Session,
+    prepared: List[Dict],
+    keywords_by_text: Dict[str, Keyword],
+    new_keyword_ids: Set[int],
+) -> List[Tuple[Dict, Article]]:
+    """
+    Insert prepared articles and keyword links in one transaction.
+
+    Falls back to one transaction per article if the bulk insert fails, so a
+    single bad record does not discard the whole run.
+    """
+    if not prepared:
+        return []
+
+    try:
+        return _insert_article_batch(db, prepared, keywords_by_text, set(new_keyword_ids))
+    except Exception as e:
+        logger.warning(f"Bulk article insert failed, retrying one by one: {e}")
+        db.rollback()
+
+    stored = []
+    unlinked_new = set(new_keyword_ids)
+    for item in prepared:
+        try:
+            pending_new = set(unlinked_new)
+            stored.extend(_insert_article_batch(db, [item], keywords_by_text, pending_new))
+            unlinked_new = pending_new
+        except Exception as e:
+            logger.error(f"Failed to process article: {str(e)}")
+            db.rollback()
+    return stored
+
+
+def _insert_article_batch(
+    db: Session,
+    items: List[Dict],
+    keywords_by_text: Dict[str, Keyword],
+    unlinked_new: Set[int],
+) -> List[Tuple[Dict, Article]]:
+    articles = []
+    for item in items:
+        article_data = item["data"]
+        extraction = item["extraction"]
+        sentiment = item["sentiment"]
+        articles.append(
+            Article(
+                title=article_data.title,
+                summary=article_data.summary,
+                full_text=article_data.full_text,
+                source_url=article_data.url,
+                source=article_data.source_name,
+                published_date=article_data.publish_date,
+                scraped_date=datetime.now(),
+                language=article_data.language,
+                classification=extraction["classification"],
+                credibility_score=extraction["classification_confidence"],
+                embedding=item["embedding"],
+                # Sentiment fields
+                sentiment_overall=sentiment["sentiment_overall"],
+                sentiment_confidence=sentiment["sentiment_confidence"],
+                sentiment_subjectivity=sentiment["sentiment_subjectivity"],
+                emotion_positive=sentiment["emotion_positive"],
+                emotion_negative=sentiment["emotion_negative"],
+                emotion_neutral=sentiment["emotion_neutral"],
+            )
+        )
+
+    db.add_all(articles)
+    db.flush()  # Get article IDs
+
+    links = []
+    for item, article in zip(items, articles):
+        for keyword_text in item["keywords"]:
+            keyword = keywords_by_text.get(keyword_text)
+            if keyword is None:
+                continue
+            if keyword.id in unlinked_new:
+                # New keywords start at 1.0 for their first article
+                unlinked_new.discard(keyword.id)
+            else:
+                keyword.popularity_score += 0.1
+                keyword.last_updated = datetime.now()
+            links.append((keyword.id, article.id))
+
+    # Could calculate relevance based on frequency
+    inserted = link_keywords(db, links, relevance_score=0.8)
+    articles_by_id = {article.id: article for article in articles}
+    linked = [
+        (articles_by_id[article_id], keyword_id)
+        for keyword_id, article_id in links
+        if (keyword_id, article_id) in inserted
+    ]
+    record_article_links(db, linked)
+    db.commit()
+    return list(zip(items, articles))
+
+
 @celery_app.task(name="app.tasks.scraping.process_single_article")
 def process_single_article(article_url: str, article_title: str, article_text: str):
     """
@@ -252,6 +338,7 @@ def process_single_article(article_url: str, article_title: str, article_text: s
 
         db.add(article)
         db.commit()
+        get_article_index().add(article.id, embedding)
 
         return {
             "status": "success",
@@ -267,3 +354,49 @@ def process_single_article(article_url: str, article_title: str, article_text: s
 
     finally:
         db.close()
+
+
+@celery_app.task(name="app.tasks.scraping.backfill_canonical_urls")
+def backfill_canonical_urls(batch_size: int = 1000) -> Dict:
+    """
+    Fill ``canonical_url`` for articles stored before it existed.
+
+    Args:
+        batch_size: Rows updated per transaction
+
+    Returns:
+        Dictionary with the number of rows updated
+    """
+    db = SessionLocal()
+    try:
+        updated = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.query(Article.id, Article.source_url)
+                .filter(Article.id > last_id, Article.canonical_url.is_(None))
+                .order_by(Article.id.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            db.bulk_update_mappings(
+                Article,
+                [{"id": row[0], "canonical_url": canonicalize_url(row[1])} for row in rows],
+            )
+            db.commit()
+            updated += len(rows)
+            last_id = rows[-1][0]
+
+        logger.info(f"Filled canonical URLs for {updated} articles")
+        return {"status": "success", "updated": updated}
+
+    except Exception as e:
+        logger.error(f"Error backfilling canonical URLs: {e}")
+        db.rollback()
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        db.close()
@@ -3,17 +3,32 @@ Celery tasks for sentiment aggregation.
 
 Scheduled tasks:
 - Daily: Aggregate sentiment trends for all keywords
+
+On demand:
+- Range backfills, split into date chunks and run as a Celery group
+- Full rebuild of the per-keyword sentiment rollups
+- VADER re-scoring of the articles table, split into id ranges and followed
+  by a trend backfill and rollup rebuild
 """
 
 import logging
 from datetime import date, datetime, timedelta
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+from celery import chord, group
+from celery.result import GroupResult
 from sqlalchemy import func
+
+from app.config import get_settings
 from app.tasks.celery_app import celery_app
 from app.database import SessionLocal
-from app.models.models import Keyword, Article, KeywordArticle, SentimentTrend
+from app.models.models import Article, Keyword
+from app.services.sentiment_rescoring import article_id_ranges, rescore_articles
+from app.services.sentiment_rollups import rebuild_rollups
+from app.services.sentiment_trends import aggregate_trends, date_chunks
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 def classify_sentiment_category(sentiment_overall: float, confidence: float) -> str:
@@ -49,7 +64,10 @@ def aggregate_daily_sentiment(target_date: str = None):
     Calculate aggregate sentiment metrics for all keywords on a specific date.
 
     This function weights sentiment by confidence to prioritize reliable scores
-    and tracks which sources are most positive/negative.
+    and tracks which sources are most positive/negative. All keywords are
+    aggregated by a single grouped query and written with one bulk upsert.
+    Trends are already kept current at ingest time (see
+    ``record_article_links``), so this run reconciles drift and late edits.
 
     Args:
         target_date: Date to aggregate (format: YYYY-MM-DD). Defaults to yesterday.
@@ -69,125 +87,20 @@ def aggregate_daily_sentiment(target_date: str = None):
 
         logger.info(f"Aggregating sentiment for date: {agg_date}")
 
-        # Get all keywords
-        keywords = db.query(Keyword).all()
-        processed_count = 0
-
-        for keyword in keywords:
-            try:
-                # Get articles for this keyword on this date
-                articles = (
-                    db.query(Article)
-                    .join(KeywordArticle, Article.id == KeywordArticle.article_id)
-                    .filter(
-                        KeywordArticle.keyword_id == keyword.id,
-                        func.date(Article.publish_date) == agg_date,
-                        Article.sentiment_overall.isnot(None),
-                    )
-                    .all()
-                )
-
-                if not articles:
-                    logger.debug(
-                        f"No articles for keyword '{keyword.keyword_en}' on {agg_date}"
-                    )
-                    continue
-
-                # Calculate weighted average sentiment
-                total_weighted_sentiment = 0.0
-                total_weight = 0.0
-                positive_count = 0
-                negative_count = 0
-                neutral_count = 0
-                source_sentiments = {}
-
-                for article in articles:
-                    # Weight by confidence
-                    weight = article.sentiment_confidence or 0.5
-                    total_weighted_sentiment += article.sentiment_overall * weight
-                    total_weight += weight
-
-                    # Count by category
-                    category = classify_sentiment_category(
-                        article.sentiment_overall, article.sentiment_confidence
-                    )
-
-                    if "POSITIVE" in category:
-                        positive_count += 1
-                    elif "NEGATIVE" in category:
-                        negative_count += 1
-                    else:
-                        neutral_count += 1
-
-                    # Track by source
-                    source = article.source_name
-                    if source not in source_sentiments:
-                        source_sentiments[source] = []
-                    source_sentiments[source].append(article.sentiment_overall)
-
-                # Calculate average
-                avg_sentiment = (
-                    total_weighted_sentiment / total_weight if total_weight > 0 else 0.0
-                )
-
-                # Calculate average sentiment per source
-                top_sources = {}
-                for source, scores in source_sentiments.items():
-                    if scores:
-                        top_sources[source] = round(sum(scores) / len(scores), 3)
-
-                # Check if trend already exists for this date
-                existing_trend = (
-                    db.query(SentimentTrend)
-                    .filter_by(keyword_id=keyword.id, date=agg_date)
-                    .first()
-                )
-
-                if existing_trend:
-                    # Update existing
-                    existing_trend.avg_sentiment = avg_sentiment
-                    existing_trend.article_count = len(articles)
-                    existing_trend.positive_count = positive_count
-                    existing_trend.negative_count = negative_count
-                    existing_trend.neutral_count = neutral_count
-                    existing_trend.top_sources = top_sources
-                else:
-                    # Create new trend
-                    trend = SentimentTrend(
-                        keyword_id=keyword.id,
-                        date=agg_date,
-                        avg_sentiment=avg_sentiment,
-                        article_count=len(articles),
-                        positive_count=positive_count,
-                        negative_count=negative_count,
-                        neutral_count=neutral_count,
-                        top_sources=top_sources,
-                    )
-                    db.add(trend)
-
-                db.commit()
-                processed_count += 1
-
-                logger.info(
-                    f"Aggregated sentiment for '{keyword.keyword_en}': "
-                    f"{avg_sentiment:.2f} ({len(articles)} articles)"
-                )
-
-            except Exception as e:
-                logger.error(
-                    f"Failed to aggregate sentiment for keyword {keyword.keyword_en}: {str(e)}"
-                )
-                db.rollback()
-                continue
+        result = aggregate_trends(db, agg_date, agg_date)
+
+        # Reconcile the all-time rollups of the keywords seen that day
+        rebuild_rollups(db, result["keyword_ids"])
+        db.commit()
 
         logger.info(
-            f"Sentiment aggregation completed: {processed_count} keywords processed"
+            f"Sentiment aggregation completed: {result['keywords_processed']} keywords processed"
         )
 
         return {
             "status": "success",
             "date": str(agg_date),
-            "keywords_processed": processed_count,
+            "keywords_processed": result["keywords_processed"],
         }
 
     except Exception as e:
@@ -221,88 +134,13 @@ def aggregate_keyword_sentiment(keyword_id: int, start_date: str, end_date: str)
         if not keyword:
             return {"status": "error", "error": "Keyword not found"}
 
-        # Aggregate for each date in range
-        current_date = start
-        processed_dates = []
-
-        while current_date <= end:
-            # Get articles for this date
-            articles = (
-                db.query(Article)
-                .join(KeywordArticle, Article.id == KeywordArticle.article_id)
-                .filter(
-                    KeywordArticle.keyword_id == keyword_id,
-                    func.date(Article.publish_date) == current_date,
-                    Article.sentiment_overall.isnot(None),
-                )
-                .all()
-            )
-
-            if articles:
-                # Calculate aggregates (similar to daily task)
-                total_weighted = sum(
-                    a.sentiment_overall * (a.sentiment_confidence or 0.5)
-                    for a in articles
-                )
-                total_weight = sum(a.sentiment_confidence or 0.5 for a in articles)
-                avg_sentiment = (
-                    total_weighted / total_weight if total_weight > 0 else 0.0
-                )
-
-                # Count categories
-                positive_count = sum(
-                    1
-                    for a in articles
-                    if classify_sentiment_category(
-                        a.sentiment_overall, a.sentiment_confidence or 0.5
-                    )
-                    in ["POSITIVE", "STRONGLY_POSITIVE"]
-                )
-                negative_count = sum(
-                    1
-                    for a in articles
-                    if classify_sentiment_category(
-                        a.sentiment_overall, a.sentiment_confidence or 0.5
-                    )
-                    in ["NEGATIVE", "STRONGLY_NEGATIVE"]
-                )
-                neutral_count = len(articles) - positive_count - negative_count
-
-                # Update or create trend
-                trend = (
-                    db.query(SentimentTrend)
-                    .filter_by(keyword_id=keyword_id, date=current_date)
-                    .first()
-                )
-
-                if trend:
-                    trend.avg_sentiment = avg_sentiment
-                    trend.article_count = len(articles)
-                    trend.positive_count = positive_count
-                    trend.negative_count = negative_count
-                    trend.neutral_count = neutral_count
-                else:
-                    trend = SentimentTrend(
-                        keyword_id=keyword_id,
-                        date=current_date,
-                        avg_sentiment=avg_sentiment,
-                        article_count=len(articles),
-                        positive_count=positive_count,
-                        negative_count=negative_count,
-                        neutral_count=neutral_count,
-                    )
-                    db.add(trend)
-
-                processed_dates.append(str(current_date))
-
-            current_date += timedelta(days=1)
-
-        db.commit()
+        # One grouped scan over the whole range
+        result = aggregate_trends(db, start, end, [keyword_id])
 
         return {
             "status": "success",
             "keyword": keyword.keyword_en,
-            "dates_processed": processed_dates,
+            "dates_processed": result["dates"],
         }
 
     except Exception as e:
@@ -312,3 +150,276 @@ def aggregate_keyword_sentiment(keyword_id: int, start_date: str, end_date: str)
 
     finally:
         db.close()
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.rebuild_sentiment_rollups")
+def rebuild_sentiment_rollups(keyword_ids: Optional[List[int]] = None):
+    """
+    Recompute per-keyword sentiment rollups from the articles.
+
+    Args:
+        keyword_ids: Keywords to rebuild (all keywords when omitted)
+
+    Returns:
+        Dict with the number of rollup rows written
+    """
+    db = SessionLocal()
+    try:
+        written = rebuild_rollups(db, keyword_ids)
+        db.commit()
+        logger.info(f"Rebuilt {written} keyword sentiment rollups")
+        return {"status": "success", "rollups_written": written}
+
+    except Exception as e:
+        logger.error(f"Keyword sentiment rollup rebuild failed: {e}")
+        db.rollback()
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.aggregate_sentiment_range")
+def aggregate_sentiment_range(
+    start_date: str, end_date: str, keyword_ids: Optional[List[int]] = None
+):
+    """
+    Aggregate one chunk of a backfill (all days of the range in one scan).
+
+    Args:
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        keyword_ids: Restrict to these keywords (all keywords when omitted)
+
+    Returns:
+        Dict with aggregation results
+    """
+    db = SessionLocal()
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        result = aggregate_trends(db, start, end, keyword_ids)
+        return {
+            "status": "success",
+            "start_date": start_date,
+            "end_date": end_date,
+            "trends_written": result["trends_written"],
+            "keywords_processed": result["keywords_processed"],
+        }
+
+    except Exception as e:
+        logger.error(f"Sentiment range aggregation {start_date}..{end_date} failed: {e}")
+        db.rollback()
+        return {
+            "status": "error",
+            "start_date": start_date,
+            "end_date": end_date,
+            "error": str(e),
+        }
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.backfill_sentiment_trends")
+def backfill_sentiment_trends(
+    start_date: str,
+    end_date: str,
+    keyword_ids: Optional[List[int]] = None,
+    chunk_days: Optional[int] = None,
+):
+    """
+    Re-aggregate a date range by fanning date chunks out as a Celery group.
+
+    Progress is available through the saved group result (see
+    ``backfill_progress``).
+
+    Args:
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        keyword_ids: Restrict to these keywords (all keywords when omitted)
+        chunk_days: Days per chunk (defaults to ``SENTIMENT_BACKFILL_CHUNK_DAYS``)
+
+    Returns:
+        Dict with the group ID and chunk count
+    """
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        chunks = date_chunks(start, end, chunk_days or settings.sentiment_backfill_chunk_days)
+
+        job = group(
+            aggregate_sentiment_range.s(str(chunk_start), str(chunk_end), keyword_ids)
+            for chunk_start, chunk_end in chunks
+        )
+        result = job.apply_async()
+        result.save()
+
+        logger.info(
+            f"Queued sentiment backfill {start_date}..{end_date} as {len(chunks)} chunks "
+            f"(group {result.id})"
+        )
+        return {"status": "queued", "group_id": result.id, "chunks": len(chunks)}
+
+    except Exception as e:
+        logger.error(f"Failed to queue sentiment backfill: {e}")
+        return {"status": "error", "error": str(e)}
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.rescore_article_range")
+def rescore_article_range(start_id: int, end_id: int, include_gemini: bool = False):
+    """
+    Re-score the sentiment of one id range of articles with VADER.
+
+    Args:
+        start_id: First article id (inclusive)
+        end_id: Last article id (inclusive)
+        include_gemini: Also overwrite Gemini-derived scores
+
+    Returns:
+        Dict with the number of articles re-scored
+    """
+    db = SessionLocal()
+    try:
+        # Celery pool processes cannot fork a scoring pool
+        result = rescore_articles(
+            db, start_id, end_id, workers=1, include_gemini=include_gemini
+        )
+        return {
+            "status": "success",
+            "start_id": start_id,
+            "end_id": end_id,
+            "rescored": result["rescored"],
+        }
+
+    except Exception as e:
+        logger.error(f"Sentiment re-scoring of articles {start_id}..{end_id} failed: {e}")
+        db.rollback()
+        return {"status": "error", "start_id": start_id, "end_id": end_id, "error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.rescore_article_sentiment")
+def rescore_article_sentiment(chunk_size: Optional[int] = None, include_gemini: bool = False):
+    """
+    Re-score articles by fanning id ranges out as a Celery chord.
+
+    Unscored and VADER-scored articles are re-scored; Gemini-derived scores
+    are kept unless ``include_gemini`` is set. Once every range has
+    finished, ``reaggregate_rescored_sentiment`` refreshes trends and rollups.
+
+    Args:
+        chunk_size: Article ids per range (defaults to ``SENTIMENT_RESCORE_BATCH_SIZE``)
+        include_gemini: Also overwrite Gemini-derived scores
+
+    Returns:
+        Dict with the group ID, callback task ID and range count
+    """
+    db = SessionLocal()
+    try:
+        ranges = article_id_ranges(db, chunk_size or settings.sentiment_rescore_batch_size)
+        if not ranges:
+            return {"status": "success", "ranges": 0}
+
+        header = group(
+            rescore_article_range.s(start_id, end_id, include_gemini)
+            for start_id, end_id in ranges
+        )
+        result = chord(header)(reaggregate_rescored_sentiment.s())
+        result.parent.save()
+
+        logger.info(
+            f"Queued sentiment re-scoring as {len(ranges)} ranges (group {result.parent.id})"
+        )
+        return {
+            "status": "queued",
+            "group_id": result.parent.id,
+            "callback_id": result.id,
+            "ranges": len(ranges),
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue sentiment re-scoring: {e}")
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.sentiment_aggregation.reaggregate_rescored_sentiment")
+def reaggregate_rescored_sentiment(results: List[Dict]):
+    """
+    Chord callback of ``rescore_article_sentiment``.
+
+    Re-aggregates the trends of every day with articles and rebuilds the
+    keyword rollups, so they reflect the new scores.
+
+    Args:
+        results: Results of the ``rescore_article_range`` tasks
+
+    Returns:
+        Dict with the number of articles re-scored and the queued task IDs
+    """
+    rescored = sum(item.get("rescored", 0) for item in results if isinstance(item, dict))
+    failed = sum(
+        1 for item in results if not isinstance(item, dict) or item.get("status") == "error"
+    )
+    if failed:
+        logger.warning(f"{failed} sentiment re-scoring ranges failed")
+    if not rescored:
+        return {"status": "success", "rescored": 0, "failed_ranges": failed}
+
+    db = SessionLocal()
+    try:
+        first, last = db.query(
+            func.min(Article.published_date), func.max(Article.published_date)
+        ).one()
+    finally:
+        db.close()
+
+    backfill_id = None
+    if first is not None:
+        backfill_id = backfill_sentiment_trends.delay(str(first.date()), str(last.date())).id
+    rollups_id = rebuild_sentiment_rollups.delay().id
+
+    logger.info(
+        f"Re-scored {rescored} articles; queued trend backfill {backfill_id} "
+        f"and rollup rebuild {rollups_id}"
+    )
+    return {
+        "status": "success",
+        "rescored": rescored,
+        "failed_ranges": failed,
+        "backfill_task_id": backfill_id,
+        "rollup_task_id": rollups_id,
+    }
+
+
+def backfill_progress(group_id: str) -> Optional[Dict]:
+    """
+    Progress of a backfill queued by ``backfill_sentiment_trends``.
+
+    Returns:
+        Dict with completed/total chunk counts, or None for unknown groups
+    """
+    result = GroupResult.restore(group_id, app=celery_app)
+    if result is None:
+        return None
+
+    finished = [child.result for child in result.results if child.ready()]
+    return {
+        "group_id": group_id,
+        "chunks": len(result.results),
+        "completed": len(finished),
+        "ready": result.ready(),
+        "trends_written": sum(
+            item.get("trends_written", 0) for item in finished if isinstance(item, dict)
+        ),
+        "failed_chunks": [
+            f"{item['start_date']}..{item['end_date']}"
+            for item in finished
+            if isinstance(item, dict) and item.get("status") == "error"
+        ],
+    }
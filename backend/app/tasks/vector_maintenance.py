@@ -0,0 +1,150 @@
+"""Vector index maintenance tasks (pgvector indexes, compact embeddings, snapshots)."""
+
+import logging
+from typing import Dict, List, Optional
+
+from app.database import SessionLocal, engine
+from app.models.models import Article, Keyword
+from app.config import get_settings
+from app.services.embedding_snapshot import export_snapshot
+from app.services.pgvector_search import VECTOR_TABLES, rebuild_vector_indexes
+from app.db.quantization import compact_mode, encode_embedding
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@celery_app.task(name="app.tasks.vector_maintenance.rebuild_embedding_indexes")
+def rebuild_embedding_indexes(
+    method: Optional[str] = None,
+    lists: Optional[int] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    tables: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Build or rebuild the embedding indexes on PostgreSQL.
+
+    Args:
+        method: ``hnsw`` or ``ivfflat`` (defaults to ``PGVECTOR_INDEX_METHOD``)
+        lists: IVFFlat list count (derived from row count when omitted)
+        m: HNSW graph degree
+        ef_construction: HNSW build-time candidate list size
+        tables: Tables to index (defaults to articles and keywords)
+
+    Returns:
+        Dictionary with per-table results
+    """
+    try:
+        logger.info(f"Rebuilding embedding indexes (method={method or 'default'})")
+        results = rebuild_vector_indexes(
+            engine,
+            method=method,
+            lists=lists,
+            m=m,
+            ef_construction=ef_construction,
+            tables=tables or VECTOR_TABLES,
+        )
+        return {"status": "success", "tables": results}
+
+    except Exception as e:
+        logger.error(f"Error rebuilding embedding indexes: {e}")
+        return {"status": "error", "error": str(e)}
+
+
+@celery_app.task(name="app.tasks.vector_maintenance.backfill_compact_embeddings")
+def backfill_compact_embeddings(batch_size: int = 1000) -> Dict:
+    """
+    Fill ``embedding_compact`` for rows stored before compact mode was enabled.
+
+    Args:
+        batch_size: Rows updated per transaction
+
+    Returns:
+        Dictionary with the number of rows encoded per table
+    """
+    mode = compact_mode()
+    if mode is None:
+        return {"status": "skipped", "reason": "compact mode disabled"}
+
+    db = SessionLocal()
+    try:
+        updated = {}
+        for model in (Article, Keyword):
+            count = 0
+            last_id = 0
+            while True:
+                rows = (
+                    db.query(model.id, model.embedding)
+                    .filter(
+                        model.id > last_id,
+                        model.embedding.isnot(None),
+                        model.embedding_compact.is_(None),
+                    )
+                    .order_by(model.id.asc())
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+
+                db.bulk_update_mappings(
+                    model,
+                    [
+                        {"id": row[0], "embedding_compact": encode_embedding(row[1], mode)}
+                        for row in rows
+                    ],
+                )
+                db.commit()
+                count += len(rows)
+                last_id = rows[-1][0]
+
+            updated[model.__tablename__] = count
+            logger.info(f"Encoded {count} compact {model.__tablename__} embeddings")
+
+        return {"status": "success", "mode": mode, "updated": updated}
+
+    except Exception as e:
+        logger.error(f"Error backfilling compact embeddings: {e}")
+        db.rollback()
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.vector_maintenance.export_embedding_snapshots")
+def export_embedding_snapshots() -> Dict:
+    """
+    Export article and keyword embeddings to memory-mapped snapshot files.
+
+    Search workers map the newest snapshot on startup and only read rows
+    ingested after it from the database.
+
+    Returns:
+        Dictionary with the exported version and row count per table
+    """
+    if not settings.vector_snapshot_dir:
+        return {"status": "skipped", "reason": "VECTOR_SNAPSHOT_DIR not configured"}
+
+    db = SessionLocal()
+    try:
+        exported = {}
+        for model in (Article, Keyword):
+            # The keyword index is exact (duplicate detection), so its
+            # snapshot is not IVF-partitioned
+            manifest = export_snapshot(db, model, nlist=1 if model is Keyword else None)
+            exported[model.__tablename__] = {
+                "version": manifest["version"],
+                "count": manifest["count"],
+                "max_id": manifest["max_id"],
+            }
+        return {"status": "success", "snapshots": exported}
+
+    except Exception as e:
+        logger.error(f"Error exporting embedding snapshots: {e}")
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        db.close()
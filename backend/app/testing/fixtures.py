@@ -12,6 +12,7 @@ from sqlalchemy.pool import StaticPool
 
 from app.database import Base, get_db
 from app.main import app
+from app.services.url_dedup import get_recent_urls
 
 
 @pytest.fixture(scope="session")
@@ -69,6 +70,8 @@ def db_session(engine) -> Generator:
         session.close()
         transaction.rollback()
         connection.close()
+        # Rolled-back articles must not be reported as already stored
+        get_recent_urls().clear()
 
 
 @pytest.fixture(scope="function")
@@ -278,6 +278,18 @@ def test_get_article_sentiment_details(client, sample_article):
     assert "sentiment" in data
     assert data["sentiment"]["overall"] == 0.75
     assert data["sentiment"]["classification"] == "POSITIVE"
+    assert "sentences" not in data
+
+
+def test_get_article_sentiment_sentence_breakdown(client, sample_article):
+    """Test the per-sentence breakdown of article sentiment."""
+    response = client.get(
+        f"/api/sentiment/articles/{sample_article.id}/sentiment", params={"sentences": True}
+    )
+    assert response.status_code == 200
+    sentences = response.json()["sentences"]
+    assert [s["text"] for s in sentences] == [sample_article.full_text]
+    assert {"overall", "positive", "negative", "neutral"} <= set(sentences[0])
 
 
 # ==================== Suggestion Endpoints Tests ====================
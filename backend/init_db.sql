@@ -24,6 +24,7 @@ CREATE TABLE IF NOT EXISTS keywords (
     next_search_after TIMESTAMP,
     search_priority INT DEFAULT 0,
     embedding vector(384),  -- for semantic search with Sentence Transformers
+    embedding_compact BYTEA,  -- int8/float16 copy (EMBEDDING_COMPACT_MODE)
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
@@ -35,6 +36,7 @@ CREATE TABLE IF NOT EXISTS articles (
     summary TEXT,
     full_text TEXT,
     source_url TEXT UNIQUE NOT NULL,
+    canonical_url TEXT,  -- source_url without tracking params (dedup)
     source VARCHAR(255),
     published_date TIMESTAMP,
     scraped_date TIMESTAMP DEFAULT NOW(),
@@ -43,6 +45,7 @@ CREATE TABLE IF NOT EXISTS articles (
     sentiment_classification VARCHAR(20),
     credibility_score FLOAT DEFAULT 0.5,
     embedding vector(384),
+    embedding_compact BYTEA,  -- int8/float16 copy (EMBEDDING_COMPACT_MODE)
 
     -- Sentiment fields
     sentiment_overall FLOAT,  -- -1.0 to 1.0
@@ -50,7 +53,10 @@ CREATE TABLE IF NOT EXISTS articles (
     sentiment_subjectivity FLOAT,  -- 0.0 to 1.0
     emotion_positive FLOAT,  -- 0.0 to 1.0
     emotion_negative FLOAT,  -- 0.0 to 1.0
-    emotion_neutral FLOAT  -- 0.0 to 1.0
+    emotion_neutral FLOAT,  -- 0.0 to 1.0
+
+    -- Full-text search (maintained by trg_articles_search_vector)
+    search_vector tsvector
 );
 
 -- Junction table for many-to-many relationship between keywords and articles
@@ -114,9 +120,28 @@ CREATE TABLE IF NOT EXISTS sentiment_trends (
     negative_count INT,
     neutral_count INT,
     top_sources JSONB,  -- Which sources were most positive/negative
+    weighted_sum FLOAT,  -- sum(sentiment * confidence weight), for incremental updates
+    weight_total FLOAT,  -- sum(confidence weight)
+    source_stats JSONB,  -- source -> [sentiment sum, article count]
     UNIQUE(keyword_id, date)
 );
 
+-- All-time sentiment totals per keyword (maintained at ingest time)
+CREATE TABLE IF NOT EXISTS keyword_sentiment_rollups (
+    keyword_id INT PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    article_count INT NOT NULL DEFAULT 0,
+    sentiment_sum FLOAT NOT NULL DEFAULT 0,
+    strongly_positive_count INT NOT NULL DEFAULT 0,
+    positive_count INT NOT NULL DEFAULT 0,
+    neutral_count INT NOT NULL DEFAULT 0,
+    negative_count INT NOT NULL DEFAULT 0,
+    strongly_negative_count INT NOT NULL DEFAULT 0,
+    score_positive_count INT NOT NULL DEFAULT 0,  -- sentiment_overall > 0.2
+    score_negative_count INT NOT NULL DEFAULT 0,  -- sentiment_overall < -0.2
+    source_stats JSONB,  -- source -> [sentiment sum, article count]
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 -- Comparative sentiment analysis (Thailand vs. others)
 CREATE TABLE IF NOT EXISTS comparative_sentiment (
     id SERIAL PRIMARY KEY,
@@ -138,16 +163,21 @@ CREATE INDEX IF NOT EXISTS idx_articles_sentiment ON articles(sentiment_overall)
 CREATE INDEX IF NOT EXISTS idx_sentiment_trends_date ON sentiment_trends(date DESC);
 CREATE INDEX IF NOT EXISTS idx_sentiment_trends_keyword ON sentiment_trends(keyword_id, date DESC);
 CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles(canonical_url);
 CREATE INDEX IF NOT EXISTS idx_articles_classification ON articles(classification);
 CREATE INDEX IF NOT EXISTS idx_keyword_articles_keyword ON keyword_articles(keyword_id);
 CREATE INDEX IF NOT EXISTS idx_keyword_articles_article ON keyword_articles(article_id);
 CREATE INDEX IF NOT EXISTS idx_keyword_suggestions_keyword_en ON keyword_suggestions(keyword_en);
 CREATE INDEX IF NOT EXISTS idx_keyword_suggestions_status ON keyword_suggestions(status);
 
--- Vector similarity indexes (IVFFlat for faster similarity search)
--- Note: These will be created after data is inserted
--- CREATE INDEX idx_articles_embedding ON articles USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
--- CREATE INDEX idx_keywords_embedding ON keywords USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50);
+-- Vector similarity indexes (HNSW; rebuild with IVFFlat or other parameters
+-- through POST /admin/vector-indexes/rebuild)
+CREATE INDEX IF NOT EXISTS idx_articles_embedding_hnsw
+    ON articles USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS idx_keywords_embedding_hnsw
+    ON keywords USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
 
 -- Insert sample data for Thailand keyword
 INSERT INTO keywords (keyword_en, keyword_th, category, popularity_score)
@@ -175,6 +205,41 @@ CREATE TRIGGER keyword_suggestions_update_timestamp
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at();
 
+-- Text search configuration per article language
+CREATE OR REPLACE FUNCTION article_search_config(lang TEXT)
+RETURNS regconfig AS $$
+    SELECT CASE lower(coalesce(lang, ''))
+        WHEN 'en' THEN 'english'::regconfig
+        WHEN 'de' THEN 'german'::regconfig
+        WHEN 'fr' THEN 'french'::regconfig
+        WHEN 'es' THEN 'spanish'::regconfig
+        WHEN 'it' THEN 'italian'::regconfig
+        WHEN 'nl' THEN 'dutch'::regconfig
+        WHEN 'sv' THEN 'swedish'::regconfig
+        WHEN 'da' THEN 'danish'::regconfig
+        ELSE 'simple'::regconfig
+    END;
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Keep articles.search_vector in sync (title A, summary B, body C)
+CREATE OR REPLACE FUNCTION articles_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector(article_search_config(NEW.language), coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector(article_search_config(NEW.language), coalesce(NEW.summary, '')), 'B') ||
+        setweight(to_tsvector(article_search_config(NEW.language), left(coalesce(NEW.full_text, ''), 100000)), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_articles_search_vector
+    BEFORE INSERT OR UPDATE OF title, summary, full_text, language ON articles
+    FOR EACH ROW
+    EXECUTE FUNCTION articles_search_vector_update();
+
+CREATE INDEX IF NOT EXISTS idx_articles_search_vector ON articles USING GIN (search_vector);
+
 -- View for sentiment summary by keyword
 CREATE OR REPLACE VIEW keyword_sentiment_summary AS
 SELECT
@@ -0,0 +1,24 @@
+-- Migration: approximate nearest-neighbour indexes for embedding search
+--
+-- Semantic search orders by `embedding <=> :query` (cosine distance) with a
+-- LIMIT, which PostgreSQL serves from these indexes. HNSW is the default;
+-- rebuild with IVFFlat or different parameters through
+-- POST /admin/vector-indexes/rebuild (runs CREATE INDEX CONCURRENTLY).
+--
+-- Query-time recall is tuned per transaction:
+--   SET LOCAL hnsw.ef_search = 40;   -- PGVECTOR_HNSW_EF_SEARCH, raised to the LIMIT
+--   SET LOCAL ivfflat.probes = 10;   -- PGVECTOR_IVFFLAT_PROBES
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE INDEX IF NOT EXISTS idx_articles_embedding_hnsw
+    ON articles USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX IF NOT EXISTS idx_keywords_embedding_hnsw
+    ON keywords USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+COMMIT;
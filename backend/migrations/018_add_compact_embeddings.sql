@@ -0,0 +1,17 @@
+-- Migration: compact (int8 / float16) embedding copies
+--
+-- Written alongside `embedding` when EMBEDDING_COMPACT_MODE is int8 or
+-- float16. The in-process vector index loads these blobs (4-8x smaller than
+-- the float vectors) and rescores its top candidates against `embedding`.
+-- Existing rows are filled by the
+-- app.tasks.vector_maintenance.backfill_compact_embeddings task.
+
+BEGIN;
+
+ALTER TABLE articles
+    ADD COLUMN IF NOT EXISTS embedding_compact BYTEA;
+
+ALTER TABLE keywords
+    ADD COLUMN IF NOT EXISTS embedding_compact BYTEA;
+
+COMMIT;
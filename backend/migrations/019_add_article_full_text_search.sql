@@ -0,0 +1,50 @@
+-- Migration: full-text search for /api/search/articles
+--
+-- articles.search_vector holds title (weight A), summary (B) and body (C),
+-- stemmed with the text search configuration matching the article language.
+-- A trigger keeps it current; a GIN index serves `search_vector @@ tsquery`.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION article_search_config(lang TEXT)
+RETURNS regconfig AS $$
+    SELECT CASE lower(coalesce(lang, ''))
+        WHEN 'en' THEN 'english'::regconfig
+        WHEN 'de' THEN 'german'::regconfig
+        WHEN 'fr' THEN 'french'::regconfig
+        WHEN 'es' THEN 'spanish'::regconfig
+        WHEN 'it' THEN 'italian'::regconfig
+        WHEN 'nl' THEN 'dutch'::regconfig
+        WHEN 'sv' THEN 'swedish'::regconfig
+        WHEN 'da' THEN 'danish'::regconfig
+        ELSE 'simple'::regconfig
+    END;
+$$ LANGUAGE SQL IMMUTABLE;
+
+ALTER TABLE articles
+    ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION articles_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector(article_search_config(NEW.language), coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector(article_search_config(NEW.language), coalesce(NEW.summary, '')), 'B') ||
+        -- tsvector values are capped at 1MB; long bodies are truncated
+        setweight(to_tsvector(article_search_config(NEW.language), left(coalesce(NEW.full_text, ''), 100000)), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_articles_search_vector ON articles;
+CREATE TRIGGER trg_articles_search_vector
+    BEFORE INSERT OR UPDATE OF title, summary, full_text, language ON articles
+    FOR EACH ROW EXECUTE FUNCTION articles_search_vector_update();
+
+-- Backfill existing rows (fires the trigger)
+UPDATE articles SET title = title;
+
+CREATE INDEX IF NOT EXISTS idx_articles_search_vector
+    ON articles USING GIN (search_vector);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Migration: running sums on sentiment_trends
+--
+-- Scraping and keyword-search tasks now add each stored article to its
+-- (keyword_id, date) trend row as it is committed. These columns hold the
+-- sums needed to update avg_sentiment and top_sources in place. Rows written
+-- before this migration have NULL sums and are recomputed from the articles
+-- the first time they are touched; the nightly aggregate_daily_sentiment run
+-- rewrites them as well.
+
+BEGIN;
+
+ALTER TABLE sentiment_trends
+    ADD COLUMN IF NOT EXISTS weighted_sum FLOAT,
+    ADD COLUMN IF NOT EXISTS weight_total FLOAT,
+    ADD COLUMN IF NOT EXISTS source_stats JSONB;
+
+COMMIT;
@@ -0,0 +1,27 @@
+-- Migration: per-keyword sentiment rollups
+--
+-- Read by GET /api/sentiment/keywords/{id}/sentiment and
+-- /api/sentiment/keywords/compare instead of loading every linked article.
+-- Rows are updated in place by the scraping and keyword-search tasks and
+-- reconciled by aggregate_daily_sentiment. Populate existing keywords with
+-- the app.tasks.sentiment_aggregation.rebuild_sentiment_rollups task; until
+-- then the endpoints compute missing rollups on the fly.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS keyword_sentiment_rollups (
+    keyword_id INT PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    article_count INT NOT NULL DEFAULT 0,
+    sentiment_sum FLOAT NOT NULL DEFAULT 0,
+    strongly_positive_count INT NOT NULL DEFAULT 0,
+    positive_count INT NOT NULL DEFAULT 0,
+    neutral_count INT NOT NULL DEFAULT 0,
+    negative_count INT NOT NULL DEFAULT 0,
+    strongly_negative_count INT NOT NULL DEFAULT 0,
+    score_positive_count INT NOT NULL DEFAULT 0,
+    score_negative_count INT NOT NULL DEFAULT 0,
+    source_stats JSONB,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMIT;
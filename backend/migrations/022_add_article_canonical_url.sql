@@ -0,0 +1,17 @@
+-- Migration: canonical article URLs for duplicate detection
+--
+-- `canonical_url` is `source_url` with tracking parameters, fragments and
+-- trailing slashes removed. Scraping and keyword searches check a whole
+-- batch of candidate URLs against it in one query before doing any Gemini
+-- or embedding work. Existing rows are filled by the
+-- app.tasks.scraping.backfill_canonical_urls task; until then they are
+-- still matched on `source_url`.
+
+BEGIN;
+
+ALTER TABLE articles
+    ADD COLUMN IF NOT EXISTS canonical_url TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles(canonical_url);
+
+COMMIT;
@@ -2,8 +2,19 @@ from types import SimpleNamespace
 from datetime import datetime
 
 import pytest
+from sqlalchemy import event
 
-from app.api.search import _resolve_article_sort, _serialize_article_payload
+from app.api.search import (
+    _article_keywords,
+    _resolve_article_sort,
+    _serialize_article_payload,
+)
+from app.models.models import Article, Keyword, KeywordArticle
+from app.services.full_text import (
+    build_full_text_match,
+    ensure_full_text_index,
+    fts5_match_expression,
+)
 
 
 def test_resolve_article_sort_relevance_prefers_title_matches():
@@ -29,3 +40,89 @@ def test_serialize_article_payload_includes_keywords():
     assert payload["keywords"] == ["climate"]
     assert payload["similarity_score"] == pytest.approx(0.92, rel=1e-3)
 
+
+def _add_article(db_session, title, summary, full_text, url):
+    article = Article(
+        title=title,
+        summary=summary,
+        full_text=full_text,
+        source="Reuters",
+        source_url=url,
+        published_date=datetime(2025, 1, 1, 12, 0, 0),
+        language="en",
+    )
+    db_session.add(article)
+    db_session.flush()
+    return article
+
+
+def test_full_text_search_stems_ranks_and_highlights(db_session):
+    assert ensure_full_text_index(db_session.connection()) is True
+
+    body_hit = _add_article(
+        db_session,
+        "Budget talks",
+        "Ministers met in Brussels",
+        "Negotiators discussed farming subsidies at length.",
+        "https://example.com/body",
+    )
+    title_hit = _add_article(
+        db_session,
+        "Farmers protest subsidies",
+        "Tractors block roads",
+        "Protests continued.",
+        "https://example.com/title",
+    )
+    _add_article(
+        db_session,
+        "Unrelated",
+        "Nothing here",
+        "Weather report.",
+        "https://example.com/other",
+    )
+
+    match = build_full_text_match(db_session, "subsidy")
+    assert match is not None and not match.is_empty
+
+    rows = (
+        match.apply(db_session.query(Article))
+        .order_by(*_resolve_article_sort("relevance", "subsidy", match))
+        .all()
+    )
+    assert [row.id for row in rows] == [title_hit.id, body_hit.id]
+
+    snippets = match.snippets(db_session, [row.id for row in rows])
+    assert "<mark>subsidies</mark>" in snippets[title_hit.id]
+
+
+def test_full_text_match_ignores_operator_syntax():
+    assert fts5_match_expression('eu OR "trade" NEAR(x)') == '"eu" "OR" "trade" "NEAR" "x"'
+    assert fts5_match_expression("farm*") == '"farm"*'
+    assert fts5_match_expression("  ---  ") == ""
+
+
+def test_article_keywords_loads_page_in_one_query(db_session):
+    first = _add_article(db_session, "First", None, None, "https://example.com/k1")
+    second = _add_article(db_session, "Second", None, None, "https://example.com/k2")
+    bare = _add_article(db_session, "Bare", None, None, "https://example.com/k3")
+    keywords = [Keyword(keyword_en=f"kw-{letter}") for letter in "fedcba"]
+    db_session.add_all(keywords)
+    db_session.flush()
+    for keyword in keywords:
+        db_session.add(KeywordArticle(keyword_id=keyword.id, article_id=first.id))
+    db_session.add(KeywordArticle(keyword_id=keywords[0].id, article_id=second.id))
+    db_session.flush()
+
+    statements = []
+    engine = db_session.get_bind().engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = _article_keywords(db_session, [first.id, second.id, bare.id])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert result[first.id] == ["kw-a", "kw-b", "kw-c", "kw-d", "kw-e"]
+    assert result[second.id] == ["kw-f"]
+    assert result[bare.id] == []
@@ -0,0 +1,83 @@
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embeddings import EmbeddingGenerator
+
+
+class _CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, sentences, convert_to_numpy=True):
+        single = isinstance(sentences, str)
+        batch = [sentences] if single else list(sentences)
+        self.encoded.extend(batch)
+        vectors = np.stack([np.full(384, len(text) + 1, dtype=np.float32) for text in batch])
+        return vectors[0] if single else vectors
+
+
+def _generator() -> EmbeddingGenerator:
+    generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+    generator.embedding_dim = 384
+    generator.model = _CountingModel()
+    generator.cache = EmbeddingCache("test-model", use_redis=False)
+    return generator
+
+
+def test_cache_keys_normalize_whitespace_and_evict_lru():
+    cache = EmbeddingCache("test-model", max_entries=2, use_redis=False)
+    vector = [0.5] * 384
+
+    cache.set("European  Union\n", vector)
+    assert cache.get("European Union") == vector
+
+    cache.set("second", vector)
+    cache.set("third", vector)
+    assert cache.get("European Union") is None
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_cache_stores_float32_and_returns_lists():
+    cache = EmbeddingCache("test-model", use_redis=False)
+    vector = [0.25] * 384
+
+    cache.set("Brexit", vector)
+    stored = cache._memory[cache.key_for("Brexit")]
+    assert isinstance(stored, np.ndarray)
+    assert stored.dtype == np.float32
+
+    # Callers get a fresh list, so mutating it never changes the cache.
+    returned = cache.get("Brexit")
+    assert returned == vector
+    returned[0] = 1.0
+    assert cache.get("Brexit") == vector
+
+
+def test_cache_refuses_zero_and_malformed_vectors():
+    cache = EmbeddingCache("test-model", use_redis=False)
+    cache.set("zero", [0.0] * 384)
+    cache.set("nested", [[0.1] * 384])
+
+    assert cache.get("zero") is None
+    assert cache.get("nested") is None
+    assert cache.get_stats()["stores"] == 0
+
+
+def test_generator_reuses_cached_embeddings():
+    generator = _generator()
+
+    first = generator.generate_embedding("Brexit")
+    second = generator.generate_embedding("Brexit")
+    assert first == second
+    assert generator.model.encoded == ["Brexit"]
+
+    batch = generator.generate_embeddings_batch(["Brexit", "NATO", "", "NATO"])
+    assert batch[0] == first
+    assert batch[1] == batch[3]
+    assert batch[2] is None
+    # Cached and duplicate texts never reach the model.
+    assert generator.model.encoded == ["Brexit", "NATO"]
+
+    stats = generator.cache.get_stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 3
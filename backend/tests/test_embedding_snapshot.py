@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services import embedding_snapshot
+from app.services.embedding_snapshot import export_snapshot, load_snapshot
+from app.services.vector_index import FlatIndex, SnapshotIndex, VectorIndexService
+
+
+def _vectors(count: int, dim: int = 384, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add_articles(db_session: Session, vectors: np.ndarray, prefix: str):
+    articles = [
+        Article(
+            title=f"Snapshot {i}",
+            source_url=f"https://example.com/{prefix}-{i}",
+            embedding=vector.tolist(),
+        )
+        for i, vector in enumerate(vectors)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    return articles
+
+
+@pytest.mark.parametrize("storage", ["float32", "int8"])
+def test_export_and_map_snapshot(db_session: Session, tmp_path, storage):
+    vectors = _vectors(80)
+    articles = _add_articles(db_session, vectors, f"snap-{storage}")
+
+    manifest = export_snapshot(
+        db_session, Article, directory=str(tmp_path), storage=storage, nlist=2
+    )
+    snapshot = load_snapshot("articles", directory=str(tmp_path))
+
+    assert manifest["count"] == 80
+    assert isinstance(snapshot.vectors, np.memmap)
+    assert snapshot.centroids is not None
+    assert snapshot.rows_for([articles[5].id, -1]).size == 1
+
+    index = SnapshotIndex(snapshot, delta=FlatIndex(), nprobe=2)
+    assert index.search(vectors[5], k=1)[0][0] == articles[5].id
+    assert len(index) == 80
+
+
+def test_exact_snapshot_search_ignores_partitions(db_session: Session, tmp_path):
+    vectors = _vectors(80)
+    articles = _add_articles(db_session, vectors, "snap-exact")
+    export_snapshot(db_session, Article, directory=str(tmp_path), nlist=2)
+    snapshot = load_snapshot("articles", directory=str(tmp_path))
+
+    expected = np.argsort(-(vectors @ vectors[5]))[:10]
+    index = SnapshotIndex(snapshot, delta=FlatIndex(), nprobe=1, exact=True)
+    hits = sorted(index.search(vectors[5], k=10), key=lambda hit: -hit[1])
+
+    assert [item_id for item_id, _ in hits] == [articles[row].id for row in expected]
+
+
+def test_service_applies_delta_after_snapshot(db_session: Session, tmp_path, monkeypatch):
+    vectors = _vectors(6)
+    articles = _add_articles(db_session, vectors[:4], "delta-base")
+    export_snapshot(db_session, Article, directory=str(tmp_path), nlist=1)
+    newer = _add_articles(db_session, vectors[4:], "delta-new")
+
+    monkeypatch.setattr(embedding_snapshot.settings, "vector_snapshot_dir", str(tmp_path))
+    service = VectorIndexService(Article, backend="flat")
+
+    # Only the two rows ingested after the snapshot come from the database
+    assert service.sync(db_session, force=True) == 2
+    assert isinstance(service.index, SnapshotIndex)
+    assert service.search(vectors[1].tolist(), k=1)[0][0] == articles[1].id
+    assert service.search(vectors[5].tolist(), k=1)[0][0] == newer[1].id
+
+    service.remove([articles[1].id])
+    remaining = service.search(vectors[1].tolist(), k=6)
+    assert articles[1].id not in {item_id for item_id, _ in remaining}
+
+
+def test_service_remaps_newer_snapshot_on_sync(db_session: Session, tmp_path, monkeypatch):
+    vectors = _vectors(6)
+    articles = _add_articles(db_session, vectors[:3], "remap-base")
+    export_snapshot(db_session, Article, directory=str(tmp_path), nlist=1)
+
+    monkeypatch.setattr(embedding_snapshot.settings, "vector_snapshot_dir", str(tmp_path))
+    service = VectorIndexService(Article, backend="flat")
+    service.sync(db_session, force=True)
+    first_version = service.snapshot_version
+
+    newer = _add_articles(db_session, vectors[3:], "remap-new")
+    assert service.sync(db_session, force=True) == 3
+    assert len(service.index.delta) == 3
+
+    export_snapshot(db_session, Article, directory=str(tmp_path), nlist=1)
+    # The new export covers every row, so nothing is left for the delta
+    assert service.sync(db_session, force=True) == 0
+    assert service.snapshot_version > first_version
+    assert len(service.index.delta) == 0
+    assert len(service) == 6
+    assert service.search(vectors[4].tolist(), k=1)[0][0] == newer[1].id
+    assert service.search(vectors[0].tolist(), k=1)[0][0] == articles[0].id
@@ -0,0 +1,221 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.enrichment import enrich_articles
+from app.services.gemini_client import RateLimiter
+from app.services.scraper import NewsArticle
+
+
+class _Extractor:
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+
+    def analyze_article_gemini(self, title, text, source_name, include_sentiment=True):
+        return None
+
+    def extract_spacy_batch(self, texts):
+        return [None] * len(texts)
+
+    def extract_all(self, title, text, use_gemini=True, gemini_analysis=None, spacy_result=None):
+        if self.barrier:
+            self.barrier.wait()
+        if title == "Broken":
+            raise RuntimeError("Gemini failed")
+        return {"keywords": [title, "EU", title], "classification": "fact"}
+
+
+class _Sentiment:
+    def analyze_article(self, title, text, source_name, use_gemini=True, gemini_result=None):
+        return {"sentiment_overall": 0.1}
+
+
+def _articles(*titles):
+    return [NewsArticle(title, f"https://example.com/{title}", "BBC") for title in titles]
+
+
+def test_enrich_articles_runs_concurrently_and_keeps_order():
+    # Every worker must be in flight at the same time to pass the barrier
+    barrier = threading.Barrier(3, timeout=5)
+    articles = _articles("A", "B", "C")
+
+    prepared = enrich_articles(articles, _Extractor(barrier), _Sentiment(), max_workers=3)
+
+    assert [item["data"].title for item in prepared] == ["A", "B", "C"]
+    assert prepared[0]["keywords"] == ["A", "EU"]
+    assert prepared[0]["sentiment"] == {"sentiment_overall": 0.1}
+
+
+def test_enrich_articles_drops_failed_articles():
+    articles = _articles("A", "Broken", "C")
+
+    for workers in (1, 2):
+        prepared = enrich_articles(articles, _Extractor(), _Sentiment(), max_workers=workers)
+        assert [item["data"].title for item in prepared] == ["A", "C"]
+
+
+def test_rate_limiter_is_shared_by_threads():
+    limiter = RateLimiter(max_calls_per_minute=50)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(50):
+            pool.submit(limiter.wait_if_needed)
+
+    assert len(limiter.backend.calls("gemini")) == 50
+
+
+class _Gemini:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def generate_structured_output(self, prompt, temperature=0.3):
+        self.prompts.append(prompt)
+        return self.response
+
+
+COMBINED_RESPONSE = """```json
+{
+  "keywords": ["Rice exports", "EU"],
+  "entities": {"people": [], "organizations": ["EU"], "locations": ["Bangkok"]},
+  "relationships": [],
+  "classification": {"classification": "fact", "confidence": 0.9, "reasoning": "Data"},
+  "sentiment": {
+    "overall_polarity": 0.6,
+    "confidence": 0.8,
+    "subjectivity": 0.3,
+    "emotion_breakdown": {"positive": 0.6, "negative": 0.1, "neutral": 0.3},
+    "classification": "POSITIVE"
+  }
+}
+```"""
+
+
+def test_enrich_article_combined_mode_sends_one_request(monkeypatch):
+    from app.services import enrichment
+    from app.services.keyword_extractor import KeywordExtractor
+    from app.services.sentiment import SentimentAnalyzer
+
+    monkeypatch.setattr(enrichment.settings, "gemini_analysis_mode", "combined")
+    monkeypatch.setattr(enrichment.settings, "enable_gemini_sentiment", True)
+    gemini = _Gemini(COMBINED_RESPONSE)
+    extractor, analyzer = KeywordExtractor(), SentimentAnalyzer()
+    extractor.gemini = analyzer.gemini = gemini
+
+    item = enrichment.enrich_article(_articles("Rice")[0], extractor, analyzer)
+
+    assert len(gemini.prompts) == 1
+    assert "overall_polarity" in gemini.prompts[0]
+    assert item["keywords"] == ["Rice exports", "EU"]
+    assert item["extraction"]["classification"] == "fact"
+    assert "Bangkok" in item["extraction"]["entities"]["locations"]
+    assert item["sentiment"]["method"] == "gemini"
+    assert item["sentiment"]["sentiment_overall"] == 0.6
+
+
+def test_enrich_article_non_object_reply_falls_back_to_separate_requests(monkeypatch):
+    from app.services import enrichment
+    from app.services.keyword_extractor import KeywordExtractor
+    from app.services.sentiment import SentimentAnalyzer
+
+    monkeypatch.setattr(enrichment.settings, "gemini_analysis_mode", "combined")
+    monkeypatch.setattr(enrichment.settings, "enable_gemini_sentiment", True)
+    gemini = _Gemini("[1, 2]")
+    extractor, analyzer = KeywordExtractor(), SentimentAnalyzer()
+    extractor.gemini = analyzer.gemini = gemini
+
+    item = enrichment.enrich_article(_articles("Rice")[0], extractor, analyzer)
+
+    # Combined request, then keywords, classification and sentiment; no retries
+    assert len(gemini.prompts) == 4
+    assert item["extraction"]["classification"] == "mixed"
+    assert item["sentiment"]["method"] == "vader"
+
+
+def test_enrich_article_separate_mode_keeps_three_requests(monkeypatch):
+    from app.services import enrichment
+    from app.services.keyword_extractor import KeywordExtractor
+    from app.services.sentiment import SentimentAnalyzer
+
+    monkeypatch.setattr(enrichment.settings, "gemini_analysis_mode", "separate")
+    monkeypatch.setattr(enrichment.settings, "enable_gemini_sentiment", True)
+    gemini = _Gemini("not json")
+    extractor, analyzer = KeywordExtractor(), SentimentAnalyzer()
+    extractor.gemini = analyzer.gemini = gemini
+
+    item = enrichment.enrich_article(_articles("Rice")[0], extractor, analyzer)
+
+    assert len(gemini.prompts) == 3
+    assert item["sentiment"]["method"] == "vader"
+
+
+SENTIMENT = {
+    "overall_polarity": -0.4,
+    "confidence": 0.7,
+    "subjectivity": 0.5,
+    "emotion_breakdown": {"positive": 0.1, "negative": 0.6, "neutral": 0.3},
+}
+
+
+class _BatchGemini(_Gemini):
+    """Answers batched prompts for every article except those listed in ``skip``."""
+
+    def __init__(self, skip=()):
+        super().__init__("not json")
+        self.skip = set(skip)
+        self.batch_prompts = []
+
+    async def generate_structured_output_async(self, prompt, temperature=0.3):
+        self.batch_prompts.append(prompt)
+        count = prompt.count("[Article ")
+        return json.dumps(
+            [dict(SENTIMENT, index=i) for i in range(count) if i not in self.skip]
+            + [{"index": 99, **SENTIMENT}, {"index": 0}]
+        )
+
+
+def test_sentiment_batch_packs_articles_and_falls_back_per_article():
+    from app.services.sentiment import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    analyzer.gemini = gemini = _BatchGemini(skip={1})
+    articles = [(f"Title {i}", "Short summary", "BBC") for i in range(5)]
+
+    results = analyzer.analyze_sentiment_gemini_batch(articles, batch_size=3)
+
+    # Two batched requests; article 1 of each batch is retried on its own
+    assert len(gemini.batch_prompts) == 2
+    assert len(gemini.prompts) == 2
+    assert [result is None for result in results] == [False, True, False, False, True]
+    assert results[0]["overall_polarity"] == -0.4
+    assert "index" not in results[0]
+
+
+@pytest.mark.parametrize("mode, requests_per_article", [("separate", 2), ("combined", 3)])
+def test_enrich_articles_batches_short_article_sentiment(
+    monkeypatch, mode, requests_per_article
+):
+    from app.services import enrichment
+    from app.services.keyword_extractor import KeywordExtractor
+    from app.services.sentiment import SentimentAnalyzer
+
+    monkeypatch.setattr(enrichment.settings, "gemini_analysis_mode", mode)
+    monkeypatch.setattr(enrichment.settings, "enable_gemini_sentiment", True)
+    monkeypatch.setattr(enrichment.settings, "gemini_sentiment_batch_size", 8)
+    gemini = _BatchGemini()
+    extractor, analyzer = KeywordExtractor(), SentimentAnalyzer()
+    extractor.gemini = analyzer.gemini = gemini
+    articles = _articles(*"ABCDEFGH")
+    for article in articles:
+        article.full_text = f"Summary of {article.title}"
+
+    prepared = enrichment.enrich_articles(articles, extractor, analyzer, max_workers=2)
+
+    assert len(gemini.batch_prompts) == 1
+    # Keyword extraction and classification (plus the combined request, which
+    # falls back to them here); no per-article sentiment
+    assert len(gemini.prompts) == requests_per_article * len(articles)
+    assert not any("overall_polarity" in prompt for prompt in gemini.prompts)
+    assert all(item["sentiment"]["method"] == "gemini" for item in prepared)
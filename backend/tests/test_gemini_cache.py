@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from app.services.gemini_cache import GeminiResponseCache, cache_key, resolve_ttl
+from app.services.gemini_client import GeminiClient, RateLimiter
+
+
+class _Model:
+    def __init__(self, text='{"ok": true}'):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        return type("Response", (), {"text": self.text})
+
+
+def _client(model, cache=None):
+    client = GeminiClient()
+    client.model = model
+    client.rate_limiter = RateLimiter(max_calls_per_minute=100)
+    client.response_cache = cache or GeminiResponseCache("memory")
+    return client
+
+
+def test_deterministic_request_is_served_from_cache():
+    model = _Model()
+    client = _client(model)
+
+    first = asyncio.run(client.generate_json("same prompt", temperature=0.2))
+    second = asyncio.run(client.generate_json("same prompt", temperature=0.2))
+
+    assert first == second == {"ok": True}
+    assert model.calls == 1
+    assert client.response_cache.get_stats()["hits"] == 1
+
+
+def test_sampled_request_bypasses_cache_unless_ttl_given():
+    model = _Model()
+    client = _client(model)
+
+    client.generate_text("story", temperature=0.7)
+    client.generate_text("story", temperature=0.7)
+    assert model.calls == 2
+
+    client.generate_text("story", temperature=0.7, cache_ttl=60)
+    client.generate_text("story", temperature=0.7, cache_ttl=60)
+    assert model.calls == 3
+
+
+def test_config_is_part_of_the_key():
+    key = cache_key("gemini-pro", "prompt", {"temperature": 0.1})
+
+    assert key != cache_key("gemini-pro", "prompt", {"temperature": 0.2})
+    assert key != cache_key("gemini-flash", "prompt", {"temperature": 0.1})
+    assert resolve_ttl(0.7, None) == 0
+    assert resolve_ttl(0.7, 0) == 0
+    assert resolve_ttl(0.1, None) > 0
+
+
+def test_malformed_json_is_not_cached():
+    model = _Model(text="Sorry, I cannot help with that")
+    client = _client(model)
+
+    assert asyncio.run(client.generate_json("evaluate", cache_ttl=60)) is None
+    assert asyncio.run(client.generate_json("evaluate", cache_ttl=60)) is None
+    assert model.calls == 2
+
+
+def test_disk_backend_survives_a_new_process_and_expires(tmp_path):
+    key = cache_key("gemini-pro", "prompt", {})
+    GeminiResponseCache("disk", cache_dir=str(tmp_path)).set(key, "answer", 1)
+
+    # A fresh instance has an empty memory tier and reads the file
+    assert GeminiResponseCache("disk", cache_dir=str(tmp_path)).get(key) == "answer"
+
+    time.sleep(1.05)
+    assert GeminiResponseCache("disk", cache_dir=str(tmp_path)).get(key) is None
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.gemini_cache import GeminiResponseCache
+from app.services.gemini_client import GeminiClient, RateLimiter
+
+
+class _Model:
+    """Blocking SDK stand-in that records how many calls overlap."""
+
+    def __init__(self, delay=0.05, block=False):
+        self.delay = delay
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self.release.wait(5)
+            time.sleep(self.delay)
+            return type("Response", (), {"text": f'{{"prompt": "{prompt}"}}'})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class _LoopBoundModel(_Model):
+    """Like the SDK: the async client only works on the loop that created it."""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.loop = None
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        if loop is not self.loop:
+            raise RuntimeError("attached to a different loop")
+        return self.generate_content(prompt, generation_config)
+
+
+def _client(model, max_concurrency=2, max_calls=100):
+    client = GeminiClient()
+    client.model = model
+    client.max_concurrency = max_concurrency
+    client.rate_limiter = RateLimiter(max_calls_per_minute=max_calls)
+    client.response_cache = GeminiResponseCache("memory")
+    return client
+
+
+def test_async_requests_are_bounded_by_the_request_pool():
+    model = _Model()
+    client = _client(model, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(client.generate_json(f"p{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+
+    assert [result["prompt"] for result in results] == [f"p{i}" for i in range(5)]
+    assert model.max_in_flight == 2
+
+
+def test_sync_calls_from_many_threads_share_the_bound():
+    # Each sync call runs on its own event loop, as in the enrichment pool
+    model = _Model()
+    client = _client(model, max_concurrency=2)
+    threads = [
+        threading.Thread(target=client.generate_text, args=(f"t{i}",)) for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.prompts) == 6
+    assert model.max_in_flight == 2
+
+
+def test_consecutive_sync_calls_work_with_loop_bound_sdk():
+    client = _client(_LoopBoundModel())
+
+    assert client.generate_text("first") == '{"prompt": "first"}'
+    assert client.generate_text("second") == '{"prompt": "second"}'
+
+
+def test_rate_limit_wait_does_not_block_event_loop():
+    client = _client(_Model(delay=0), max_calls=1)
+    # Window is full until the recorded call is 60 seconds old
+    client.rate_limiter.backend._calls["gemini"] = [time.time() - 59.8]
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.time())
+            await asyncio.sleep(0.02)
+
+    async def run():
+        return await asyncio.gather(client.generate_text_async("hello"), ticker())
+
+    text, _ = asyncio.run(run())
+
+    assert text == '{"prompt": "hello"}'
+    assert len(ticks) == 5
+
+
+def test_cancelled_queued_request_never_starts():
+    model = _Model(delay=0, block=True)
+    client = _client(model, max_concurrency=1)
+
+    async def run():
+        running = asyncio.create_task(client.generate_text_async("running"))
+        queued = asyncio.create_task(client.generate_text_async("queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        model.release.set()
+        return await running
+
+    assert asyncio.run(run()) == '{"prompt": "running"}'
+    assert model.prompts == ["running"]
+
+
+def test_request_timeout_returns_none():
+    model = _Model(block=True)
+    client = _client(model)
+
+    try:
+        assert asyncio.run(client._make_request_async("slow", timeout=0.01)) is None
+    finally:
+        model.release.set()
+
+
+def test_sync_wrappers_work_inside_running_loop():
+    client = _client(_Model(delay=0))
+
+    async def run():
+        return client.generate_structured_output("sync")
+
+    assert client.generate_text("plain") == '{"prompt": "plain"}'
+    assert asyncio.run(run()) == '{"prompt": "sync"}'
@@ -0,0 +1,82 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, Keyword, KeywordArticle
+from app.services.keyword_resolver import keyword_texts, link_keywords, resolve_keywords
+
+
+def test_keyword_texts_accepts_strings_and_dicts():
+    items = ["EU", {"text": "Trade"}, " EU ", "", {"score": 1}, None]
+    assert keyword_texts(items) == ["EU", "Trade"]
+
+
+def test_resolve_keywords_bulk_creates_missing(db_session: Session):
+    existing = Keyword(keyword_en="Trade", category="economy")
+    db_session.add(existing)
+    db_session.flush()
+
+    statements = []
+    engine = db_session.get_bind().engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        keywords, created = resolve_keywords(
+            db_session,
+            ["Trade", "EU", "Energy", "EU"],
+            defaults=lambda text: {"keyword_th": text, "category": "general"},
+            embed=lambda texts: [[float(len(text))] * 384 for text in texts],
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Lookup, one INSERT ... RETURNING for the missing rows, reload
+    assert len(statements) == 3
+    assert set(keywords) == {"Trade", "EU", "Energy"}
+    assert keywords["Trade"].id == existing.id
+    assert created == {keywords["EU"].id, keywords["Energy"].id}
+    assert keywords["EU"].keyword_th == "EU"
+    assert keywords["Energy"].category == "general"
+    assert keywords["Energy"].embedding[0] == 6.0
+
+
+def test_resolve_keywords_skips_rows_created_concurrently(db_session: Session, monkeypatch):
+    from app.services import keyword_resolver
+
+    original = keyword_resolver._load_keywords
+    calls = []
+
+    def load_then_race(db, texts):
+        found = original(db, texts)
+        if not calls:
+            # Another worker inserts the keyword after our lookup
+            db.add(Keyword(keyword_en="EU", category="other"))
+            db.flush()
+        calls.append(texts)
+        return found
+
+    monkeypatch.setattr(keyword_resolver, "_load_keywords", load_then_race)
+
+    keywords, created = resolve_keywords(db_session, ["EU", "Energy"], {"category": "auto"})
+
+    assert keywords["EU"].category == "other"
+    assert created == {keywords["Energy"].id}
+    assert db_session.query(Keyword).filter_by(keyword_en="EU").count() == 1
+
+
+def test_link_keywords_skips_existing_links(db_session: Session):
+    article = Article(title="Linked", source_url="https://example.com/linked")
+    keyword = Keyword(keyword_en="Linked")
+    other = Keyword(keyword_en="Other")
+    db_session.add_all([article, keyword, other])
+    db_session.flush()
+    db_session.add(KeywordArticle(keyword_id=keyword.id, article_id=article.id))
+    db_session.flush()
+
+    inserted = link_keywords(
+        db_session,
+        [(keyword.id, article.id), (other.id, article.id), (other.id, article.id)],
+        relevance_score=0.8,
+    )
+
+    assert inserted == {(other.id, article.id)}
+    assert db_session.query(KeywordArticle).filter_by(article_id=article.id).count() == 2
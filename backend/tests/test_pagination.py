@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.models import Article, Keyword, KeywordArticle
+from app.services.pagination import count_total, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def keyword_with_articles(db_session):
+    keyword = Keyword(keyword_en="Energy", category="topic")
+    db_session.add(keyword)
+    db_session.flush()
+
+    base = datetime(2025, 3, 1, 12, 0, 0)
+    for index in range(7):
+        # Two articles share a timestamp and one has none at all.
+        published = None if index == 6 else base - timedelta(days=min(index, 4))
+        article = Article(
+            title=f"Energy story {index}",
+            source="Reuters",
+            source_url=f"https://example.com/energy/{index}",
+            published_date=published,
+        )
+        db_session.add(article)
+        db_session.flush()
+        db_session.add(
+            KeywordArticle(keyword_id=keyword.id, article_id=article.id, relevance_score=1.0)
+        )
+    db_session.commit()
+    return keyword
+
+
+def _walk(client, url, page_size):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"page_size": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(url, params=params).json()
+        ids.extend(item["id"] for item in data["results"])
+        cursor = data["pagination"]["next_cursor"]
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_keyword_articles_cursor_walk_matches_offset_order(client, keyword_with_articles):
+    url = f"/api/keywords/{keyword_with_articles.id}/articles"
+
+    ids, pages = _walk(client, url, page_size=3)
+    full = client.get(url, params={"page_size": 100}).json()
+
+    assert pages == 3
+    assert ids == [item["id"] for item in full["results"]]
+    assert len(set(ids)) == 7
+    assert full["results"][-1]["published_date"] is None
+
+    # Page numbers keep working and hand out a cursor for the next page.
+    second = client.get(url, params={"page": 2, "page_size": 3}).json()
+    assert [item["id"] for item in second["results"]] == ids[3:6]
+    assert second["pagination"]["next_cursor"] is not None
+
+
+def test_search_articles_cursor_and_sort_validation(client, keyword_with_articles):
+    ids, _ = _walk(client, "/api/search/articles?sort_by=date_asc", page_size=2)
+    assert len(ids) == 7
+
+    first = client.get(
+        "/api/search/articles", params={"sort_by": "date_desc", "page_size": 2}
+    ).json()
+    cursor = first["pagination"]["next_cursor"]
+
+    # A cursor is bound to the sort order it was issued for.
+    response = client.get(
+        "/api/search/articles", params={"sort_by": "date_asc", "cursor": cursor}
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/search/articles", params={"sort_by": "sentiment_desc", "cursor": cursor}
+    )
+    assert response.status_code == 400
+
+    response = client.get("/api/keywords/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_count_total_modes(db_session, keyword_with_articles):
+    query = db_session.query(Article)
+
+    assert count_total(db_session, query, "exact") == (7, False)
+    assert count_total(db_session, query, "none") == (None, False)
+    assert count_total(db_session, query, "estimated", threshold=10) == (7, False)
+    # Past the threshold only a lower bound is reported on SQLite.
+    assert count_total(db_session, query, "estimated", threshold=5) == (6, True)
+
+    with pytest.raises(ValueError):
+        count_total(db_session, query, "approximate")
+
+
+def test_cursor_round_trip():
+    moment = datetime(2025, 1, 2, 3, 4, 5)
+    token = encode_cursor("date_desc", moment, 42)
+
+    assert decode_cursor(token, "date_desc") == (moment, 42)
+    assert decode_cursor(encode_cursor("date_desc", None, 7), "date_desc") == (None, 7)
+    with pytest.raises(ValueError):
+        decode_cursor(token, "created_desc")
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services.pgvector_search import (
+    apply_search_parameters,
+    build_index_statements,
+    cosine_distance,
+    default_ivfflat_lists,
+    rebuild_vector_indexes,
+    scoped_search_parameters,
+    uses_pgvector,
+)
+
+
+def test_cosine_distance_compiles_to_pgvector_operator(db_session: Session):
+    distance = cosine_distance(Article.embedding, [0.1] * 384)
+    query = db_session.query(Article.id).order_by(distance).limit(5)
+
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "<=>" in sql
+    assert "LIMIT" in sql
+
+
+def test_build_index_statements_hnsw_and_ivfflat():
+    hnsw = build_index_statements("articles", "hnsw", m=24, ef_construction=100)
+    assert hnsw[-1] == (
+        "CREATE INDEX CONCURRENTLY idx_articles_embedding_hnsw ON articles "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 24, ef_construction = 100)"
+    )
+    # Both methods are dropped so switching never leaves two indexes behind.
+    assert any("idx_articles_embedding_ivfflat" in stmt for stmt in hnsw[:-1])
+
+    ivfflat = build_index_statements("keywords", "ivfflat", lists=50, concurrently=False)
+    assert ivfflat[-1].endswith("USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50)")
+    assert "CONCURRENTLY" not in ivfflat[-1]
+
+    with pytest.raises(ValueError):
+        build_index_statements("articles", "flat")
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+    def begin_nested(self):
+        self.statements.append("SAVEPOINT")
+        return _RecordingSavepoint(self)
+
+
+class _RecordingSavepoint:
+    def __init__(self, session):
+        self.session = session
+
+    def rollback(self):
+        self.session.statements.append("ROLLBACK TO SAVEPOINT")
+
+
+def test_search_parameters_cover_the_limit():
+    db = _RecordingSession()
+    apply_search_parameters(db, method="hnsw", ef_search=40, limit=500)
+    assert db.statements == ["SET LOCAL hnsw.ef_search = 500"]
+
+    db = _RecordingSession()
+    apply_search_parameters(db, method="hnsw", limit=5000)
+    assert db.statements == ["SET LOCAL enable_indexscan = off"]
+
+    db = _RecordingSession()
+    apply_search_parameters(db, method="ivfflat", limit=10, exact=True)
+    assert db.statements == ["SET LOCAL enable_indexscan = off"]
+
+
+def test_scoped_search_parameters_are_rolled_back_after_the_block():
+    db = _RecordingSession()
+    with scoped_search_parameters(db, method="hnsw", limit=5000):
+        db.execute("SELECT knn")
+    assert db.statements == [
+        "SAVEPOINT",
+        "SET LOCAL enable_indexscan = off",
+        "SELECT knn",
+        "ROLLBACK TO SAVEPOINT",
+    ]
+
+    db = _RecordingSession()
+    with pytest.raises(RuntimeError):
+        with scoped_search_parameters(db, method="ivfflat", probes=4):
+            raise RuntimeError("query failed")
+    assert db.statements[-1] == "ROLLBACK TO SAVEPOINT"
+
+
+def test_default_ivfflat_lists():
+    assert default_ivfflat_lists(0) == 1
+    assert default_ivfflat_lists(250_000) == 250
+    assert default_ivfflat_lists(4_000_000) == 2000
+
+
+def test_sqlite_falls_back_to_in_process_search(db_session: Session):
+    assert uses_pgvector(db_session) is False
+
+    results = rebuild_vector_indexes(db_session.get_bind())
+    assert {item["status"] for item in results.values()} == {"skipped"}
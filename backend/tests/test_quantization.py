@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.db.quantization import decode_embedding, encode_embedding, settings
+from app.services.similarity import SimilarityEngine
+from app.services.vector_index import FlatIndex, VectorIndexService
+
+
+def _vectors(count: int, dim: int = 384, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("mode, size", [("int8", 388), ("float16", 768)])
+def test_compact_codec_round_trip(mode, size):
+    vector = _vectors(1)[0]
+
+    blob = encode_embedding(vector * 3.0, mode)
+    decoded = decode_embedding(blob)
+
+    assert len(blob) == size
+    assert float(decoded @ vector) == pytest.approx(1.0, abs=1e-3)
+    assert encode_embedding([0.0] * 384, mode) is None
+
+
+@pytest.mark.parametrize("storage", ["int8", "float16"])
+def test_compact_engine_ranks_like_float32(storage):
+    vectors = _vectors(200)
+    exact = SimilarityEngine.from_embeddings(vectors)
+    compact = SimilarityEngine.from_embeddings(vectors, storage=storage)
+    compact.score_block_rows = 64  # exercise block-wise scoring
+
+    assert compact.nbytes < exact.nbytes
+    for query in vectors[:5]:
+        assert compact.top_k(query, 1)[0][0][0] == exact.top_k(query, 1)[0][0][0]
+
+
+def test_compact_index_rescores_against_float_embeddings(db_session: Session):
+    vectors = _vectors(5)
+    articles = [
+        Article(
+            title=f"Compact {i}",
+            source_url=f"https://example.com/compact-{i}",
+            embedding=vectors[i].tolist(),
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+
+    service = VectorIndexService(Article, backend="flat")
+    service.index = FlatIndex(storage="int8")
+    service.sync(db_session, force=True)
+
+    hits = service.search(vectors[2].tolist(), k=2, db=db_session)
+
+    assert service.compact
+    assert hits[0][0] == articles[2].id
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_article_writes_compact_copy_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_compact_mode", "int8")
+    article = Article(title="Compact", source_url="https://example.com/c")
+
+    article.embedding = _vectors(1)[0].tolist()
+
+    assert len(article.embedding_compact) == 388
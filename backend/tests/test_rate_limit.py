@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.gemini_client import RateLimiter
+from app.services.rate_limit import (
+    BULK,
+    INTERACTIVE,
+    YIELD_SECONDS,
+    LocalRateLimitBackend,
+    RedisRateLimitBackend,
+    current_priority,
+    request_priority,
+)
+
+
+def test_bulk_lane_leaves_reserve_for_interactive_calls():
+    backend = LocalRateLimitBackend()
+
+    assert [backend.reserve("gemini", 5, BULK, reserve=2) for _ in range(3)] == [0.0] * 3
+    assert backend.reserve("gemini", 5, BULK, reserve=2) > 50
+    assert backend.reserve("gemini", 5, INTERACTIVE, reserve=2) == 0.0
+    assert backend.reserve("gemini", 5, INTERACTIVE, reserve=2) == 0.0
+    assert backend.reserve("gemini", 5, INTERACTIVE, reserve=2) > 50
+    assert len(backend.calls("gemini")) == 5
+
+
+def test_bulk_lane_yields_while_interactive_call_waits():
+    backend = LocalRateLimitBackend()
+    backend.add_waiting("gemini", 1)
+
+    assert backend.reserve("gemini", 30, BULK) == YIELD_SECONDS
+    assert backend.reserve("gemini", 30, INTERACTIVE) == 0.0
+
+    backend.add_waiting("gemini", -1)
+    assert backend.reserve("gemini", 30, BULK) == 0.0
+
+
+def test_request_priority_sets_lane_for_context():
+    assert current_priority() == BULK
+    with request_priority(INTERACTIVE):
+        assert current_priority() == INTERACTIVE
+    assert current_priority() == BULK
+
+    with pytest.raises(ValueError):
+        with request_priority("urgent"):
+            pass
+
+
+def test_interactive_wait_marks_itself_waiting():
+    backend = LocalRateLimitBackend()
+    limiter = RateLimiter(max_calls_per_minute=1, backend=backend)
+    backend._calls["gemini"] = [time.time() - 59.9]
+    seen = []
+
+    original = backend.reserve
+
+    def reserve(name, limit, priority=BULK, reserve=0):
+        seen.append(backend._waiting.get(name, 0))
+        return original(name, limit, priority, reserve)
+
+    backend.reserve = reserve
+    with request_priority(INTERACTIVE):
+        asyncio.run(limiter.wait_if_needed_async())
+
+    assert seen[0] == 0 and seen[-1] == 1
+    assert backend._waiting["gemini"] == 0
+
+
+class _Script:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class _Redis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        assert "ZREMRANGEBYSCORE" in source
+        return self.script
+
+
+def test_redis_backend_translates_script_results_and_falls_back():
+    script = _Script([0, 1500, -1, ConnectionError("down")])
+    backend = RedisRateLimitBackend(_Redis(script))
+
+    assert backend.reserve("gemini", 30, INTERACTIVE, reserve=5) == 0.0
+    assert backend.reserve("gemini", 30) == 1.5
+    assert backend.reserve("gemini", 30) == YIELD_SECONDS
+    # Redis errors fall back to the in-process window
+    assert backend.reserve("gemini", 30) == 0.0
+
+    keys, args = script.calls[0]
+    assert keys == ["ratelimit:gemini:calls", "ratelimit:gemini:waiting"]
+    assert args[:4] == [60000, 30, 5, INTERACTIVE]
@@ -0,0 +1,88 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, Keyword, KeywordArticle
+from app.services.scraper import NewsArticle
+from app.tasks import scraping
+
+
+class _Extractor:
+    def analyze_article_gemini(self, title, text, source_name, include_sentiment=True):
+        return None
+
+    def extract_spacy_batch(self, texts):
+        return [None] * len(texts)
+
+    def extract_all(self, title, text, use_gemini=True, gemini_analysis=None, spacy_result=None):
+        keywords = {"First": ["EU", "Trade"], "Second": ["Trade", "Energy", "Trade"]}
+        return {
+            "keywords": keywords.get(title, []),
+            "classification": "fact",
+            "classification_confidence": 0.9,
+        }
+
+
+class _Sentiment:
+    def analyze_article(self, title, text, source_name, use_gemini=True, gemini_result=None):
+        return {
+            "sentiment_overall": 0.1,
+            "sentiment_confidence": 0.8,
+            "sentiment_subjectivity": 0.2,
+            "emotion_positive": 0.5,
+            "emotion_negative": 0.1,
+            "emotion_neutral": 0.4,
+        }
+
+
+class _Embeddings:
+    def __init__(self):
+        self.batches = []
+
+    def generate_embedding(self, text):
+        raise AssertionError("scrape_news should only use batched embeddings")
+
+    def generate_embeddings_batch(self, texts, batch_size=None):
+        self.batches.append(list(texts))
+        return [np.full(384, i + 1.0).tolist() for i in range(len(texts))]
+
+
+class _Index:
+    def __init__(self):
+        self.added = []
+
+    def add(self, item_id, embedding):
+        self.added.append(item_id)
+
+
+def test_scrape_news_embeds_in_batches_and_bulk_inserts(db_session: Session, monkeypatch):
+    db_session.add(Keyword(keyword_en="Trade", popularity_score=2.0))
+    db_session.add(Article(title="Old", source_url="https://example.com/old"))
+    db_session.commit()
+
+    scraped = [
+        NewsArticle("First", "https://example.com/1", "BBC", summary="one"),
+        NewsArticle("Old", "https://example.com/old", "BBC"),
+        NewsArticle("Old", "https://www.example.com/old/?utm_source=rss", "BBC"),
+        NewsArticle("Second", "https://example.com/2", "DW", summary="two"),
+        NewsArticle("Second", "https://example.com/2#comments", "DW", summary="two"),
+    ]
+    embeddings = _Embeddings()
+    index = _Index()
+    monkeypatch.setattr(scraping, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(scraping, "scrape_news_sync", lambda max_articles: scraped)
+    monkeypatch.setattr(scraping, "get_keyword_extractor", _Extractor)
+    monkeypatch.setattr(scraping, "get_sentiment_analyzer", _Sentiment)
+    monkeypatch.setattr(scraping, "get_embedding_generator", lambda: embeddings)
+    monkeypatch.setattr(scraping, "get_article_index", lambda: index)
+
+    result = scraping.scrape_news()
+
+    assert result == {"status": "success", "processed": 2, "skipped": 3, "total": 5}
+    # One batch for the articles, one for the keywords that did not exist yet
+    assert embeddings.batches == [["First. one", "Second. two"], ["EU", "Energy"]]
+    assert len(index.added) == 2
+
+    trade = db_session.query(Keyword).filter_by(keyword_en="Trade").one()
+    assert trade.popularity_score == 2.2
+    assert db_session.query(Keyword).filter_by(keyword_en="EU").one().embedding[0] == 1.0
+    assert db_session.query(KeywordArticle).filter_by(keyword_id=trade.id).count() == 2
@@ -0,0 +1,72 @@
+import pytest
+
+from app.services import sentiment
+from app.services.sentiment import (
+    SentenceScoreCache,
+    SentimentAnalyzer,
+    aggregate_sentence_scores,
+    score_sentences,
+    split_sentences,
+)
+
+SHARED = "The trade deal is a great success for exporters. Officials praised the talks."
+
+
+@pytest.fixture
+def memo(monkeypatch):
+    cache = SentenceScoreCache(max_size=100)
+    monkeypatch.setattr(sentiment, "sentence_cache", cache)
+    return cache
+
+
+def test_split_sentences_normalizes_whitespace():
+    text = "First  sentence here. Second one!\n\nThird?  "
+
+    assert split_sentences(text) == [
+        "First sentence here.",
+        "Second one!",
+        "Third?",
+    ]
+    assert split_sentences("") == []
+
+
+def test_shared_paragraphs_are_scored_once(memo):
+    class CountingVader:
+        def __init__(self):
+            self.calls = 0
+            self.inner = sentiment.vader_analyzer
+
+        def polarity_scores(self, text):
+            self.calls += 1
+            return self.inner.polarity_scores(text)
+
+    vader = CountingVader()
+    score_sentences(f"{SHARED} Protests followed in Bangkok.", vader)
+    score_sentences(f"Syndicated copy. {SHARED}", vader)
+
+    assert vader.calls == 4
+    assert memo.get_stats()["hits"] == 2
+
+
+def test_sentence_mode_aggregates_by_length(memo, monkeypatch):
+    monkeypatch.setattr(sentiment.settings, "sentiment_vader_mode", "sentence")
+    analyzer = SentimentAnalyzer()
+    text = f"{SHARED} The flood was a terrible disaster."
+
+    scored = score_sentences(text)
+    weights = [len(s.split()) for s, _ in scored]
+    expected = sum(w * scores["compound"] for w, (_, scores) in zip(weights, scored)) / sum(weights)
+
+    assert analyzer.analyze_sentiment_vader(text)["overall"] == pytest.approx(expected, abs=1e-4)
+    columns = analyzer.analyze_batch([text], workers=1)
+    assert columns["sentiment_overall"][0] == pytest.approx(expected, abs=1e-4)
+    assert aggregate_sentence_scores([])["compound"] == 0.0
+
+
+def test_memo_is_bounded():
+    cache = SentenceScoreCache(max_size=2)
+    for sentence in ("a", "b", "c"):
+        cache.add(SentenceScoreCache.key(sentence), {"compound": 0.0})
+
+    assert cache.get(SentenceScoreCache.key("a")) is None
+    assert cache.get_stats()["entries"] == 2
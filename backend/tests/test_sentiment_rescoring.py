@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services.sentiment import SentimentAnalyzer
+from app.services.sentiment_rescoring import article_id_ranges, rescore_articles
+from app.tasks import sentiment_aggregation
+
+TEXTS = [
+    "This is wonderful news! Thailand's economy is thriving.",
+    "The crisis is terrible and the response has been a disaster.",
+    "The ministry published the quarterly trade figures.",
+    "",
+    None,
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_batch_matches_single_text_scoring(workers):
+    analyzer = SentimentAnalyzer()
+
+    columns = analyzer.analyze_batch(TEXTS, workers=workers, chunk_size=2)
+
+    for index, text in enumerate(TEXTS):
+        expected = analyzer.analyze_article("", text or "", "BBC", use_gemini=False)
+        for name in ("sentiment_overall", "sentiment_confidence", "sentiment_subjectivity"):
+            assert columns[name][index] == pytest.approx(expected[name])
+        assert columns["emotion_neutral"][index] == pytest.approx(expected["emotion_neutral"])
+        assert columns["classification"][index] == expected["classification"]
+    assert columns["sentiment_overall"].shape == (len(TEXTS),)
+
+
+def test_rescore_articles_updates_id_range(db_session: Session):
+    articles = [
+        Article(
+            title=f"Story {index}",
+            full_text=text,
+            summary="A wonderful success" if text is None else None,
+            source_url=f"https://example.com/rescore/{index}",
+            sentiment_overall=0.0,
+            sentiment_classification="STRONGLY_NEGATIVE",
+        )
+        for index, text in enumerate(TEXTS)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    ids = [article.id for article in articles]
+
+    assert article_id_ranges(db_session, 2)[0] == (ids[0], ids[0] + 1)
+
+    result = rescore_articles(db_session, start_id=ids[0], end_id=ids[3], batch_size=2, workers=1)
+    db_session.expire_all()
+
+    assert result == {"rescored": 4}
+    stored = {a.id: a for a in db_session.query(Article).filter(Article.id.in_(ids))}
+    assert stored[ids[0]].sentiment_overall > 0.5
+    assert stored[ids[1]].sentiment_overall < -0.5
+    assert stored[ids[0]].emotion_positive > 0
+    assert stored[ids[0]].sentiment_classification == "STRONGLY_POSITIVE"
+    assert stored[ids[2]].sentiment_classification == "NEUTRAL"
+    # Outside the range: untouched
+    assert stored[ids[4]].sentiment_overall == 0.0
+    assert stored[ids[4]].emotion_positive is None
+    assert stored[ids[4]].sentiment_classification == "STRONGLY_NEGATIVE"
+
+
+def test_rescore_articles_keeps_gemini_scores_unless_included(db_session: Session):
+    text = "This is wonderful news! Thailand's economy is thriving."
+    vader = SentimentAnalyzer().analyze_article("", text, "BBC", use_gemini=False)
+    articles = [
+        Article(
+            title="VADER",
+            full_text=text,
+            source_url="https://example.com/rescore/vader",
+            sentiment_overall=vader["sentiment_overall"],
+            sentiment_confidence=vader["sentiment_confidence"],
+            sentiment_subjectivity=vader["sentiment_subjectivity"],
+        ),
+        Article(
+            title="Gemini",
+            full_text=text,
+            source_url="https://example.com/rescore/gemini",
+            sentiment_overall=-0.2,
+            sentiment_confidence=0.9,
+            sentiment_subjectivity=0.6,
+        ),
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    gemini_id = articles[1].id
+
+    assert rescore_articles(db_session, workers=1) == {"rescored": 1}
+    db_session.expire_all()
+    assert db_session.get(Article, gemini_id).sentiment_overall == -0.2
+
+    assert rescore_articles(db_session, workers=1, include_gemini=True) == {"rescored": 2}
+    db_session.expire_all()
+    assert db_session.get(Article, gemini_id).sentiment_overall > 0.5
+
+
+class _QueuedTask:
+    def __init__(self, task_id):
+        self.calls = []
+        self.task_id = task_id
+
+    def delay(self, *args):
+        self.calls.append(args)
+        return type("Result", (), {"id": self.task_id})()
+
+
+def test_rescore_callback_refreshes_trends_and_rollups(db_session: Session, monkeypatch):
+    db_session.add_all(
+        Article(
+            title=f"Story {day}",
+            source_url=f"https://example.com/rescore/day/{day}",
+            published_date=datetime(2025, 3, day, 12),
+        )
+        for day in (4, 20)
+    )
+    db_session.commit()
+    backfill, rollups = _QueuedTask("backfill"), _QueuedTask("rollups")
+    monkeypatch.setattr(sentiment_aggregation, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(sentiment_aggregation, "backfill_sentiment_trends", backfill)
+    monkeypatch.setattr(sentiment_aggregation, "rebuild_sentiment_rollups", rollups)
+
+    result = sentiment_aggregation.reaggregate_rescored_sentiment(
+        [{"status": "success", "rescored": 3}, {"status": "error", "error": "boom"}]
+    )
+
+    assert result["rescored"] == 3
+    assert result["failed_ranges"] == 1
+    assert backfill.calls == [("2025-03-04", "2025-03-20")]
+    assert rollups.calls == [()]
+
+    # Nothing re-scored: nothing to re-aggregate
+    sentiment_aggregation.reaggregate_rescored_sentiment([{"status": "success", "rescored": 0}])
+    assert len(backfill.calls) == 1
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, Keyword, KeywordArticle, KeywordSentimentRollup
+from app.services.sentiment_rollups import compute_rollups, rebuild_rollups
+from app.services.sentiment_trends import record_article_links
+
+ARTICLES = [
+    # (source, sentiment, classification)
+    ("BBC", 0.6, "STRONGLY_POSITIVE"),
+    ("BBC", 0.0, "NEUTRAL"),
+    ("DW", -0.4, "NEGATIVE"),
+    (None, 0.3, "POSITIVE"),
+]
+
+
+def _article(index, source, sentiment, classification):
+    return Article(
+        title=f"Rollup {index}",
+        source=source,
+        source_url=f"https://example.com/rollup/{index}",
+        published_date=datetime(2025, 6, 1, 9),
+        sentiment_overall=sentiment,
+        sentiment_confidence=0.8,
+        sentiment_classification=classification,
+    )
+
+
+@pytest.fixture
+def keywords(db_session: Session):
+    first = Keyword(keyword_en="Climate")
+    second = Keyword(keyword_en="Migration")
+    db_session.add_all([first, second])
+    db_session.flush()
+
+    for index, row in enumerate(ARTICLES):
+        article = _article(index, *row)
+        db_session.add(article)
+        db_session.flush()
+        db_session.add(KeywordArticle(keyword_id=first.id, article_id=article.id))
+    db_session.commit()
+    return first.id, second.id
+
+
+def test_sentiment_endpoint_computes_missing_rollup(client, keywords):
+    first_id, _ = keywords
+
+    data = client.get(f"/api/sentiment/keywords/{first_id}/sentiment").json()
+
+    assert data["total_articles"] == 4
+    assert data["average_sentiment"] == pytest.approx(0.125)
+    assert data["sentiment_distribution"] == {
+        "strongly_positive": 1,
+        "positive": 1,
+        "neutral": 1,
+        "negative": 1,
+        "strongly_negative": 0,
+    }
+    assert data["by_source"]["most_positive"] == {"source": "BBC", "average_sentiment": 0.3}
+    assert data["by_source"]["most_negative"] == {"source": "DW", "average_sentiment": -0.4}
+
+
+def test_endpoints_read_stored_rollups(client, db_session: Session, keywords):
+    first_id, second_id = keywords
+    assert rebuild_rollups(db_session) == 1
+    db_session.commit()
+
+    # The endpoints serve the stored totals without touching the articles.
+    db_session.query(KeywordSentimentRollup).filter_by(keyword_id=first_id).update(
+        {"article_count": 8, "sentiment_sum": 2.0}
+    )
+    db_session.commit()
+
+    data = client.get(f"/api/sentiment/keywords/{first_id}/sentiment").json()
+    assert data["total_articles"] == 8
+    assert data["average_sentiment"] == 0.25
+
+    data = client.get(
+        "/api/sentiment/keywords/compare", params={"keyword_ids": f"{first_id},{second_id}"}
+    ).json()
+    by_id = {item["keyword_id"]: item for item in data["comparison"]}
+    assert by_id[second_id]["total_articles"] == 0
+    assert by_id[second_id]["average_sentiment"] is None
+    assert (by_id[first_id]["positive_count"], by_id[first_id]["negative_count"]) == (2, 1)
+
+
+def test_ingest_updates_rollups_in_place(db_session: Session, keywords):
+    first_id, second_id = keywords
+    rebuild_rollups(db_session, [first_id])
+    db_session.commit()
+
+    article = _article(10, "ORF", -0.5, "STRONGLY_NEGATIVE")
+    db_session.add(article)
+    db_session.flush()
+    db_session.add_all(
+        [
+            KeywordArticle(keyword_id=first_id, article_id=article.id),
+            KeywordArticle(keyword_id=second_id, article_id=article.id),
+        ]
+    )
+    db_session.flush()
+    record_article_links(db_session, [(article, first_id), (article, second_id)])
+    db_session.commit()
+
+    stored = {
+        row.keyword_id: row for row in db_session.query(KeywordSentimentRollup).all()
+    }
+    expected = compute_rollups(db_session)
+    for keyword_id in (first_id, second_id):
+        assert stored[keyword_id].article_count == expected[keyword_id].article_count
+        assert stored[keyword_id].sentiment_sum == pytest.approx(
+            expected[keyword_id].sentiment_sum
+        )
+        assert stored[keyword_id].source_stats == expected[keyword_id].sources
+    assert stored[first_id].strongly_negative_count == 1
+    assert stored[second_id].article_count == 1
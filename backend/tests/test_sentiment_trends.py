@@ -0,0 +1,250 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, Keyword, KeywordArticle, SentimentTrend
+from app.services.sentiment_trends import (
+    aggregate_trends,
+    backfill_trends,
+    compute_daily_trends,
+    date_chunks,
+    record_article_links,
+)
+from app.tasks import sentiment_aggregation
+from app.tasks.sentiment_aggregation import classify_sentiment_category
+
+ARTICLES = [
+    # (day, source, sentiment, confidence)
+    (1, "BBC", 0.8, 0.9),
+    (1, "BBC", 0.1, 0.4),
+    (1, "DW", -0.5, None),
+    (1, None, 0.05, 0.2),
+    (2, "DW", -0.9, 0.7),
+]
+
+
+@pytest.fixture
+def scored_articles(db_session: Session):
+    energy = Keyword(keyword_en="Energy")
+    trade = Keyword(keyword_en="Trade")
+    db_session.add_all([energy, trade])
+    db_session.flush()
+
+    for index, (day, source, sentiment, confidence) in enumerate(ARTICLES):
+        article = Article(
+            title=f"Story {index}",
+            source=source,
+            source_url=f"https://example.com/trend/{index}",
+            published_date=datetime(2025, 5, day, 8 + index),
+            sentiment_overall=sentiment,
+            sentiment_confidence=confidence,
+        )
+        db_session.add(article)
+        db_session.flush()
+        db_session.add(KeywordArticle(keyword_id=energy.id, article_id=article.id))
+        if index == 0:
+            db_session.add(KeywordArticle(keyword_id=trade.id, article_id=article.id))
+
+    # Unscored articles are ignored
+    unscored = Article(
+        title="Unscored",
+        source_url="https://example.com/trend/unscored",
+        published_date=datetime(2025, 5, 1, 20),
+    )
+    db_session.add(unscored)
+    db_session.flush()
+    db_session.add(KeywordArticle(keyword_id=energy.id, article_id=unscored.id))
+    db_session.commit()
+    return energy.id, trade.id
+
+
+def _trend(db_session, keyword_id, day):
+    return db_session.query(SentimentTrend).filter_by(keyword_id=keyword_id, date=day).one()
+
+
+def _expected(rows):
+    weights = [confidence or 0.5 for _, _, _, confidence in rows]
+    weighted = sum(sentiment * weight for (_, _, sentiment, _), weight in zip(rows, weights))
+    categories = [
+        classify_sentiment_category(sentiment, confidence or 0.5)
+        for _, _, sentiment, confidence in rows
+    ]
+    return (
+        weighted / sum(weights),
+        sum("POSITIVE" in category for category in categories),
+        sum("NEGATIVE" in category for category in categories),
+        sum(category == "NEUTRAL" for category in categories),
+    )
+
+
+def test_daily_aggregation_matches_per_article_classification(
+    db_session: Session, scored_articles, monkeypatch
+):
+    energy_id, trade_id = scored_articles
+    # An existing row is overwritten through the upsert.
+    db_session.add(
+        SentimentTrend(keyword_id=energy_id, date=date(2025, 5, 1), avg_sentiment=9.0)
+    )
+    db_session.commit()
+    monkeypatch.setattr(sentiment_aggregation, "SessionLocal", lambda: db_session)
+
+    result = sentiment_aggregation.aggregate_daily_sentiment("2025-05-01")
+
+    assert result == {"status": "success", "date": "2025-05-01", "keywords_processed": 2}
+
+    trend = _trend(db_session, energy_id, date(2025, 5, 1))
+    avg, positive, negative, neutral = _expected([row for row in ARTICLES if row[0] == 1])
+    assert trend.avg_sentiment == pytest.approx(avg)
+    assert (trend.positive_count, trend.negative_count, trend.neutral_count) == (
+        positive,
+        negative,
+        neutral,
+    )
+    assert trend.article_count == 4
+    assert trend.top_sources == {"BBC": 0.45, "DW": -0.5, "unknown": 0.05}
+
+    assert _trend(db_session, trade_id, date(2025, 5, 1)).article_count == 1
+    # Other days are untouched
+    assert db_session.query(SentimentTrend).filter_by(date=date(2025, 5, 2)).count() == 0
+
+
+def test_record_article_links_matches_full_recompute(db_session: Session, scored_articles):
+    energy_id, _ = scored_articles
+    day = date(2025, 5, 1)
+    aggregate_trends(db_session, day, day, [energy_id])
+
+    new_articles = [
+        Article(
+            title=f"Late {index}",
+            source=source,
+            source_url=f"https://example.com/trend/late/{index}",
+            published_date=datetime(2025, 5, 1, 23),
+            sentiment_overall=sentiment,
+            sentiment_confidence=0.6,
+        )
+        for index, (source, sentiment) in enumerate([("BBC", 0.7), ("ORF", -0.3)])
+    ]
+    db_session.add_all(new_articles)
+    db_session.flush()
+    db_session.add_all(
+        KeywordArticle(keyword_id=energy_id, article_id=article.id) for article in new_articles
+    )
+    db_session.flush()
+
+    assert record_article_links(db_session, [(a, energy_id) for a in new_articles]) == 1
+    db_session.commit()
+
+    incremental = _trend(db_session, energy_id, day)
+    expected = next(compute_daily_trends(db_session, day, day, [energy_id]))
+    assert incremental.article_count == expected.article_count == 6
+    assert incremental.avg_sentiment == pytest.approx(expected.avg_sentiment)
+    assert incremental.positive_count == expected.positive_count
+    assert incremental.negative_count == expected.negative_count
+    assert incremental.top_sources == expected.top_sources()
+
+
+def test_record_article_links_creates_and_rebuilds_rows(db_session: Session, scored_articles):
+    energy_id, trade_id = scored_articles
+    # Legacy row without running sums is rebuilt from the articles.
+    db_session.add(
+        SentimentTrend(
+            keyword_id=energy_id, date=date(2025, 5, 2), avg_sentiment=0.0, article_count=1
+        )
+    )
+    db_session.commit()
+
+    article = db_session.query(Article).filter_by(title="Story 4").one()
+    fresh = Article(
+        title="Fresh",
+        source="DW",
+        source_url="https://example.com/trend/fresh",
+        published_date=datetime(2025, 5, 3, 9),
+        sentiment_overall=0.4,
+        sentiment_confidence=0.9,
+    )
+    db_session.add(fresh)
+    db_session.flush()
+    db_session.add(KeywordArticle(keyword_id=trade_id, article_id=fresh.id))
+    db_session.add(KeywordArticle(keyword_id=trade_id, article_id=article.id))
+    db_session.flush()
+
+    record_article_links(
+        db_session, [(fresh, trade_id), (article, trade_id), (article, energy_id)]
+    )
+    db_session.commit()
+
+    created = _trend(db_session, trade_id, date(2025, 5, 3))
+    assert (created.article_count, created.positive_count) == (1, 1)
+    assert created.avg_sentiment == pytest.approx(0.4)
+
+    rebuilt = _trend(db_session, energy_id, date(2025, 5, 2))
+    assert rebuilt.article_count == 1
+    assert rebuilt.weight_total == pytest.approx(0.7)
+    assert rebuilt.avg_sentiment == pytest.approx(-0.9)
+
+
+def test_zero_confidence_articles_get_the_default_weight(db_session: Session):
+    keyword = Keyword(keyword_en="Neutral")
+    db_session.add(keyword)
+    db_session.flush()
+    day = date(2025, 6, 1)
+
+    articles = [
+        Article(
+            title=f"Neutral {index}",
+            source="BBC",
+            source_url=f"https://example.com/trend/neutral/{index}",
+            published_date=datetime(2025, 6, 1, 9 + index),
+            sentiment_overall=sentiment,
+            sentiment_confidence=confidence,
+        )
+        for index, (sentiment, confidence) in enumerate([(0.8, 0.5), (0.0, 0.0)])
+    ]
+    db_session.add_all(articles)
+    db_session.flush()
+    db_session.add_all(
+        KeywordArticle(keyword_id=keyword.id, article_id=article.id) for article in articles
+    )
+    db_session.flush()
+
+    # VADER gives an exactly neutral article confidence 0.0; it still counts
+    expected = next(compute_daily_trends(db_session, day, day, [keyword.id]))
+    assert expected.avg_sentiment == pytest.approx(0.4)
+    assert expected.neutral_count == 1
+
+    record_article_links(db_session, [(article, keyword.id) for article in articles])
+    db_session.commit()
+    incremental = _trend(db_session, keyword.id, day)
+    assert incremental.avg_sentiment == pytest.approx(0.4)
+    assert incremental.weight_total == pytest.approx(1.0)
+
+
+def test_date_chunks_cover_range():
+    chunks = date_chunks(date(2024, 1, 1), date(2024, 3, 1), 31)
+
+    assert chunks == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 3, 1)),
+    ]
+    with pytest.raises(ValueError):
+        date_chunks(date(2024, 2, 1), date(2024, 1, 1), 7)
+
+
+def test_backfill_trends_reports_progress_per_chunk(db_session: Session, scored_articles):
+    energy_id, _ = scored_articles
+    updates = []
+
+    summary = backfill_trends(
+        date(2025, 4, 20),
+        date(2025, 5, 10),
+        keyword_ids=[energy_id],
+        chunk_days=7,
+        workers=1,
+        progress=lambda done, total, result: updates.append((done, total)),
+        session_factory=lambda: db_session,
+    )
+
+    assert summary == {"chunks": 3, "trends_written": 2, "failed_chunks": []}
+    assert updates == [(1, 3), (2, 3), (3, 3)]
+    assert db_session.query(SentimentTrend).filter_by(keyword_id=energy_id).count() == 2
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.services.embeddings import EmbeddingGenerator
+from app.services.similarity import SimilarityEngine
+
+
+def _vectors(count: int, dim: int = 384, seed: int = 3) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+def test_top_k_matches_brute_force_cosine():
+    candidates = _vectors(200)
+    query = _vectors(1, seed=11)[0]
+    engine = SimilarityEngine.from_embeddings(candidates.tolist())
+
+    expected = candidates @ query / (
+        np.linalg.norm(candidates, axis=1) * np.linalg.norm(query)
+    )
+    expected_order = np.argsort(-expected)[:5]
+
+    hits = engine.top_k(query, 5)[0]
+
+    assert [item_id for item_id, _ in hits] == expected_order.tolist()
+    assert hits[0][1] == pytest.approx(float(expected[expected_order[0]]), rel=1e-5)
+
+
+def test_top_k_batch_and_filters():
+    candidates = _vectors(30)
+    engine = SimilarityEngine.from_embeddings(candidates, ids=range(100, 130))
+
+    results = engine.top_k(candidates[:3], 2, exclude_ids=[100])
+
+    assert len(results) == 3
+    assert results[0][0][0] != 100
+    assert results[1][0][0] == 101
+    assert results[2][0][0] == 102
+    assert all(score >= 0.99 for score in (results[1][0][1], results[2][0][1]))
+
+    thresholded = engine.top_k(candidates[5], 30, min_similarity=0.99)[0]
+    assert thresholded == [(105, pytest.approx(1.0, abs=1e-5))]
+
+
+def test_engine_skips_missing_vectors_and_removes_rows():
+    candidates = _vectors(4)
+    engine = SimilarityEngine.from_embeddings(
+        [candidates[0], None, [0.0] * 384, candidates[3]]
+    )
+    assert len(engine) == 2
+
+    engine.remove([3])
+    hits = engine.top_k(candidates[3], 5)[0]
+    assert [item_id for item_id, _ in hits] == [0]
+
+
+def test_find_similar_routes_through_engine():
+    generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+    generator.embedding_dim = 384
+    candidates = _vectors(5)
+
+    similar = generator.find_similar(candidates[2].tolist(), [None] + candidates.tolist(), top_k=2)
+
+    assert similar[0][0] == 3
+    assert similar[0][1] >= similar[1][1]
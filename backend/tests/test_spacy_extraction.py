@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from app.services.keyword_extractor import KeywordExtractor
+
+
+class _Doc:
+    def __init__(self, text):
+        self.text = text
+        self.ents = [SimpleNamespace(text="Bangkok", label_="GPE")]
+        self.noun_chunks = [
+            SimpleNamespace(text="rice exports", end_char=20),
+            SimpleNamespace(text="late chunk text", end_char=60000),
+        ]
+
+
+class _Nlp:
+    """Records how texts are parsed."""
+
+    pipe_names = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+    def __init__(self):
+        self.parsed = []
+        self.pipe_calls = []
+
+    def __call__(self, text, disable=()):
+        self.parsed.append(text)
+        return _Doc(text)
+
+    def pipe(self, texts, n_process=1, batch_size=1000, disable=()):
+        self.pipe_calls.append({"n_process": n_process, "batch_size": batch_size, "disable": disable})
+        for text in texts:
+            self.parsed.append(text)
+            yield _Doc(text)
+
+
+def _extractor():
+    extractor = KeywordExtractor()
+    extractor.nlp = _Nlp()
+    return extractor
+
+
+def test_extract_all_parses_article_once():
+    extractor = _extractor()
+
+    result = extractor.extract_all("Title", "Rice exports grew.", use_gemini=False)
+
+    assert len(extractor.nlp.parsed) == 1
+    assert result["entities"]["locations"] == ["Bangkok"]
+    # Chunks past the noun chunk limit are ignored
+    assert result["keywords"] == ["rice exports"]
+
+
+def test_extract_spacy_batch_uses_pipe_with_unused_components_disabled():
+    extractor = _extractor()
+
+    results = extractor.extract_spacy_batch(["one", "two", "three"], n_process=2, batch_size=8)
+
+    assert len(results) == 3
+    assert extractor.nlp.pipe_calls == [
+        {"n_process": 2, "batch_size": 8, "disable": ["lemmatizer"]}
+    ]
+    assert extractor.nlp.parsed == ["one", "two", "three"]
+
+    extraction = extractor.extract_all("Title", "one", use_gemini=False, spacy_result=results[0])
+    assert extraction["keywords"] == ["rice exports"]
+    assert len(extractor.nlp.parsed) == 3
@@ -0,0 +1,89 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services.url_dedup import (
+    RecentUrlCache,
+    canonicalize_url,
+    find_existing_articles,
+    remember_articles,
+)
+
+
+def test_canonicalize_url_strips_tracking_and_noise():
+    assert (
+        canonicalize_url(
+            "HTTP://www.BBC.co.uk:80/news/world-1/?utm_source=rss&b=2&a=1&fbclid=x#top"
+        )
+        == "https://bbc.co.uk/news/world-1?a=1&b=2"
+    )
+    assert canonicalize_url("https://dw.com:8443/en/") == "https://dw.com:8443/en"
+    assert canonicalize_url("https://dw.com") == "https://dw.com/"
+    assert canonicalize_url(" not a url ") == "not a url"
+    assert canonicalize_url("") is None
+
+
+def test_article_canonical_url_follows_source_url(db_session: Session):
+    article = Article(title="Tracked", source_url="https://example.com/a?utm_medium=social")
+    assert article.canonical_url == "https://example.com/a"
+    article.source_url = "https://example.com/b/"
+    assert article.canonical_url == "https://example.com/b"
+
+
+def _count_queries(db_session, func):
+    statements = []
+    engine = db_session.get_bind().engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        return func(), len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_find_existing_articles_checks_batch_once_then_uses_cache(db_session: Session):
+    stored = Article(title="Stored", source_url="https://example.com/stored?ref=home")
+    legacy = Article(title="Legacy", source_url="https://example.com/legacy")
+    db_session.add_all([stored, legacy])
+    db_session.flush()
+    legacy.canonical_url = None  # Stored before the column existed
+    db_session.flush()
+
+    cache = RecentUrlCache()
+    urls = [
+        "https://www.example.com/stored?utm_source=feed",
+        "https://example.com/legacy",
+        "https://example.com/new",
+        None,
+    ]
+    existing, queries = _count_queries(
+        db_session, lambda: find_existing_articles(db_session, urls, cache)
+    )
+    assert queries == 1
+    assert existing == {
+        "https://example.com/stored": stored.id,
+        "https://example.com/legacy": legacy.id,
+    }
+
+    existing, queries = _count_queries(
+        db_session, lambda: find_existing_articles(db_session, urls[:2], cache)
+    )
+    assert queries == 0
+    assert len(existing) == 2
+
+
+def test_recent_url_cache_is_bounded():
+    cache = RecentUrlCache(max_size=2)
+    remember_articles(
+        [
+            Article(id=1, source_url="https://example.com/1"),
+            Article(id=2, source_url="https://example.com/2"),
+        ],
+        cache,
+    )
+    assert cache.get("https://example.com/1") == 1
+    cache.add("https://example.com/3", 3)
+
+    assert len(cache) == 2
+    assert cache.get("https://example.com/2") is None
+    assert cache.get("https://example.com/1") == 1
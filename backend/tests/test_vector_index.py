@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services import vector_index
+from app.services.vector_index import FlatIndex, IVFIndex, VectorIndexService
+
+
+def _random_unit_vectors(count: int, dim: int = 384, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_flat_index_returns_exact_neighbours():
+    vectors = _random_unit_vectors(50)
+    index = FlatIndex()
+    index.add(list(range(1, 51)), vectors)
+
+    hits = index.search(vectors[9], k=3)
+
+    assert hits[0][0] == 10
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert hits[0][1] >= hits[1][1] >= hits[2][1]
+
+
+def test_ivf_index_trains_and_finds_self():
+    vectors = _random_unit_vectors(4 * IVFIndex.min_points_per_centroid + 10)
+    index = IVFIndex(nlist=4, nprobe=4)
+    index.add(list(range(len(vectors))), vectors)
+
+    # Adding never trains inline; the owner trains when asked to
+    assert not index.is_trained and index.needs_training
+    index.train()
+    assert index.is_trained and not index.needs_training
+    for item_id in (0, 17, 100):
+        assert index.search(vectors[item_id], k=1)[0][0] == item_id
+
+
+def test_ivf_index_respects_allowed_ids_and_removal():
+    vectors = _random_unit_vectors(20)
+    index = IVFIndex(nlist=4, nprobe=1)
+    index.add(list(range(20)), vectors)
+
+    hits = index.search(vectors[3], k=5, allowed_ids={1, 2, 5})
+    assert {item_id for item_id, _ in hits} == {1, 2, 5}
+
+    index.remove([3])
+    assert 3 not in {item_id for item_id, _ in index.search(vectors[3], k=20)}
+    assert len(index) == 19
+
+
+def test_hnsw_filtered_search_returns_matches_smaller_than_k():
+    pytest.importorskip("hnswlib")
+    from app.services.vector_index import HNSWIndex
+
+    vectors = _random_unit_vectors(200)
+    index = HNSWIndex(initial_capacity=200)
+    index.add(list(range(200)), vectors)
+
+    hits = index.search(vectors[3], k=10, allowed_ids={3, 40, 77, 999})
+    assert [item_id for item_id, _ in hits][0] == 3
+    assert {item_id for item_id, _ in hits} == {3, 40, 77}
+
+    exact = index._score_exact(vectors[3], [3, 40, 77], 2)
+    assert exact[0][0] == 3 and exact[0][1] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_service_syncs_delta_from_database(db_session: Session):
+    vectors = _random_unit_vectors(3)
+    articles = [
+        Article(
+            title=f"Article {i}",
+            source_url=f"https://example.com/vector-{i}",
+            embedding=vectors[i].tolist(),
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+
+    service = VectorIndexService(Article, backend="flat")
+    assert service.sync(db_session, force=True) == 3
+    assert service.sync(db_session, force=True) == 0
+
+    hits = service.search(vectors[1].tolist(), k=1)
+    assert hits[0][0] == articles[1].id
+
+    filtered = service.search(
+        vectors[1].tolist(), k=3, candidate_ids=[articles[0].id, articles[2].id]
+    )
+    assert articles[1].id not in {item_id for item_id, _ in filtered}
+
+
+def test_service_ignores_zero_and_missing_embeddings():
+    service = VectorIndexService(Article, backend="flat")
+    service.add(1, [0.0] * 384)
+    service.add(2, None)
+
+    assert len(service) == 0
+    assert service.search([0.0] * 384, k=5) == []
+
+
+def _add_articles(db_session: Session, vectors: np.ndarray, prefix: str):
+    articles = [
+        Article(
+            title=f"{prefix} {i}",
+            source_url=f"https://example.com/{prefix}-{i}",
+            embedding=vector.tolist(),
+        )
+        for i, vector in enumerate(vectors)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    return articles
+
+
+def test_service_prunes_deleted_rows(db_session: Session):
+    vectors = _random_unit_vectors(4)
+    articles = _add_articles(db_session, vectors, "prune")
+    service = VectorIndexService(Article, backend="flat")
+    service.sync(db_session, force=True)
+    deleted_id = articles[2].id
+
+    db_session.delete(articles[2])
+    db_session.commit()
+    # Only rows deleted since are pruned; the throttled sync leaves them
+    assert service.sync(db_session) == 0
+    assert len(service) == 4
+
+    assert service.prune(db_session) == 1
+    assert len(service) == 3
+    hits = service.search(vectors[2].tolist(), k=4)
+    assert deleted_id not in {item_id for item_id, _ in hits}
+
+
+def test_service_trains_ivf_in_the_background(db_session: Session, monkeypatch):
+    monkeypatch.setattr(vector_index.settings, "vector_index_nlist", 2)
+    vectors = _random_unit_vectors(2 * IVFIndex.min_points_per_centroid + 5)
+    articles = _add_articles(db_session, vectors, "ivf-train")
+    service = VectorIndexService(Article, backend="ivf")
+
+    service.sync(db_session, force=True)
+    service._training.join(timeout=30)
+
+    assert service.index.is_trained
+    assert service.search(vectors[5].tolist(), k=1)[0][0] == articles[5].id
+    # Nothing left to train
+    assert service.train_index() is False